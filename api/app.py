@@ -82,6 +82,17 @@ async def _warm_contracts() -> None:
     # warming immediately so the first user request likely lands warm.
     asyncio.create_task(_warm())
 
+    # Keep an event cursor so /status refreshes only re-read entries whose
+    # staker / pool member emitted something since the last snapshot.
+    from services.event_follower import run_event_follower
+
+    asyncio.create_task(run_event_follower("api"))
+
+    # The bot container sweeps too; a DELETE of already-gone rows is free.
+    from utils.cache import start_cache_sweeper
+
+    start_cache_sweeper()
+
 # Mount the Mini App bundle so `uvicorn` alone serves both halves in dev.
 _WEBAPP_DIR = Path(__file__).resolve().parent.parent / "webapp"
 if _WEBAPP_DIR.is_dir():
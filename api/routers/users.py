@@ -489,7 +489,7 @@ async def user_digest(
     user = await get_account(str(user_id))
     locale = user.user_language if user else "en"
     tracking = user.tracking_data if user else None
-    html = await render_user_tracking(tracking, locale, mode=mode)
+    html = await render_user_tracking(tracking, locale, mode=mode, consumer="api")
     return {"html": html, "mode": mode, "locale": locale}
 
 
@@ -498,7 +498,7 @@ async def user_dashboard(user_id: int = Depends(_resolve_user_id)) -> dict:
     user = await get_account(str(user_id))
     locale = user.user_language if user else "en"
     tracking = user.tracking_data if user else None
-    entries = await fetch_tracking_entries(tracking)
+    entries = await fetch_tracking_entries(tracking, consumer="api", profile="attestation")
     html = render_dashboard_summary(entries, locale)
     return {
         "html": html,
@@ -579,7 +579,9 @@ async def typed_entries(user_id: int = Depends(_resolve_user_id)) -> list[dict]:
     user = await get_account(str(user_id))
     if user is None:
         return []
-    entries: list[TrackingEntry] = await fetch_tracking_entries(user.tracking_data)
+    entries: list[TrackingEntry] = await fetch_tracking_entries(
+        user.tracking_data, consumer="api", profile="full"
+    )
     return [
         {
             "index": e.index,
@@ -17,6 +17,7 @@ from bot.handlers.clear_state import finish_operation
 from data.contracts import Contracts
 from data.languages import translate
 from db_api.database import Users, add_tracking_entry, get_user_tracking
+from services.negative_cache import forget_address
 from services.staking_service import get_delegator_positions, get_validator_info
 from services.tracking_service import (
     MAX_TRACKED_ENTRIES,
@@ -207,6 +208,9 @@ async def confirm_tracking_data(
         await message.reply(
             translate("check_correct_validator_data", user_locale), parse_mode="HTML"
         )
+        # The user vouches for the address: re-ask the chain even if it
+        # was recently "does not exist" (e.g. a freshly registered staker).
+        forget_address(data.get("validator_address"))
         result = await get_validator_info(
             data.get("validator_address"), with_attestation=False
         )
@@ -227,6 +231,8 @@ async def confirm_tracking_data(
         await message.reply(
             translate("check_correct_delegator_data", user_locale), parse_mode="HTML"
         )
+        forget_address(data.get("staker_address"))
+        forget_address(data.get("delegetor_address"))
         multi = await get_delegator_positions(
             data.get("staker_address"), data.get("delegetor_address")
         )
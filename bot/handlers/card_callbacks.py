@@ -8,14 +8,13 @@ from __future__ import annotations
 
 from aiogram import types
 from aiogram.fsm.context import FSMContext
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.handlers.rename_info import RenameState
 from bot.keyboards import card_actions
 from data.languages import translate
-from db_api.database import Users, db, get_account
+from db_api.database import Users, edit_tracking_data, get_account
 from services.formatting import render_delegator_card, render_validator_card
-from services.tracking_service import dump_tracking, fetch_tracking_entries, total_tracked
+from services.tracking_service import fetch_tracking_entries, total_tracked
 from utils.cache import clear_user_cache
 from utils.logger import logger
 
@@ -59,21 +58,23 @@ async def on_card_callback(callback: types.CallbackQuery, state: FSMContext) ->
         return
 
     if action == "remove":
-        doc = user.get_tracking_data()
         lst_key = "validators" if entry.kind == "validator" else "delegations"
-        # Find the position inside its own list (index is global across both).
-        local_idx = index if entry.kind == "validator" else index - len(doc.get("validators", []))
+        popped: list[dict] = []
+
+        def _remove(doc: dict) -> None:
+            # Find the position inside its own list (index is global across both).
+            local_idx = index if entry.kind == "validator" else index - len(doc.get("validators", []))
+            if local_idx < 0:
+                raise IndexError(index)
+            popped.append(doc[lst_key].pop(local_idx))
+
         try:
-            removed = doc[lst_key].pop(local_idx)
+            user.tracking_data = await edit_tracking_data(user.user_id, _remove)
         except (IndexError, KeyError):
             await callback.answer(translate("address_not_found", locale), show_alert=True)
             return
-        user.tracking_data = dump_tracking(doc)
-        async with AsyncSession(db.engine) as session:
-            await session.merge(user)
-            await session.commit()
         await clear_user_cache(user.user_id)
-        logger.info(f"removed entry via callback for {user.user_id}: {removed}")
+        logger.info(f"removed entry via callback for {user.user_id}: {popped[0]}")
         try:
             await callback.message.edit_text(
                 translate("address_deleted", locale), parse_mode="HTML"
@@ -17,7 +17,8 @@ async def dashboard_command(message: types.Message) -> None:
     locale = user.user_language if user else "en"
     tracking_data = user.tracking_data if user else None
 
-    entries = await fetch_tracking_entries(tracking_data)
+    # The summary only shows stake, rewards and the missed-epoch chip.
+    entries = await fetch_tracking_entries(tracking_data, profile="attestation")
     if not entries:
         await message.answer(
             translate("no_addresses_to_parse", locale), parse_mode="HTML"
@@ -5,12 +5,11 @@ from aiogram import types
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.handlers.clear_state import finish_operation
 from data.languages import translate
-from db_api.database import Users, db, get_user_tracking
-from services.tracking_service import dump_tracking, total_tracked
+from db_api.database import Users, edit_tracking_data, get_user_tracking
+from services.tracking_service import total_tracked
 from utils.cache import clear_user_cache
 from utils.logger import logger
 
@@ -166,10 +165,11 @@ async def confirm_delete_all(
         await finish_operation(message, state, user_locale)
         return
 
-    user_object.tracking_data = dump_tracking({"validators": [], "delegations": []})
-    async with AsyncSession(db.engine) as session:
-        await session.merge(user_object)
-        await session.commit()
+    def _clear(doc: dict) -> None:
+        doc.clear()
+        doc.update({"validators": [], "delegations": []})
+
+    user_object.tracking_data = await edit_tracking_data(user_object.user_id, _clear)
     await clear_user_cache(user_object.user_id)
     logger.info(f"deleted all tracking entries for {user_object.user_id}")
     await finish_operation(
@@ -197,10 +197,11 @@ async def confirm_delete_specific(
         return
 
     kind, idx = pending[0], int(pending[1])
-    doc = await get_user_tracking(user_object.user_id)
     lst_key = "validators" if kind == "validator" else "delegations"
     try:
-        doc[lst_key].pop(idx)
+        user_object.tracking_data = await edit_tracking_data(
+            user_object.user_id, lambda doc: doc[lst_key].pop(idx)
+        )
     except IndexError:
         await finish_operation(
             message, state, user_locale,
@@ -208,11 +209,6 @@ async def confirm_delete_specific(
         )
         return
 
-    user_object.tracking_data = dump_tracking(doc)
-    async with AsyncSession(db.engine) as session:
-        await session.merge(user_object)
-        await session.commit()
-
     logger.info(f"removed tracking entry for {user_object.user_id}")
     await clear_user_cache(user_object.user_id)
     await finish_operation(
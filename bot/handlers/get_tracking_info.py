@@ -8,40 +8,22 @@ from __future__ import annotations
 
 import json
 
-import aiohttp
 from aiogram import types
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from data.languages import translate
-from data.tg_bot import BOT_TOKEN
 from db_api.database import db, get_account, write_to_db
 from db_api.models import Users
+from services.telegram_outbox import send_message
 from services.tracking_service import (
     render_user_tracking,
     render_user_tracking_chunks,
 )
-from utils.cache import cache, get_cache_key
+from utils.cache import user_cache
 from utils.logger import logger
 
 
-TELEGRAM_API_BASE = "https://api.telegram.org/bot"
-
-
-async def send_message(chat_id: int, text: str) -> None:
-    """Send a plain HTML message through the Telegram Bot API.
-
-    Kept as a module helper because the background processors run in a
-    separate process and can't share the aiogram Bot instance from main.
-    """
-    url = f"{TELEGRAM_API_BASE}{BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            if response.status != 200:
-                logger.error(f"sendMessage failed: {await response.text()}")
-
-
 async def _position_in_queue(user_id: int) -> int:
     async with AsyncSession(db.engine) as session:
         query = select(Users).where(Users.request_queue.isnot(None))
@@ -109,21 +91,20 @@ async def get_tracking_validator_info(message: types.Message) -> None:
 # Background processors (invoked by tasks.request_queue worker process).
 # ---------------------------------------------------------------------------
 
-async def _emit(user: Users, body: str, *, cache_key: str | None = None) -> None:
+async def _emit(user: Users, body: str, *, cache_name: str | None = None) -> None:
     """Cache the rendered body (if requested) and deliver it to the user."""
-    if cache_key:
-        await cache.set(cache_key, body)
+    if cache_name:
+        await user_cache(user.user_id).set(cache_name, body)
     await send_message(user.user_id, body)
 
 
 async def process_full_info(user: Users) -> None:
     # Caching disabled here on purpose: this code runs in the
-    # ``strk_bot_parsing`` worker process, whose ``cache`` is a per-process
-    # dict. ``clear_user_cache`` runs in MainProcess (where add/edit handlers
-    # live) and never reaches the worker's dict, so a cached body would mask
-    # fresh tracking edits for up to 5 minutes. RPC is fast enough to render
-    # on demand; reintroduce caching only with a real cross-process backing
-    # store (e.g. SQLite or shared Manager dict passed via initializer).
+    # ``strk_bot_parsing`` worker process. ``utils.cache`` is now a real
+    # cross-process store (SQLite WAL), so ``clear_user_cache`` from the
+    # add/edit handlers does reach it — but a cached body would still pin
+    # a 5-minute-old chain state, and RPC is fast enough to render on
+    # demand.
     #
     # The chunked variant of the renderer never builds a string > 4096
     # chars; we send each chunk as its own Telegram message so a user
@@ -6,7 +6,6 @@ from __future__ import annotations
 import json
 import logging
 
-import aiohttp
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
@@ -17,27 +16,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from bot.handlers.clear_state import finish_operation
 from bot.handlers.start import create_main_menu
 from data.languages import translate
-from data.tg_bot import BOT_TOKEN
 from db_api.database import db, get_account, write_to_db
 from db_api.models import Users
 from services.formatting import render_validator_card
 from services.staking_service import get_validator_info as fetch_validator_info
+from services.telegram_outbox import send_message
 from services.tracking_service import TrackingEntry
-from utils.cache import cache, get_cache_key
 from utils.check_valid_addresses import is_valid_starknet_address
 from utils.logger import logger
 
 _logger = logging.getLogger(__name__)
-TELEGRAM_API_BASE = "https://api.telegram.org/bot"
-
-
-async def send_message(chat_id: int, text: str) -> None:
-    url = f"{TELEGRAM_API_BASE}{BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            if response.status != 200:
-                logger.error(f"sendMessage failed: {await response.text()}")
 
 
 class ValidatorState(StatesGroup):
@@ -201,8 +189,8 @@ async def process_validator_info(user: Users) -> None:
             )
             return
 
-        # No worker-side caching — the cache dict is per-process and would
-        # mask edits made in MainProcess. Render fresh every time.
+        # No worker-side caching — a cached card would pin a stale chain
+        # state. Render fresh every time.
         info = await fetch_validator_info(address)
         if info is None:
             await send_message(
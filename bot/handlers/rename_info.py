@@ -9,12 +9,11 @@ from aiogram import types
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.handlers.clear_state import finish_operation
 from data.languages import translate
-from db_api.database import Users, db, get_user_tracking
-from services.tracking_service import dump_tracking, total_tracked
+from db_api.database import Users, edit_tracking_data, get_user_tracking
+from services.tracking_service import total_tracked
 from utils.cache import clear_user_cache
 from utils.logger import logger
 
@@ -110,10 +109,13 @@ async def process_new_label(
     kind: str = data["target_kind"]
     idx: int = data["target_idx"]
 
-    doc = await get_user_tracking(user_object.user_id)
     lst_key = "validators" if kind == "validator" else "delegations"
-    try:
+
+    def _rename(doc: dict) -> None:
         doc[lst_key][idx]["label"] = label
+
+    try:
+        user_object.tracking_data = await edit_tracking_data(user_object.user_id, _rename)
     except (IndexError, KeyError):
         await finish_operation(
             message, state, user_locale,
@@ -121,11 +123,6 @@ async def process_new_label(
         )
         return
 
-    user_object.tracking_data = dump_tracking(doc)
-    async with AsyncSession(db.engine) as session:
-        await session.merge(user_object)
-        await session.commit()
-
     logger.info(f"renamed tracking entry for {user_object.user_id} → {label!r}")
     await clear_user_cache(user_object.user_id)
     await state.clear()
@@ -0,0 +1,140 @@
+"""Minimal ABI profiles: only the view functions we call, and their types.
+
+starknet-py parses every entry of an ABI when a ``Contract`` is built —
+all interfaces, events and the types they pull in — although the bot only
+ever calls a handful of views per contract. Parsing the full
+``l2_staking_contract`` ABI takes seconds and dominates the start-up
+memory peak noted in ``docker-compose.yml``.
+
+:data:`ABI_PROFILES` lists, per ABI file, the functions that go through
+``Contract.functions[...]``. :func:`trim_abi` keeps those functions (in
+their interface, with its ``impl`` entry) plus the transitive closure of
+the structs / enums their inputs and outputs reference, and
+:func:`load_profiled_abi` serves the trimmed ABI to the services.
+Reads that go through :mod:`services.raw_calls` need no ABI at all.
+
+``ABI_PROFILE=full`` restores the untrimmed ABIs (e.g. to debug a decoding
+difference). ``tests/test_abi_profile.py`` fails if a service calls a
+function its profile does not contain.
+"""
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import Iterable
+
+from data.contracts import load_abi
+
+ABI_PROFILE = os.getenv("ABI_PROFILE", "minimal")
+
+ABI_PROFILES: dict[str, tuple[str, ...]] = {
+    "l2_staking_contract": (
+        "contract_parameters_v1",
+        "get_active_tokens",
+    ),
+    "l2_pool_contract": (
+        "contract_parameters_v1",
+        "get_pool_member_info_v1",
+    ),
+    "l2_attestation_contract": (
+        "attestation_window",
+        "get_current_epoch_target_attestation_block",
+        "is_attestation_done_in_curr_epoch",
+    ),
+}
+
+
+def _split_top_level(inner: str) -> list[str]:
+    parts: list[str] = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(inner):
+        if ch in "<(":
+            depth += 1
+        elif ch in ">)":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(inner[start:i].strip())
+            start = i + 1
+    parts.append(inner[start:].strip())
+    return [p for p in parts if p]
+
+
+def _component_types(type_str: str) -> list[str]:
+    """Types nested in ``type_str``: generic arguments and tuple members."""
+    t = type_str.strip().lstrip("@")
+    if t.startswith("(") and t.endswith(")"):
+        return _split_top_level(t[1:-1])
+    if "<" in t and t.endswith(">"):
+        return _split_top_level(t[t.index("<") + 1 : -1])
+    return []
+
+
+def _function_types(fn: dict) -> Iterable[str]:
+    for arg in fn.get("inputs", ()):
+        yield arg["type"]
+    for out in fn.get("outputs", ()):
+        yield out["type"]
+
+
+def trim_abi(abi: list, functions: Iterable[str]) -> list:
+    """Return the subset of ``abi`` needed to call ``functions``.
+
+    Raises ``ValueError`` if a requested function is not in the ABI, so a
+    stale profile fails loudly at start-up instead of at the first call.
+    """
+    wanted = set(functions)
+    defined = {e["name"]: e for e in abi if e["type"] in ("struct", "enum")}
+
+    kept_interfaces: list[dict] = []
+    found: set[str] = set()
+    for entry in abi:
+        if entry["type"] == "interface":
+            items = [i for i in entry["items"] if i.get("name") in wanted]
+            if items:
+                kept_interfaces.append({**entry, "items": items})
+                found.update(i["name"] for i in items)
+        elif entry["type"] == "function" and entry["name"] in wanted:
+            kept_interfaces.append(entry)
+            found.add(entry["name"])
+    missing = wanted - found
+    if missing:
+        raise ValueError(f"ABI has no function(s) {sorted(missing)}")
+
+    interface_names = {e["name"] for e in kept_interfaces if e["type"] == "interface"}
+    impls = [
+        e for e in abi
+        if e["type"] == "impl" and e.get("interface_name") in interface_names
+    ]
+
+    # Transitive closure over referenced structs / enums.
+    pending = [
+        t
+        for e in kept_interfaces
+        for fn in (e["items"] if e["type"] == "interface" else [e])
+        for t in _function_types(fn)
+    ]
+    needed: set[str] = set()
+    while pending:
+        type_str = pending.pop().strip().lstrip("@")
+        if type_str in needed:
+            continue
+        pending.extend(_component_types(type_str))
+        entry = defined.get(type_str)
+        if entry is None:
+            continue
+        needed.add(type_str)
+        members = entry.get("members") or entry.get("variants") or ()
+        pending.extend(m["type"] for m in members)
+
+    types = [e for e in abi if e["type"] in ("struct", "enum") and e["name"] in needed]
+    return impls + kept_interfaces + types
+
+
+@lru_cache(maxsize=None)
+def load_profiled_abi(name: str) -> list:
+    """ABI for building ``Contract`` objects, trimmed unless ``ABI_PROFILE=full``."""
+    abi = load_abi(name)
+    if ABI_PROFILE == "full" or name not in ABI_PROFILES:
+        return abi
+    return trim_abi(abi, ABI_PROFILES[name])
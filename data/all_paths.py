@@ -13,10 +13,11 @@ else:
 LOCALES_DIR = ROOT_DIR / "locales"
 FILES_DIR = ROOT_DIR / "files"
 USERS_DB = FILES_DIR / "users.db"
+CACHE_DIR = FILES_DIR / "cache"
 ABI_DIR = ROOT_DIR / "smart_contracts_abi"
 LOG_DIR = ROOT_DIR / "logs"
 
 
 # Создаем необходимые директории, если они не существуют
-for directory in [LOCALES_DIR, FILES_DIR, ABI_DIR, LOG_DIR]:
+for directory in [LOCALES_DIR, FILES_DIR, CACHE_DIR, ABI_DIR, LOG_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -25,6 +25,16 @@ STARKNET_RPC_URL: str | None = os.getenv("STARKNET_RPC_URL")
 if not STARKNET_RPC_URL:
     raise ValueError("STARKNET_RPC_URL is not set in .env")
 
+# Optional extra endpoints (comma-separated). STARKNET_RPC_URL stays the
+# first entry; with more than one URL the RPC transport routes, hedges and
+# fails over between them (see services.rpc_pool).
+STARKNET_RPC_URLS: list[str] = list(
+    dict.fromkeys(
+        [STARKNET_RPC_URL]
+        + [u.strip() for u in os.getenv("STARKNET_RPC_URLS", "").split(",") if u.strip()]
+    )
+)
+
 STARKNET_NETWORK: Network = os.getenv("STARKNET_NETWORK", "mainnet")  # type: ignore[assignment]
 if STARKNET_NETWORK not in ("mainnet", "sepolia"):
     raise ValueError(f"STARKNET_NETWORK must be 'mainnet' or 'sepolia', got {STARKNET_NETWORK!r}")
@@ -1,16 +1,31 @@
-from typing import List, Optional
+import os
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
 from datetime import datetime, timezone
 
 
 from sqlalchemy.future import select
 from db_api import sqlalchemy_
-from db_api.models import Users, Base
+from db_api.models import (
+    Base,
+    Subscription,
+    TrackedEntry,
+    UserRow,
+    Users,
+    resolve_attestation_stakers,
+)
+from db_api.sqlite_profile import create_writer_engine, engine_kwargs, tune_engine
+from db_api.writer import SingleWriter
 from data.all_paths import USERS_DB
-from sqlalchemy import and_, or_, update
+from sqlalchemy import and_, delete, exists, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-db = sqlalchemy_.DB(f'sqlite+aiosqlite:///{USERS_DB}', pool_recycle=3600, connect_args={'check_same_thread': False})
+_USERS_DB_URL = f'sqlite+aiosqlite:///{USERS_DB}'
+db = sqlalchemy_.DB(_USERS_DB_URL, **engine_kwargs())
+tune_engine(db.engine)
+# Every write below goes through this process's single writer: queued,
+# grouped into shared BEGIN IMMEDIATE transactions (db_api.writer).
+writer = SingleWriter(create_writer_engine(_USERS_DB_URL))
 
 
 async def get_account(user_id: str) -> Optional[Users]:
@@ -33,18 +48,190 @@ async def get_user_tracking(user_id: str) -> Optional[dict]:
     return None
 
 
-async def get_strk_notification_users() -> List[Users]:
+async def get_strk_notification_users(
+    user_ids: Optional[Sequence[int]] = None,
+) -> List[Users]:
     """Users that have *any* notification configured.
 
     Either the legacy STRK-only ``claim_reward_msg`` or the new
     ``notification_config`` JSON (USD threshold and/or per-token thresholds).
+    ``user_ids`` narrows the scan to one scheduler shard.
     """
     query = select(Users).where(
         (Users.claim_reward_msg != 0) | (Users.notification_config.isnot(None))
     )
+    if user_ids is not None:
+        if not user_ids:
+            return []
+        query = query.where(Users.user_id.in_(list(user_ids)))
     return await db.all(query)
 
 
+async def get_subscribed_users(
+    kinds: Optional[Sequence[str]] = None,
+    user_ids: Optional[Sequence[int]] = None,
+) -> List[Users]:
+    """Users with a ``subscriptions`` row of one of ``kinds`` (any kind
+    when ``None``), optionally narrowed to ``user_ids``.
+
+    Answered from the index — no ``notification_config`` is parsed to
+    find them.
+    """
+    if user_ids is not None and not user_ids:
+        return []
+    subscribed = select(Subscription.user_id)
+    if kinds is not None:
+        subscribed = subscribed.where(Subscription.kind.in_(list(kinds)))
+    query = select(Users).where(Users.user_id.in_(subscribed))
+    if user_ids is not None:
+        query = query.where(Users.user_id.in_(list(user_ids)))
+    return await db.all(query)
+
+
+# Rows per chunk of :func:`iter_subscribed_users`.
+_SCAN_CHUNK = int(os.getenv("USER_SCAN_CHUNK", "1000"))
+_USER_ROW_COLUMNS = (
+    Users.user_id,
+    Users.user_language,
+    Users.tracking_data,
+    Users.notification_config,
+    Users.claim_reward_msg,
+)
+
+
+async def iter_subscribed_users(
+    kinds: Optional[Sequence[str]] = None,
+    user_ids: Optional[Sequence[int]] = None,
+    *,
+    chunk: int = _SCAN_CHUNK,
+) -> AsyncIterator[List[UserRow]]:
+    """The users :func:`get_subscribed_users` returns, as chunks of
+    :class:`UserRow` in ``user_id`` order.
+
+    Only the columns a background cycle reads are selected, and each
+    chunk is its own short query (keyset pagination on ``user_id``, or a
+    slice of ``user_ids``): a cycle holds one chunk at a time however
+    large the table is, and no read transaction stays open across the
+    cycle's RPC and Telegram work.
+    """
+    chunk = max(1, chunk)
+    # Correlated EXISTS rather than ``IN (subquery)``: SQLite would build
+    # the whole subscriber set again for every chunk.
+    subscribed = exists().where(Subscription.user_id == Users.user_id)
+    if kinds is not None:
+        subscribed = subscribed.where(Subscription.kind.in_(list(kinds)))
+    base = select(*_USER_ROW_COLUMNS).where(subscribed).order_by(Users.user_id)
+    wanted = sorted(set(user_ids)) if user_ids is not None else None
+    after: Optional[int] = None
+    offset = 0
+    while True:
+        if wanted is not None:
+            ids = wanted[offset:offset + chunk]
+            if not ids:
+                return
+            offset += chunk
+            query = base.where(Users.user_id.in_(ids))
+        else:
+            query = base.limit(chunk)
+            if after is not None:
+                query = query.where(Users.user_id > after)
+        async with AsyncSession(db.engine) as session:
+            rows = [UserRow(*row) for row in (await session.execute(query)).all()]
+        if rows:
+            after = rows[-1].user_id
+            yield rows
+        elif wanted is None:
+            return
+
+
+async def get_subscriber_ids(kinds: Optional[Sequence[str]] = None) -> List[int]:
+    """Ids of the users :func:`get_subscribed_users` would return."""
+    query = select(Subscription.user_id).distinct()
+    if kinds is not None:
+        query = query.where(Subscription.kind.in_(list(kinds)))
+    return list(await db.all(query.order_by(Subscription.user_id)))
+
+
+async def get_attestation_watchers() -> Dict[str, Set[int]]:
+    """Canonical staker address → ids of the users with attestation alerts on."""
+    query = select(Subscription.staker_address, Subscription.user_id).where(
+        Subscription.kind == "attestation"
+    )
+    async with AsyncSession(db.engine) as session:
+        rows = (await session.execute(query)).all()
+    watchers: Dict[str, Set[int]] = {}
+    for staker, user_id in rows:
+        watchers.setdefault(staker, set()).add(user_id)
+    return watchers
+
+
+async def get_trackers(
+    *, staker: Optional[str] = None, delegator: Optional[str] = None
+) -> List[int]:
+    """Ids of the users tracking ``staker`` (as a validator or as a
+    delegation's staker) and/or ``delegator``."""
+    from services.snapshot_store import address_part
+
+    query = select(TrackedEntry.user_id).distinct()
+    if staker is not None:
+        query = query.where(TrackedEntry.staker_address == address_part(staker))
+    if delegator is not None:
+        query = query.where(TrackedEntry.delegator_address == address_part(delegator))
+    return list(await db.all(query.order_by(TrackedEntry.user_id)))
+
+
+def user_index_rows(
+    user_id: int, doc: dict, cfg: dict
+) -> Tuple[List[TrackedEntry], List[Subscription]]:
+    """The ``tracked_entries`` and ``subscriptions`` rows of one user.
+
+    ``doc`` is the tracking doc, ``cfg`` what
+    :meth:`Users.get_notification_config` returns (the legacy
+    ``claim_reward_msg`` already folded in).
+    """
+    from services.snapshot_store import address_part
+    from services.tracking_service import tracked_items
+
+    entries = [
+        TrackedEntry(
+            user_id=user_id,
+            kind=kind,
+            staker_address=address_part(a1 if kind == "validator" else a2) or None,
+            delegator_address=address_part(a1) if kind == "delegator" else None,
+            label=label or None,
+            position=position,
+        )
+        for position, (kind, a1, a2, label) in enumerate(tracked_items(doc))
+    ]
+    subscriptions: List[Subscription] = []
+    if float(cfg.get("usd_threshold") or 0) > 0 or cfg.get("token_thresholds"):
+        subscriptions.append(Subscription(user_id=user_id, kind="rewards"))
+    stakers = resolve_attestation_stakers(cfg, doc.get("validators", []))
+    for staker in sorted({address_part(s) for s in stakers if s}):
+        subscriptions.append(
+            Subscription(user_id=user_id, kind="attestation", staker_address=staker)
+        )
+    if float(cfg.get("operator_balance_min_strk") or 0) > 0:
+        subscriptions.append(Subscription(user_id=user_id, kind="operator_balance"))
+    return entries, subscriptions
+
+
+async def sync_user_index(session: AsyncSession, user: Users) -> int:
+    """Rewrite ``user``'s index rows from its JSON columns; returns how
+    many rows it wrote.
+
+    Runs inside the caller's session so the rows commit (or roll back)
+    together with the write that changed the JSON.
+    """
+    entries, subscriptions = user_index_rows(
+        user.user_id, user.get_tracking_data(), user.get_notification_config()
+    )
+    await session.execute(delete(TrackedEntry).where(TrackedEntry.user_id == user.user_id))
+    await session.execute(delete(Subscription).where(Subscription.user_id == user.user_id))
+    session.add_all([*entries, *subscriptions])
+    return len(entries) + len(subscriptions)
+
+
 async def initialize_db():
     await db.create_tables(Base)
     # Backfill the missing uniqueness contract on Users.user_id.
@@ -80,10 +267,28 @@ async def initialize_db():
             )
 
 
+async def add_user(user: Users) -> Users:
+    """INSERT a new ``users`` row through the writer.
+
+    Raises :class:`sqlalchemy.exc.IntegrityError` when a row with the same
+    ``user_id`` is already there (the UNIQUE INDEX from
+    :func:`initialize_db`). The returned object stays loaded after the
+    commit (the writer's session doesn't expire on commit).
+    """
+    async def _op(session: AsyncSession) -> Users:
+        session.add(user)
+        await session.flush()
+        return user
+
+    return await writer.run(_op)
+
+
 async def write_to_db(user: Users):
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> None:
         await session.merge(user)
-        await session.commit()
+        await sync_user_index(session, user)
+
+    await writer.run(_op)
 
 
 async def update_attestation_state(user_id: int, state: dict) -> None:
@@ -96,7 +301,7 @@ async def update_attestation_state(user_id: int, state: dict) -> None:
     JSON slice we own, and emit a targeted ``UPDATE notification_config``
     so other columns aren't touched at all.
     """
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> None:
         result = await session.execute(
             select(Users).where(Users.user_id == user_id)
         )
@@ -117,7 +322,8 @@ async def update_attestation_state(user_id: int, state: dict) -> None:
             .where(Users.user_id == user_id)
             .values(notification_config=user.notification_config)
         )
-        await session.commit()
+
+    await writer.run(_op)
 
 
 async def update_operator_balance_was_below(
@@ -133,7 +339,7 @@ async def update_operator_balance_was_below(
     ``was_below`` keys are staker addresses, values booleans. Persistence
     keeps only True entries (absence means "above").
     """
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> None:
         result = await session.execute(
             select(Users).where(Users.user_id == user_id)
         )
@@ -156,7 +362,8 @@ async def update_operator_balance_was_below(
             .where(Users.user_id == user_id)
             .values(notification_config=user.notification_config)
         )
-        await session.commit()
+
+    await writer.run(_op)
 
 
 # Back-compat alias for legacy callers (none expected in-tree, but the
@@ -196,7 +403,7 @@ async def add_tracking_entry(
 
     list_key = "validators" if kind == "validator" else "delegations"
 
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> dict:
         result = await session.execute(
             select(Users).where(Users.user_id == user_id)
         )
@@ -245,9 +452,12 @@ async def add_tracking_entry(
             .where(Users.user_id == user_id)
             .values(tracking_data=new_json)
         )
-        await session.commit()
+        user.tracking_data = new_json
+        await sync_user_index(session, user)
         return doc
 
+    return await writer.run(_op)
+
 
 async def update_label(
     user_id: int,
@@ -277,7 +487,7 @@ async def update_label(
         rename_tracking_entry,
     )
 
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> dict:
         result = await session.execute(
             select(Users).where(Users.user_id == user_id)
         )
@@ -299,9 +509,12 @@ async def update_label(
             .where(Users.user_id == user_id)
             .values(tracking_data=new_json)
         )
-        await session.commit()
+        user.tracking_data = new_json
+        await sync_user_index(session, user)
         return new_doc
 
+    return await writer.run(_op)
+
 
 async def reorder_tracking_entries(
     user_id: int,
@@ -338,7 +551,7 @@ async def reorder_tracking_entries(
         reorder_tracking_doc_v2,
     )
 
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> dict:
         result = await session.execute(
             select(Users).where(Users.user_id == user_id)
         )
@@ -366,9 +579,49 @@ async def reorder_tracking_entries(
             .where(Users.user_id == user_id)
             .values(tracking_data=new_json)
         )
-        await session.commit()
+        user.tracking_data = new_json
+        await sync_user_index(session, user)
         return new_doc
 
+    return await writer.run(_op)
+
+
+async def edit_tracking_data(user_id: int, edit: Callable[[dict], object]) -> str:
+    """Atomically apply ``edit`` to the user's tracking doc.
+
+    For the bot's remove / rename flows: same story as
+    :func:`update_label` — ``edit`` mutates a doc re-read inside the
+    writer's transaction, then one targeted ``UPDATE tracking_data`` and
+    the index sync. An exception from ``edit`` (an entry that is gone by
+    now) propagates and nothing is written.
+
+    Returns the new ``tracking_data`` JSON. Raises :class:`ValueError`
+    when the user row doesn't exist.
+    """
+    from services.tracking_service import dump_tracking, load_tracking
+
+    async def _op(session: AsyncSession) -> str:
+        result = await session.execute(
+            select(Users).where(Users.user_id == user_id)
+        )
+        user = result.scalars().first()
+        if user is None:
+            raise ValueError(f"user {user_id} not found")
+
+        doc = load_tracking(user.tracking_data)
+        edit(doc)
+        new_json = dump_tracking(doc)
+        await session.execute(
+            update(Users)
+            .where(Users.user_id == user_id)
+            .values(tracking_data=new_json)
+        )
+        user.tracking_data = new_json
+        await sync_user_index(session, user)
+        return new_json
+
+    return await writer.run(_op)
+
 
 async def clear_request_queue(user_id: int) -> None:
     """Atomically null out ``request_queue`` for a user.
@@ -384,13 +637,14 @@ async def clear_request_queue(user_id: int) -> None:
     A targeted ``UPDATE users SET request_queue = NULL WHERE user_id = ?``
     keeps the queue dequeue idempotent without touching anything else.
     """
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> None:
         await session.execute(
             update(Users)
             .where(Users.user_id == user_id)
             .values(request_queue=None)
         )
-        await session.commit()
+
+    await writer.run(_op)
 
 
 async def clear_notifications_if_empty(user_id: int) -> Optional[str]:
@@ -403,7 +657,7 @@ async def clear_notifications_if_empty(user_id: int) -> Optional[str]:
     Returns the user's current language for the follow-up "no addresses"
     DM, or ``None`` if nothing was cleared.
     """
-    async with AsyncSession(db.engine) as session:
+    async def _op(session: AsyncSession) -> Optional[str]:
         result = await session.execute(
             select(Users).where(Users.user_id == user_id)
         )
@@ -419,10 +673,15 @@ async def clear_notifications_if_empty(user_id: int) -> Optional[str]:
         doc = user.get_tracking_data()
         if doc.get("validators") or doc.get("delegations"):
             return None
+        # Read before the commit expires the row.
+        locale = user.user_language or "en"
         await session.execute(
             update(Users)
             .where(Users.user_id == user_id)
             .values(claim_reward_msg=0, notification_config=None)
         )
-        await session.commit()
-        return user.user_language or "en"
\ No newline at end of file
+        user.claim_reward_msg, user.notification_config = 0, None
+        await sync_user_index(session, user)
+        return locale
+
+    return await writer.run(_op)
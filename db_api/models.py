@@ -1,6 +1,9 @@
 import json
+from dataclasses import dataclass
+from typing import Optional
+
 from data.models import AutoRepr
-from sqlalchemy import (Column, Integer, Text, Boolean, DateTime)
+from sqlalchemy import (Column, Integer, Text, Boolean, DateTime, Index)
 from sqlalchemy.orm import declarative_base
 
 
@@ -173,4 +176,77 @@ class Users(Base, AutoRepr):
         ):
             self.notification_config = None
         else:
-            self.notification_config = json.dumps(clean)
\ No newline at end of file
+            self.notification_config = json.dumps(clean)
+
+
+@dataclass(slots=True)
+class UserRow:
+    """The columns a background cycle reads from a ``users`` row.
+
+    A plain projection instead of a ``Users`` entity: no identity map,
+    no instrumentation, gone as soon as the cycle drops its chunk
+    (``db_api.database.iter_subscribed_users``). The JSON accessors are
+    ``Users``' own, so a row reads exactly like the entity.
+    """
+    user_id: int
+    user_language: Optional[str]
+    tracking_data: Optional[str]
+    notification_config: Optional[str]
+    claim_reward_msg: Optional[int]
+
+    get_tracking_data = Users.get_tracking_data
+    get_notification_config = Users.get_notification_config
+
+
+def resolve_attestation_stakers(cfg: dict, validators: list[dict]) -> set[str]:
+    """Return the lower-cased staker addresses the user wants alerts for.
+
+    Supports both the new per-validator schema (``attestation_alerts_for``)
+    and the legacy global boolean (``attestation_alerts``) so older configs
+    keep working without a migration job.
+    """
+    raw = cfg.get("attestation_alerts_for")
+    if isinstance(raw, list):
+        return {str(a).lower() for a in raw if a}
+    if cfg.get("attestation_alerts"):
+        return {(v.get("address") or "").lower() for v in validators}
+    return set()
+
+
+# Reverse indexes of the two JSON columns above. ``Users`` stays the
+# source of truth: every writer of ``tracking_data`` / ``notification_config``
+# rewrites the user's rows here in the same transaction
+# (``db_api.database.sync_user_index``), and ``migrations`` backfills rows
+# that predate the tables. Addresses are stored canonical (``hex(int(a, 16))``)
+# so ``0x0AbC`` and ``0xabc`` meet in one index entry.
+
+
+class TrackedEntry(Base, AutoRepr):
+    """One tracked validator or delegation of one user."""
+    __tablename__ = 'tracked_entries'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True, nullable=False)
+    kind = Column(Text, nullable=False)  # "validator" | "delegator"
+    staker_address = Column(Text, index=True)
+    delegator_address = Column(Text, index=True)  # NULL for validators
+    label = Column(Text)
+    position = Column(Integer)  # display order
+
+
+# Subscription kinds: the reward digest (any threshold set), per-staker
+# attestation alerts, and the operator-balance alert (staker NULL).
+SUBSCRIPTION_KINDS = ("rewards", "attestation", "operator_balance")
+
+
+class Subscription(Base, AutoRepr):
+    """One alert a user opted into, per staker where it is per staker."""
+    __tablename__ = 'subscriptions'
+    __table_args__ = (
+        Index("ix_subscriptions_kind_staker", "kind", "staker_address"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True, nullable=False)
+    kind = Column(Text, nullable=False)
+    staker_address = Column(Text)
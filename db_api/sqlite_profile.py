@@ -0,0 +1,103 @@
+"""Connection profile for ``users.db``.
+
+The bot, its two worker processes and the API container all write to
+the same SQLite file. With SQLAlchemy's defaults that file runs in
+rollback-journal mode — a writer blocks every reader, each commit is a
+full fsync — and a read-modify-write session that finds another writer
+holding the lock raises ``database is locked`` instead of waiting.
+
+``SQLITE_PROFILE=tuned`` (the default) applies, on every new connection:
+
+  * ``journal_mode=WAL`` — readers run alongside the one writer (the
+    setting is stored in the file and outlives a switch back);
+  * ``synchronous=NORMAL`` — in WAL mode a commit no longer fsyncs, only
+    checkpoints do; a power cut can lose the last commits, never corrupt;
+  * ``busy_timeout`` — a writer that finds the lock taken waits up to
+    ``SQLITE_BUSY_TIMEOUT_MS`` instead of failing at once;
+  * ``mmap_size`` / ``cache_size`` — reads served from the page cache;
+
+plus a sized connection pool (``SQLITE_POOL_SIZE`` /
+``SQLITE_MAX_OVERFLOW``). ``SQLITE_PROFILE=default`` keeps SQLAlchemy's
+settings, for comparison (``scripts.bench_sqlite_writers``).
+
+:func:`create_writer_engine` builds the engine of the per-process single
+writer (:mod:`db_api.writer`): one connection whose transactions start
+with ``BEGIN IMMEDIATE``. A deferred transaction that reads and then
+writes has to upgrade its lock, and in WAL mode an upgrade that loses a
+race fails right away, ``busy_timeout`` or not; taking the write lock up
+front makes the wait a plain, timed-out one.
+"""
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+PROFILE = os.getenv("SQLITE_PROFILE", "tuned").lower()
+_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000"))
+_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))
+_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "8"))
+
+
+def _pragmas(profile: str) -> list[str]:
+    if profile != "tuned":
+        return []
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{_CACHE_SIZE_KB}",
+    ]
+
+
+def engine_kwargs(profile: str = PROFILE) -> dict:
+    """``create_async_engine`` keyword arguments for ``profile``."""
+    kwargs: dict = {
+        "pool_recycle": 3600,
+        "connect_args": {"check_same_thread": False},
+    }
+    if profile == "tuned":
+        kwargs["pool_size"] = _POOL_SIZE
+        kwargs["max_overflow"] = _MAX_OVERFLOW
+        kwargs["connect_args"]["timeout"] = _BUSY_TIMEOUT_MS / 1000
+    return kwargs
+
+
+def tune_engine(engine: AsyncEngine, profile: str = PROFILE) -> AsyncEngine:
+    """Run ``profile``'s PRAGMAs on each connection ``engine`` opens."""
+    pragmas = _pragmas(profile)
+    if not pragmas:
+        return engine
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+def create_writer_engine(url: str, profile: str = PROFILE) -> AsyncEngine:
+    """One-connection engine whose transactions begin ``IMMEDIATE``."""
+    kwargs = engine_kwargs(profile)
+    kwargs.update(pool_size=1, max_overflow=0)
+    engine = tune_engine(create_async_engine(url, **kwargs), profile)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _no_implicit_begin(dbapi_connection, _record) -> None:
+        # Let SQLAlchemy emit BEGIN itself (pysqlite's own implicit BEGIN
+        # is DEFERRED and also breaks SAVEPOINTs).
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_immediate(conn) -> None:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
@@ -6,9 +6,7 @@ actually matter: INSERT (first contact) and username UPDATE.
 """
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from db_api.database import db, get_account, write_to_db
+from db_api.database import add_user, get_account, write_to_db
 from db_api.models import Users
 from utils.logger import logger
 
@@ -34,34 +32,30 @@ async def get_or_create_user(user_id, user_name, user_language, registration_dat
 
     user = await get_account(user_id)
     if user is None:
-        # ``expire_on_commit=False`` keeps the freshly-inserted ``user``
-        # usable after the session closes. With the default (``True``),
-        # SQLAlchemy expires every attribute at commit time and the next
-        # access from the middleware (``user.user_language``) tries to
-        # reload from a now-detached session, raising
-        # ``DetachedInstanceError`` — which aiogram swallows silently and
-        # the user has to press /start a second time before the row
-        # already exists and the read path goes through ``get_account``.
-        async with AsyncSession(db.engine, expire_on_commit=False) as session:
-            user = Users(
-                user_id=user_id,
-                user_name=user_name,
-                user_language=user_language,
-                registration_data=registration_date,
+        # ``add_user`` goes through the single writer, whose session keeps
+        # the freshly-inserted ``user`` loaded after the commit. An expired
+        # object would make the next access from the middleware
+        # (``user.user_language``) reload from a now-detached session,
+        # raising ``DetachedInstanceError`` — which aiogram swallows
+        # silently and the user has to press /start a second time.
+        try:
+            user = await add_user(
+                Users(
+                    user_id=user_id,
+                    user_name=user_name,
+                    user_language=user_language,
+                    registration_data=registration_date,
+                )
             )
-            try:
-                session.add(user)
-                await session.commit()
-                logger.info(f"new user: {user_id} @{user_name} ({user_language})")
-                return user
-            except IntegrityError:
-                # Lost the race against another /start; the row is there now.
-                await session.rollback()
-        existing = await get_account(user_id)
-        if existing is not None:
-            return existing
-        # Extremely unlikely: integrity error but no row found. Surface it.
-        raise
+            logger.info(f"new user: {user_id} @{user_name} ({user_language})")
+            return user
+        except IntegrityError as exc:
+            # Lost the race against another /start; the row is there now.
+            existing = await get_account(user_id)
+            if existing is not None:
+                return existing
+            # Extremely unlikely: integrity error but no row found. Surface it.
+            raise exc
 
     if user_name != user.user_name:
         old = user.user_name
@@ -0,0 +1,158 @@
+"""Per-process single writer for ``users.db``.
+
+Every targeted write in :mod:`db_api.database` used to open its own
+session and commit on its own: an attestation tick that moved 300 users'
+alert state ran 300 read-modify-write transactions, each taking the
+file's write lock and (outside WAL) an fsync, racing the same writes from
+the other processes.
+
+:class:`SingleWriter` queues them instead. One task per process (per
+event loop) takes what is queued — up to ``SQLITE_WRITE_BATCH``
+operations, waiting at most ``SQLITE_WRITE_LINGER_MS`` for stragglers
+after the first — and runs them in one ``BEGIN IMMEDIATE`` transaction
+on its own connection (:func:`db_api.sqlite_profile.create_writer_engine`):
+
+  * each operation runs in a SAVEPOINT, so one that raises (a duplicate
+    tracking entry, an unknown user) is rolled back and gets its
+    exception, and the rest of the batch still commits;
+  * a caller's ``await`` returns only once the batch has committed — the
+    same guarantee as committing itself;
+  * if the commit fails, every caller in the batch gets that error.
+
+An operation is ``async def op(session) -> result``: it reads and writes
+through ``session`` and must not commit, and it must not queue another
+write (the writer would wait on itself).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from utils.logger import logger
+
+T = TypeVar("T")
+WriteOp = Callable[[AsyncSession], Awaitable[T]]
+
+_BATCH = max(1, int(os.getenv("SQLITE_WRITE_BATCH", "64")))
+_LINGER_S = float(os.getenv("SQLITE_WRITE_LINGER_MS", "2")) / 1000
+
+
+class SingleWriter:
+    """Group queued write operations into shared transactions."""
+
+    def __init__(
+        self, engine: AsyncEngine, *, batch: int = _BATCH, linger: float = _LINGER_S
+    ) -> None:
+        self.engine = engine
+        self.batch = max(1, batch)
+        self.linger = linger
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.ops = 0
+        self.transactions = 0
+        self.failed_ops = 0
+        self.failed_batches = 0
+
+    def _ensure_task(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            # New process or event loop: the old queue belongs to a dead loop.
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def run(self, op: WriteOp[T]) -> T:
+        """Queue ``op``; returns its result once its batch has committed."""
+        future = asyncio.get_running_loop().create_future()
+        self._ensure_task().put_nowait((op, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> list:
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.linger
+        while len(batch) < self.batch:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = await self._collect(queue)
+            try:
+                await self._commit(batch)
+            except asyncio.CancelledError:
+                # Shutting down mid-batch: the transaction rolled back.
+                for _op, future in batch:
+                    future.cancel()
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self.failed_batches += 1
+                logger.error(f"db writer: batch of {len(batch)} failed: {exc!r}")
+                for _op, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    async def _commit(self, batch: list) -> None:
+        outcomes: list[tuple[asyncio.Future, object, BaseException | None]] = []
+        async with (
+            AsyncSession(self.engine, expire_on_commit=False) as session,
+            session.begin(),
+        ):
+            for op, future in batch:
+                try:
+                    async with session.begin_nested():
+                        result = await op(session)
+                    outcomes.append((future, result, None))
+                except Exception as exc:  # noqa: BLE001
+                    self.failed_ops += 1
+                    outcomes.append((future, None, exc))
+        self.transactions += 1
+        self.ops += len(batch)
+        for future, result, exc in outcomes:
+            if future.done():
+                continue  # caller went away
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the writer task and close its connection. A batch being
+        committed rolls back; its callers and the queued ones are cancelled."""
+        task, queue = self._task, self._queue
+        self._task = self._queue = self._loop = None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        while queue is not None and not queue.empty():
+            _op, future = queue.get_nowait()
+            future.cancel()
+        await self.engine.dispose()
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "ops": self.ops,
+            "transactions": self.transactions,
+            "ops_per_transaction": round(self.ops / self.transactions, 2)
+            if self.transactions
+            else 0,
+            "failed_ops": self.failed_ops,
+            "failed_batches": self.failed_batches,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
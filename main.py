@@ -98,13 +98,18 @@ def run_notification_processor():
         signal.signal(signal.SIGTERM, signal.SIG_IGN)
 
         async def _runner():
+            from services.head_tracker import start_head_tracker
+
             await _warm_contracts()
             # Two independent watchers in one process — they share the warm
-            # ABI cache and the price service, but tick at very different
-            # frequencies (rewards: hourly, attestation: 60s).
+            # ABI cache, the price service and the head tracker, but fire
+            # at very different cadences (rewards: per epoch / hourly,
+            # attestation: every few blocks).
+            tracker = start_head_tracker()
             await asyncio.gather(
                 send_strk_notification(),
                 send_attestation_alerts(),
+                *([tracker.run()] if tracker is not None else []),
             )
 
         asyncio.run(_runner())
@@ -353,6 +358,11 @@ async def start_bot():
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"contract warm-up skipped: {exc}")
 
+        # Expired shared-cache rows are swept here rather than on read.
+        from utils.cache import start_cache_sweeper
+
+        start_cache_sweeper()
+
         # Запускаем бота
         await dp.start_polling(bot)
         
@@ -17,11 +17,14 @@ re-add manually.
 from __future__ import annotations
 
 from loguru import logger
-from sqlalchemy import text
+from sqlalchemy import or_, select, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db_api.database import db
+from db_api.database import db, sync_user_index
+from db_api.models import Subscription, TrackedEntry, Users
+
+_BACKFILL_BATCH = 500
 
 
 async def _add_column_if_missing(session: AsyncSession, col: str, ddl: str) -> None:
@@ -47,8 +50,46 @@ async def migrate_notification_config(session: AsyncSession) -> None:
     await _add_column_if_missing(session, "notification_config", "TEXT DEFAULT NULL")
 
 
+async def migrate_user_index(session: AsyncSession) -> None:
+    """Backfill ``tracked_entries`` / ``subscriptions`` from the JSON columns.
+
+    ``initialize_db`` creates the tables; every writer keeps them in sync
+    from then on. This indexes the users that have JSON data but no index
+    row yet — all of them on the first boot, afterwards only the ones
+    whose documents are empty (a cheap no-op). Commits every
+    ``_BACKFILL_BATCH`` users so a large table doesn't hold one long
+    write transaction.
+    """
+    already = select(TrackedEntry.user_id).union(select(Subscription.user_id))
+    query = (
+        select(Users)
+        .where(
+            or_(
+                Users.tracking_data.isnot(None),
+                Users.notification_config.isnot(None),
+                Users.claim_reward_msg != 0,
+            ),
+            Users.user_id.notin_(already),
+        )
+        .order_by(Users.user_id)
+    )
+    users = (await session.execute(query)).scalars().all()
+    # Detached, so the batch commits below don't expire them mid-loop.
+    session.expunge_all()
+    indexed = 0
+    for done, user in enumerate(users, 1):
+        if await sync_user_index(session, user):
+            indexed += 1
+        if done % _BACKFILL_BATCH == 0:
+            await session.commit()
+    await session.commit()
+    if indexed:
+        logger.info(f"migration: indexed tracking / subscriptions of {indexed} users")
+
+
 async def run_all() -> None:
     """Run every migration in declaration order; each is idempotent."""
     async with AsyncSession(db.engine) as session:
         await migrate_request_queue(session)
         await migrate_notification_config(session)
+        await migrate_user_index(session)
@@ -0,0 +1,158 @@
+"""Benchmark: per-user attestation checks vs the two-phase tick.
+
+Builds ``--users`` attestation subscribers (10k by default), each
+watching 1–3 stakers drawn Zipf-skewed from ``--stakers`` validators,
+half of them with the operator-balance alert on, and runs one steady
+tick and one epoch-boundary tick two ways against fake reads that sleep
+``--latency-ms`` each:
+
+  1. per user — every subscriber reads its own stakers'
+     ``staker_raw`` and operator balance (statuses still go through the
+     shared snapshot store), as ``_check_user`` did;
+  2. two-phase (``tasks.attestation_alerts._run_checks``) — the unique
+     stakers' status and balance are read once, concurrently, then each
+     user's state machines run on the shared results.
+
+For each it prints status / ``staker_raw`` / balance reads and wall
+time, to compare against the ``ATTESTATION_INTERVAL_SECONDS`` budget.
+Nothing touches the network, the database or Telegram.
+
+Usage
+-----
+::
+
+    python -m scripts.bench_attestation_tick
+    python -m scripts.bench_attestation_tick --users 20000 --latency-ms 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import Counter
+from decimal import Decimal
+from types import SimpleNamespace
+
+# The services read these at import; nothing is sent.
+os.environ.setdefault("STARKNET_RPC_URL", "http://127.0.0.1:9")
+os.environ.setdefault("BOT_TOKEN", "0:bench")
+os.environ.setdefault("EVENT_FOLLOWER", "0")
+
+from data.models import semaphore  # noqa: E402
+from services.snapshot_store import snapshots  # noqa: E402
+from services.staking_dto import AttestationStatus  # noqa: E402
+from tasks import attestation_alerts as aa  # noqa: E402
+
+_EPOCH = 5000
+
+
+def _population(users: int, stakers: int, seed: int) -> list:
+    rng = random.Random(seed)
+    addresses = [hex(0x1000 + i) for i in range(stakers)]
+    weights = [1 / (i + 1) for i in range(stakers)]
+    population = []
+    for user_id in range(users):
+        watched = set(rng.choices(addresses, weights, k=rng.randint(1, 3)))
+        cfg = {
+            "attestation_alerts_for": sorted(watched),
+            "operator_balance_min_strk": rng.choice([0, 50]),
+        }
+        doc = {"validators": [{"address": a} for a in watched], "delegations": []}
+        population.append(
+            SimpleNamespace(
+                user_id=user_id,
+                user_language="en",
+                tracking_data=json.dumps(doc),
+                get_notification_config=lambda cfg=cfg: cfg,
+            )
+        )
+    return population
+
+
+class _FakeChain:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.reads: Counter[str] = Counter()
+
+    async def status(self, staker: str, **_kwargs) -> AttestationStatus:
+        self.reads["status"] += 1
+        await asyncio.sleep(self.latency)
+        return AttestationStatus(
+            last_epoch_attested=_EPOCH,
+            current_epoch=_EPOCH,
+            missed_epochs=0,
+            is_attesting_this_epoch=True,
+        )
+
+    async def staker_raw(self, staker: str) -> dict:
+        self.reads["staker_raw"] += 1
+        await asyncio.sleep(self.latency)
+        return {"operational_address": int(staker, 16) + 1}
+
+    async def balance(self, account: str) -> Decimal:
+        self.reads["balance"] += 1
+        await asyncio.sleep(self.latency)
+        return Decimal(int(account, 16) % 100)
+
+
+async def _per_user(users, *, epoch_changed: bool) -> None:
+    async def _one(user) -> None:
+        async with semaphore:
+            await aa._check_user(user, _EPOCH, epoch_changed=epoch_changed)
+
+    await asyncio.gather(*(_one(u) for u in users))
+
+
+async def _two_phase(users, *, epoch_changed: bool) -> None:
+    await aa._run_checks(users, current_epoch=_EPOCH, epoch_changed=epoch_changed)
+
+
+async def _noop(*_args, **_kwargs) -> None:
+    return None
+
+
+async def _run(args) -> None:
+    users = _population(args.users, args.stakers, args.seed)
+    aa._send = _noop
+    aa.update_attestation_state = _noop
+    aa.update_operator_balance_was_below = _noop
+    subs = sum(len(u.get_notification_config()["attestation_alerts_for"]) for u in users)
+    print(
+        f"{len(users)} users, {subs} subscriptions over {args.stakers} stakers, "
+        f"latency {args.latency_ms} ms/read\n"
+    )
+    print(
+        f"{'mode':24s} {'tick':9s} {'status':>7s} {'raw':>7s} "
+        f"{'balance':>8s} {'wall s':>8s}"
+    )
+    for name, runner in (("per user", _per_user), ("two-phase", _two_phase)):
+        for tick, boundary in (("steady", False), ("boundary", True)):
+            chain = _FakeChain(args.latency_ms / 1000)
+            aa.fetch_attestation_status = chain.status
+            aa.fetch_staker_raw = chain.staker_raw
+            aa.fetch_strk_balance = chain.balance
+            snapshots.clear()
+            started = time.perf_counter()
+            await runner(users, epoch_changed=boundary)
+            took = time.perf_counter() - started
+            r = chain.reads
+            print(
+                f"{name:24s} {tick:9s} {r['status']:7d} {r['staker_raw']:7d} "
+                f"{r['balance']:8d} {took:8.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--stakers", type=int, default=150, help="distinct validators")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="per node read")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Micro-benchmark: ``Contract`` ABI path vs the precompiled call table.
+
+Compares, without touching the network:
+
+  1. one-off setup — building the staking / pool / attestation
+     ``Contract`` objects vs building :data:`services.raw_calls.CALL_TABLE`
+     (six selectors);
+  2. per-call CPU — starknet-py's calldata serialization + output
+     deserialization vs the hand-written decoders, on representative
+     felt arrays for each of the six hot reads.
+
+Usage
+-----
+::
+
+    python -m scripts.bench_raw_calls            # 20k iterations per read
+    python -m scripts.bench_raw_calls -n 100000
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import time
+
+# The services import the RPC URL at module level; nothing is sent.
+os.environ.setdefault("STARKNET_RPC_URL", "http://127.0.0.1:9")
+
+from starknet_py.contract import Contract  # noqa: E402
+from starknet_py.net.full_node_client import FullNodeClient  # noqa: E402
+
+from data.contracts import load_abi  # noqa: E402
+
+# Representative results: staker with a pool and an unstake time, two
+# delegation pools, a member with a pending unpool.
+_SAMPLES: dict[str, tuple[str, list[int], list[int]]] = {
+    "get_staker_info_v1": (
+        "l2_staking_contract",
+        [0x1234],
+        [0, 0x11, 0x22, 0, 1_700_000_000, 10**24, 7 * 10**18, 0, 0x33, 4 * 10**23, 1000],
+    ),
+    "staker_pool_info": (
+        "l2_staking_contract",
+        [0x1234],
+        [0, 1000, 2, 0xA, 0xB, 10**23, 0xC, 0xD, 5 * 10**8],
+    ),
+    "get_current_epoch": ("l2_staking_contract", [], [4242]),
+    "get_epoch_info": ("l2_staking_contract", [], [3600, 300, 1_000_000, 1000, 300, 3600]),
+    "get_pool_member_info_v1": (
+        "l2_pool_contract",
+        [0x5678],
+        [0, 0x11, 10**21, 5 * 10**17, 1000, 10**20, 0, 1_700_000_000],
+    ),
+    "get_last_epoch_attestation_done": ("l2_attestation_contract", [0x1234], [4241]),
+}
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=20_000, help="iterations per read")
+    args = parser.parse_args()
+
+    provider = FullNodeClient(node_url=os.environ["STARKNET_RPC_URL"])
+
+    print("setup")
+    contracts: dict[str, Contract] = {}
+    for abi_name in sorted({abi for abi, _, _ in _SAMPLES.values()}):
+        contracts[abi_name], took = _timed(
+            lambda: Contract(address=1, abi=load_abi(abi_name), provider=provider)
+        )
+        print(f"  {'Contract(' + abi_name + ')':34s} {took * 1000:9.1f} ms")
+    raw_calls, took = _timed(lambda: importlib.import_module("services.raw_calls"))
+    print(f"  {'CALL_TABLE (import)':34s} {took * 1000:9.1f} ms")
+
+    print(f"\nper call (n={args.n})        abi µs     raw µs   speed-up")
+    for name, (abi_name, calldata, felts) in _SAMPLES.items():
+        adapter = contracts[abi_name].functions[name]._payload_transformer
+        spec = raw_calls.CALL_TABLE[name]
+
+        (expected,) = adapter.deserialize(felts)
+        assert spec.decode(felts) == expected, name
+
+        def _abi() -> None:
+            for _ in range(args.n):
+                adapter.serialize(*calldata)
+                adapter.deserialize(felts)
+
+        def _raw() -> None:
+            for _ in range(args.n):
+                list(calldata)
+                spec.decode(felts)
+
+        _, abi_s = _timed(_abi)
+        _, raw_s = _timed(_raw)
+        abi_us = abi_s / args.n * 1e6
+        raw_us = raw_s / args.n * 1e6
+        print(f"  {name:32s} {abi_us:8.2f}   {raw_us:8.2f}   {abi_us / raw_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
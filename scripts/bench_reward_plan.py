@@ -0,0 +1,203 @@
+"""Benchmark: per-user reward cycle vs the deduplicated fetch plan.
+
+Builds a synthetic population — ``--users`` users (10k by default), each
+tracking 1–6 entries drawn from a Zipf-skewed set of popular validators
+and delegations, so a few stakers are tracked by thousands of users —
+and runs one reward cycle three ways against fake staking reads that
+sleep ``--latency-ms`` per DTO:
+
+  1. per user, no sharing — every user resolves every entry, as the
+     notifier did before the snapshot store;
+  2. per user through the shared snapshot store
+     (:mod:`services.snapshot_store`);
+  3. the three-phase plan (``tasks.strk_notification._run_reward_plan``):
+     collect unique entries, fetch each once, evaluate every user —
+     once reading full validator DTOs and ``contract_parameters_v1``
+     per pool, as before fetch profiles, and once with each of the
+     plan's narrow profiles (``services.staking_service.FETCH_PROFILES``).
+
+For each it prints DTO fetches, an estimate of node reads (validator
+DTO: 11 reads full, 5 "attestation", 3 "rewards"; delegation: 3 with the
+per-pool parameters read, 2 without) and wall time. Nothing touches the
+network or Telegram.
+
+Usage
+-----
+::
+
+    python -m scripts.bench_reward_plan
+    python -m scripts.bench_reward_plan --users 20000 --latency-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+# The services read these at import; nothing is sent.
+os.environ.setdefault("STARKNET_RPC_URL", "http://127.0.0.1:9")
+os.environ.setdefault("BOT_TOKEN", "0:bench")
+os.environ.setdefault("EVENT_FOLLOWER", "0")
+
+from data.models import semaphore  # noqa: E402
+from services import tracking_service as ts  # noqa: E402
+from services.snapshot_store import snapshots  # noqa: E402
+from services.staking_dto import DelegatorMultiPositions, ValidatorInfo  # noqa: E402
+from tasks import strk_notification as sn  # noqa: E402
+
+_READS = {"full": 11, "card": 11, "attestation": 5, "rewards": 3}
+_DELEGATION_READS = {"legacy": 3, "current": 2}
+
+
+def _population(users: int, validators: int, delegations: int, seed: int) -> list:
+    rng = random.Random(seed)
+    stakers = [hex(0x1000 + i) for i in range(validators)]
+    pairs = [(hex(0x900000 + i), rng.choice(stakers)) for i in range(delegations)]
+    # Zipf-ish popularity: weight 1/rank.
+    v_weights = [1 / (i + 1) for i in range(validators)]
+    d_weights = [1 / (i + 1) for i in range(delegations)]
+    population = []
+    for user_id in range(users):
+        n = rng.randint(1, 6)
+        n_val = rng.randint(0, n)
+        doc = {
+            "validators": [
+                {"address": a} for a in set(rng.choices(stakers, v_weights, k=n_val))
+            ],
+            "delegations": [
+                {"delegator": d, "staker": s}
+                for d, s in set(rng.choices(pairs, d_weights, k=n - n_val))
+            ],
+        }
+        cfg = {"token_thresholds": {"STRK": rng.choice([1, 50, 1000])}}
+        population.append(
+            SimpleNamespace(
+                user_id=user_id,
+                user_language="en",
+                tracking_data=json.dumps(doc),
+                get_notification_config=lambda cfg=cfg: cfg,
+            )
+        )
+    return population
+
+
+class _FakeChain:
+    def __init__(self, latency: float, *, legacy: bool = False) -> None:
+        self.latency = latency
+        self.legacy = legacy
+        self.fetches = 0
+        self.reads = 0
+
+    async def validator(self, addr: str, **kwargs) -> ValidatorInfo:
+        self.fetches += 1
+        self.reads += _READS[kwargs.get("profile", "full")]
+        await asyncio.sleep(self.latency)
+        unclaimed = Decimal(int(addr, 16) % 97)
+        return ValidatorInfo(
+            staker_address=addr,
+            reward_address="0x1",
+            operational_address="0x2",
+            amount_own_raw=0,
+            amount_own_strk=Decimal(0),
+            unclaimed_rewards_own_raw=int(unclaimed) * 10**18,
+            unclaimed_rewards_own_strk=unclaimed,
+            current_epoch=1,
+        )
+
+    async def positions(self, staker: str, delegator: str) -> DelegatorMultiPositions:
+        self.fetches += 1
+        self.reads += _DELEGATION_READS["legacy" if self.legacy else "current"]
+        await asyncio.sleep(self.latency)
+        return DelegatorMultiPositions(
+            delegator_address=delegator, staker_address=staker, positions=[]
+        )
+
+
+async def _per_user_unshared(users, chain: _FakeChain) -> None:
+    async def _one(user) -> None:
+        async with semaphore:
+            items = ts.tracked_items(ts.load_tracking(user.tracking_data))
+            entries = await asyncio.gather(
+                *(
+                    chain.validator(a1) if kind == "validator" else chain.positions(a2, a1)
+                    for kind, a1, a2, _ in items
+                )
+            )
+            tracked = [
+                ts.TrackingEntry(i, kind, a1, a2, label, data)
+                for i, ((kind, a1, a2, label), data) in enumerate(zip(items, entries))
+            ]
+            body = sn._render_notification(user, tracked, {})
+            if body is not None:
+                await sn.send_message(user.user_id, body)
+
+    await asyncio.gather(*(_one(u) for u in users))
+
+
+async def _per_user_shared(users, chain: _FakeChain) -> None:
+    async def _one(user) -> None:
+        async with semaphore:
+            entries = await ts.fetch_tracking_entries(user.tracking_data, consumer="digest")
+            body = sn._render_notification(user, entries, {})
+            if body is not None:
+                await sn.send_message(user.user_id, body)
+
+    await asyncio.gather(*(_one(u) for u in users))
+
+
+async def _run(args) -> None:
+    users = _population(args.users, args.validators, args.delegations, args.seed)
+    sent = 0
+
+    async def _send(chat_id: int, text: str) -> None:
+        nonlocal sent
+        sent += 1
+
+    sn.send_message = _send
+    tracked = sum(len(ts.tracked_items(ts.load_tracking(u.tracking_data))) for u in users)
+    print(f"{len(users)} users, {tracked} tracked entries, latency {args.latency_ms} ms/DTO\n")
+    print(f"{'mode':28s} {'DTO fetches':>12s} {'~node reads':>12s} {'wall s':>8s} {'DMs':>6s}")
+
+    def plan(u, _c):
+        return sn._run_reward_plan(u, {})
+
+    modes = [
+        ("per user, unshared", _per_user_unshared, "full", True),
+        ("per user, snapshot store", _per_user_shared, "full", True),
+        ("fetch plan, full DTOs", plan, "full", True),
+        # The plan's profile with attestation monitoring on / off.
+        ("fetch plan, 'attestation'", plan, "attestation", False),
+        ("fetch plan, 'rewards'", plan, "rewards", False),
+    ]
+    for name, runner, profile, legacy in modes:
+        sn._PLAN_PROFILE = profile
+        chain = _FakeChain(args.latency_ms / 1000, legacy=legacy)
+        ts.get_validator_info = chain.validator
+        ts.get_delegator_positions = chain.positions
+        snapshots.clear()
+        sent = 0
+        started = time.perf_counter()
+        result = await runner(users, chain)
+        took = time.perf_counter() - started
+        print(f"{name:28s} {chain.fetches:12d} {chain.reads:12d} {took:8.2f} {sent:6d}")
+        if isinstance(result, dict):
+            print(f"\nplan stats: {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--validators", type=int, default=300, help="distinct stakers")
+    parser.add_argument("--delegations", type=int, default=3_000, help="distinct pairs")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="per DTO read")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark: Manager-proxy dict vs the SQLite WAL :class:`SharedCache`.
+
+The previous ``utils/cache.SharedCache`` stored ``(value, expiry)`` in a
+``multiprocessing.Manager().dict()``; every operation was an IPC round
+trip to the manager process. This script measures, for both backends:
+
+  * ``set`` / ``get`` (hit) / ``keys`` latency from the owning process;
+  * ``get`` throughput from N worker processes at once — the Manager
+    proxy is handed to the workers explicitly, which the bot's spawned
+    workers never got (they fell back to a private dict).
+
+Usage
+-----
+::
+
+    python -m scripts.bench_shared_cache
+    python -m scripts.bench_shared_cache -n 20000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_VALUE = "<b>Validator</b> " + "x" * 600  # a rendered card body
+
+
+def _legacy_set(store, key: str, value) -> None:
+    store[key] = (value, datetime.now() + timedelta(seconds=300))
+
+
+def _legacy_get(store, key: str):
+    if key not in store:
+        return None
+    value, expiry = store[key]
+    return None if datetime.now() > expiry else value
+
+
+def _legacy_keys(store, pattern: str) -> list[str]:
+    return [k for k in store.keys() if pattern in k]
+
+
+def _per_op_us(fn, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def _legacy_reader(store, n: int, keys: int, out) -> None:
+    started = time.perf_counter()
+    for i in range(n):
+        _legacy_get(store, f"{i % keys}_full")
+    out.put(time.perf_counter() - started)
+
+
+def _sqlite_reader(path: str, n: int, keys: int, out) -> None:
+    from utils.cache import SharedCache
+
+    cache = SharedCache(ttl=300, path=path)
+    started = time.perf_counter()
+    for i in range(n):
+        cache.get_versioned(f"{i % keys}_full")
+    out.put(time.perf_counter() - started)
+
+
+def _fan_out(target, first_arg, n: int, keys: int, workers: int) -> float:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=target, args=(first_arg, n, keys, out)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    # Each worker times only its read loop (not interpreter start-up);
+    # the slowest one bounds the aggregate throughput.
+    slowest = max(out.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return workers * n / slowest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=5_000, help="operations per measurement")
+    parser.add_argument("--keys", type=int, default=1_000, help="distinct keys")
+    parser.add_argument("--workers", type=int, default=3, help="reader processes")
+    args = parser.parse_args()
+
+    from utils.cache import SharedCache
+
+    manager = multiprocessing.get_context("spawn").Manager()
+    legacy = manager.dict()
+    path = str(Path(tempfile.mkdtemp()) / "bench_cache.db")
+    sqlite = SharedCache(ttl=300, path=path, max_entries=args.keys * 2)
+
+    n, keys = args.n, args.keys
+    rows = [
+        (
+            "set",
+            _per_op_us(lambda i: _legacy_set(legacy, f"{i % keys}_full", _VALUE), n),
+            _per_op_us(lambda i: sqlite.put(f"{i % keys}_full", _VALUE), n),
+        ),
+        (
+            "get (hit)",
+            _per_op_us(lambda i: _legacy_get(legacy, f"{i % keys}_full"), n),
+            _per_op_us(lambda i: sqlite.get_versioned(f"{i % keys}_full"), n),
+        ),
+        (
+            f"keys (of {keys})",
+            _per_op_us(lambda i: _legacy_keys(legacy, f"{i % keys}_"), max(1, n // 50)),
+            _per_op_us(lambda i: sqlite.matching_keys(f"{i % keys}_"), max(1, n // 50)),
+        ),
+    ]
+    print(f"single process (n={n})      manager µs   sqlite µs   speed-up")
+    for name, old, new in rows:
+        print(f"  {name:24s} {old:11.1f}  {new:10.1f}  {old / new:8.1f}x")
+
+    old_tp = _fan_out(_legacy_reader, legacy, n, keys, args.workers)
+    new_tp = _fan_out(_sqlite_reader, path, n, keys, args.workers)
+    print(f"\n{args.workers} reader processes        manager op/s  sqlite op/s")
+    print(f"  {'get (hit)':24s} {old_tp:12.0f} {new_tp:12.0f}  {new_tp / old_tp:6.1f}x")
+    manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
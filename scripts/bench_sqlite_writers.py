@@ -0,0 +1,191 @@
+"""Benchmark: concurrent writer processes on one ``users.db``.
+
+Creates a throwaway users database with ``--users`` rows, then starts
+``--procs`` processes (the bot, its workers and the API all write the
+same file) that each run ``--ops`` read-modify-write updates of a random
+user's ``_attestation_state``, ``--concurrency`` at a time, three ways:
+
+  1. ``default`` — SQLAlchemy's defaults (rollback journal), one session
+     and commit per update, as ``db_api.database`` did;
+  2. ``tuned`` — the same sessions on the ``tuned`` profile
+     (:mod:`db_api.sqlite_profile`: WAL, synchronous=NORMAL,
+     busy_timeout, mmap, pool);
+  3. ``tuned + writer`` — ``update_attestation_state`` itself, through
+     each process's :class:`db_api.writer.SingleWriter`.
+
+For each it prints throughput, failed updates (``database is locked``),
+per-update latency p50 / p95 / max and, for the writer, updates per
+transaction.
+
+Usage
+-----
+::
+
+    python -m scripts.bench_sqlite_writers
+    python -m scripts.bench_sqlite_writers --procs 8 --ops 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# The services read these at import; nothing is sent.
+os.environ.setdefault("STARKNET_RPC_URL", "http://127.0.0.1:9")
+os.environ.setdefault("BOT_TOKEN", "0:bench")
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def _legacy_update(engine, user_id: int, state: dict) -> None:
+    """``update_attestation_state`` before the single writer."""
+    from sqlalchemy import select, update
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from db_api.models import Users
+
+    async with AsyncSession(engine) as session:
+        user = (await session.execute(select(Users).where(Users.user_id == user_id))).scalars().first()
+        cfg = user.get_notification_config()
+        cfg["_attestation_state"] = state
+        user.set_notification_config(cfg)
+        await session.execute(
+            update(Users)
+            .where(Users.user_id == user_id)
+            .values(notification_config=user.notification_config)
+        )
+        await session.commit()
+
+
+async def _worker_main(mode: str, url: str, args, seed: int, barrier) -> dict:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from db_api import database
+    from db_api.sqlite_profile import create_writer_engine, engine_kwargs, tune_engine
+    from db_api.writer import SingleWriter
+
+    profile = "default" if mode == "default" else "tuned"
+    engine = tune_engine(create_async_engine(url, **engine_kwargs(profile)), profile)
+    database.db.engine = engine
+    database.writer = SingleWriter(create_writer_engine(url, profile))
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    errors = 0
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def _one(i: int) -> None:
+        nonlocal errors
+        user_id = rng.randint(1, args.users)
+        state = {hex(0x1000 + i % 7): i % 3 + 1}
+        async with slots:
+            started = time.perf_counter()
+            try:
+                if mode == "tuned + writer":
+                    await database.update_attestation_state(user_id, state)
+                else:
+                    await _legacy_update(engine, user_id, state)
+            except Exception:  # noqa: BLE001
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    # Imports and connections are done: start together with the others.
+    await asyncio.to_thread(barrier.wait)
+    began = time.time()
+    await asyncio.gather(*(_one(i) for i in range(args.ops)))
+    ended = time.time()
+    stats = database.writer.stats()
+    await database.writer.close()
+    await engine.dispose()
+    return {
+        "latencies": latencies,
+        "errors": errors,
+        "writer": stats,
+        "began": began,
+        "ended": ended,
+    }
+
+
+def _worker(mode: str, url: str, args, seed: int, barrier, out) -> None:
+    out.put(asyncio.run(_worker_main(mode, url, args, seed, barrier)))
+
+
+async def _seed(url: str, users: int) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from db_api.models import Base, Users
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        for user_id in range(1, users + 1):
+            user = Users(user_id, f"u{user_id}", "en", None)
+            user.tracking_data = json.dumps({"validators": [], "delegations": []})
+            user.set_notification_config({"attestation_alerts_for": ["0x1"]})
+            session.add(user)
+        await session.commit()
+    await engine.dispose()
+
+
+def _run_mode(mode: str, args, workdir: Path) -> None:
+    path = workdir / f"{mode.replace(' ', '').replace('+', '_')}.db"
+    url = f"sqlite+aiosqlite:///{path}"
+    asyncio.run(_seed(url, args.users))
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    barrier = ctx.Barrier(args.procs)
+    procs = [
+        ctx.Process(target=_worker, args=(mode, url, args, seed, barrier, out))
+        for seed in range(args.procs)
+    ]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    took = max(r["ended"] for r in results) - min(r["began"] for r in results)
+    for p in procs:
+        p.join()
+    latencies = [x for r in results for x in r["latencies"]]
+    errors = sum(r["errors"] for r in results)
+    ops = args.procs * args.ops
+    per_tx = "-"
+    if mode == "tuned + writer":
+        tx = sum(r["writer"]["transactions"] for r in results)
+        per_tx = f"{sum(r['writer']['ops'] for r in results) / max(1, tx):.1f}"
+    print(
+        f"{mode:16s} {(ops - errors) / took:9.0f} {errors:7d} "
+        f"{_percentile(latencies, 0.5) * 1000:8.1f} {_percentile(latencies, 0.95) * 1000:8.1f} "
+        f"{max(latencies) * 1000:9.1f} {per_tx:>7s}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=500, help="updates per process")
+    parser.add_argument("--concurrency", type=int, default=50, help="in flight per process")
+    parser.add_argument("--users", type=int, default=2000)
+    args = parser.parse_args()
+    print(
+        f"{args.procs} processes x {args.ops} updates, {args.concurrency} in flight each, "
+        f"{args.users} users\n"
+    )
+    print(
+        f"{'mode':16s} {'updates/s':>9s} {'failed':>7s} {'p50 ms':>8s} "
+        f"{'p95 ms':>8s} {'max ms':>9s} {'per tx':>7s}"
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in ("default", "tuned", "tuned + writer"):
+            _run_mode(mode, args, Path(workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Start-up benchmark: contract warm-up with a cold vs warm ABI cache.
+
+Every process of a deploy (queue worker, notifier worker, API) warms the
+staking, attestation and pool contracts on boot. This script runs that
+warm-up in fresh child processes — exactly like a restart — twice per
+ABI profile against an empty cache directory:
+
+  * **cold** — nothing cached: ABIs are parsed and the cache is written;
+  * **warm** — a second process loads the parsed serializers from disk.
+
+Usage
+-----
+::
+
+    python -m scripts.bench_startup
+    python -m scripts.bench_startup --profiles minimal
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_CHILD = r"""
+import json, os, time
+os.environ.setdefault("STARKNET_RPC_URL", "http://127.0.0.1:9")
+t0 = time.perf_counter()
+from services.attestation_service import _attestation_contract
+from services.staking_service import _staking_contract, warm_pool_abi
+t1 = time.perf_counter()
+_staking_contract()
+_attestation_contract()
+warm_pool_abi()
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "warm_s": t2 - t1}))
+"""
+
+
+def _run_child(profile: str, cache_dir: str) -> dict[str, float]:
+    env = {**os.environ, "ABI_PROFILE": profile, "ABI_CACHE_DIR": cache_dir}
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["full", "minimal"],
+        choices=["full", "minimal"],
+        help="ABI profiles to measure (default: both)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'profile':8s} {'run':5s} {'import s':>9s} {'warm-up s':>10s}")
+    for profile in args.profiles:
+        with tempfile.TemporaryDirectory(prefix="abi-cache-") as cache_dir:
+            for run in ("cold", "warm"):
+                r = _run_child(profile, cache_dir)
+                print(f"{profile:8s} {run:5s} {r['import_s']:9.3f} {r['warm_s']:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
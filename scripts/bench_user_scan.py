@@ -0,0 +1,126 @@
+"""Benchmark: peak memory of a background cycle's user scan.
+
+Seeds a throwaway ``users.db`` with ``--sizes`` users (two tracked
+validators and a delegation each, every one subscribed), then walks the
+subscribers two ways while ``tracemalloc`` records the peak:
+
+  1. ``list`` — ``get_subscribed_users()``: every subscriber as a full
+     ``Users`` ORM object in one list, as the cycles loaded them;
+  2. ``stream`` — ``iter_subscribed_users()``: ``USER_SCAN_CHUNK`` rows
+     at a time, only the columns a cycle reads.
+
+Each row's tracking JSON is parsed (what a cycle does first) and then
+dropped. Prints rows, wall time and peak Python allocations per size.
+
+Usage
+-----
+::
+
+    python -m scripts.bench_user_scan
+    python -m scripts.bench_user_scan --sizes 100000 200000 --chunk 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# The services read these at import; nothing is sent.
+os.environ.setdefault("STARKNET_RPC_URL", "http://127.0.0.1:9")
+os.environ.setdefault("BOT_TOKEN", "0:bench")
+
+
+def _tracking(user_id: int) -> str:
+    return json.dumps({
+        "validators": [
+            {"address": hex(0x1000 + user_id % 97), "label": f"node {user_id}"},
+            {"address": hex(0x2000 + user_id % 13), "label": ""},
+        ],
+        "delegations": [
+            {"delegator": hex(0x3000 + user_id), "staker": hex(0x1000 + user_id % 97),
+             "label": "pool"},
+        ],
+    })
+
+
+async def _seed(url: str, users: int) -> None:
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from db_api.models import Base, Subscription, Users
+
+    cfg = json.dumps({"token_thresholds": {"STRK": 10}, "usd_threshold": 5})
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for start in range(1, users + 1, 10_000):
+            ids = range(start, min(users + 1, start + 10_000))
+            await conn.execute(insert(Users), [
+                {"user_id": i, "user_name": f"u{i}", "user_language": "en",
+                 "tracking_data": _tracking(i), "notification_config": cfg}
+                for i in ids
+            ])
+            await conn.execute(insert(Subscription), [
+                {"user_id": i, "kind": "rewards", "staker_address": None} for i in ids
+            ])
+    await engine.dispose()
+
+
+async def _scan(mode: str, chunk: int) -> int:
+    from db_api import database
+    from services.tracking_service import load_tracking
+
+    seen = 0
+    if mode == "list":
+        for user in await database.get_subscribed_users():
+            load_tracking(user.tracking_data)
+            seen += 1
+        return seen
+    async for rows in database.iter_subscribed_users(chunk=chunk):
+        for row in rows:
+            load_tracking(row.tracking_data)
+            seen += 1
+    return seen
+
+
+async def _measure(url: str, size: int, chunk: int) -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from db_api import database
+
+    await _seed(url, size)
+    database.db.engine = create_async_engine(url)
+    for mode in ("list", "stream"):
+        await _scan(mode, chunk)  # warm the connection and the page cache
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = await _scan(mode, chunk)
+        took = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{size:9d} {mode:7s} {rows:9d} {took:8.2f} {peak / 2**20:10.1f}")
+    await database.db.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25_000, 100_000, 200_000])
+    parser.add_argument("--chunk", type=int, default=int(os.getenv("USER_SCAN_CHUNK", "1000")))
+    args = parser.parse_args()
+    print(f"chunk {args.chunk}\n")
+    print(f"{'users':>9s} {'mode':7s} {'rows':>9s} {'time s':>8s} {'peak MiB':>10s}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            url = f"sqlite+aiosqlite:///{Path(workdir) / f'users_{size}.db'}"
+            asyncio.run(_measure(url, size, args.chunk))
+
+
+if __name__ == "__main__":
+    main()
@@ -24,32 +24,38 @@ import asyncio
 import time
 from functools import lru_cache
 
-from starknet_py.contract import Contract
 from starknet_py.net.client_errors import ClientError
 
-from data.contracts import get_network_addresses, load_abi
-from services.rpc_client import get_client, with_retry
+from data.abi_profile import load_profiled_abi
+from data.contracts import get_network_addresses
+from services.contract_template import ContractHandle, ContractTemplate
+from services.raw_calls import call_view
+from services.rpc_client import (
+    current_snapshot,
+    get_client,
+    snapshot_block_kwargs,
+    with_retry,
+)
 from services.staking_dto import AttestationStatus
 
 
 @lru_cache(maxsize=1)
-def _attestation_contract() -> Contract:
+def _attestation_contract() -> ContractHandle:
+    # Trimmed ABI + on-disk serializer cache, see ``_staking_contract``.
     addrs = get_network_addresses()
-    return Contract(
-        address=int(addrs.attestation_contract, 16),
-        abi=load_abi("l2_attestation_contract"),
-        provider=get_client(),
+    template = ContractTemplate.cached(
+        load_profiled_abi("l2_attestation_contract"), provider=get_client()
     )
+    return template.bind(addrs.attestation_contract)
 
 
 async def fetch_last_epoch_attested(staker_address: str) -> int:
-    contract = _attestation_contract()
+    attestation = get_network_addresses().attestation_contract
 
     async def _call() -> int:
-        (result,) = await contract.functions["get_last_epoch_attestation_done"].call(
-            int(staker_address, 16)
+        return await call_view(
+            attestation, "get_last_epoch_attestation_done", int(staker_address, 16)
         )
-        return int(result)
 
     try:
         return await with_retry(
@@ -66,7 +72,7 @@ async def fetch_is_attesting_this_epoch(staker_address: str) -> bool:
 
     async def _call() -> bool:
         (result,) = await contract.functions["is_attestation_done_in_curr_epoch"].call(
-            int(staker_address, 16)
+            int(staker_address, 16), **await snapshot_block_kwargs()
         )
         return bool(result)
 
@@ -107,7 +113,9 @@ async def fetch_attestation_window() -> int | None:
             return value
 
     async def _call() -> int:
-        (result,) = await contract.functions["attestation_window"].call()
+        (result,) = await contract.functions["attestation_window"].call(
+            **await snapshot_block_kwargs()
+        )
         return int(result)
 
     try:
@@ -136,7 +144,7 @@ async def fetch_target_attestation_block(operational_address: str) -> int | None
     async def _call() -> int:
         (result,) = await contract.functions[
             "get_current_epoch_target_attestation_block"
-        ].call(int(operational_address, 16))
+        ].call(int(operational_address, 16), **await snapshot_block_kwargs())
         return int(result)
 
     try:
@@ -155,7 +163,16 @@ async def fetch_target_attestation_block(operational_address: str) -> int | None
 
 
 async def fetch_current_block_number() -> int | None:
-    """Latest block number on the configured RPC. ``None`` on RPC failure."""
+    """Latest block number on the configured RPC. ``None`` on RPC failure.
+
+    Inside a :func:`services.rpc_client.read_snapshot` this is the pinned
+    block, so "current block" on a card matches the block its reads used.
+    """
+    snap = current_snapshot()
+    if snap is not None:
+        block = await snap.block_number()
+        if block is not None:
+            return block
     client = get_client()
 
     async def _call() -> int:
@@ -177,6 +194,7 @@ async def fetch_attestation_status(
     *,
     current_epoch: int,
     operational_address: str | None = None,
+    with_blocks: bool = True,
 ) -> AttestationStatus:
     """Compose :class:`AttestationStatus` for the staker.
 
@@ -190,17 +208,22 @@ async def fetch_attestation_status(
     ``is_attesting_this_epoch=True`` — the renderer uses ``current_block``
     to compute the epoch-tail "next epoch in N blocks" line that's shown
     in every status state, not just waiting.
+
+    ``with_blocks=False`` skips the extras altogether: two reads instead
+    of five, for callers that only look at ``missed_epochs`` (the alert
+    watcher, the reward digest).
     """
+    async def _none() -> None:
+        return None
+
     last_done_t = fetch_last_epoch_attested(staker_address)
     attested_now_t = fetch_is_attesting_this_epoch(staker_address)
-    if operational_address and operational_address != "0x0":
+    if with_blocks and operational_address and operational_address != "0x0":
         target_t = fetch_target_attestation_block(operational_address)
     else:
-        async def _none() -> None:
-            return None
         target_t = _none()
-    window_t = fetch_attestation_window()
-    current_block_t = fetch_current_block_number()
+    window_t = fetch_attestation_window() if with_blocks else _none()
+    current_block_t = fetch_current_block_number() if with_blocks else _none()
 
     last_done, attested_now, target_block, window, current_block = await asyncio.gather(
         last_done_t,
@@ -0,0 +1,213 @@
+"""Per-staker attestation windows: read each target once, check when it counts.
+
+The attestation watcher used to re-read every subscribed staker's status
+on a fixed cadence (every minute, later every ``ATTESTATION_INTERVAL_BLOCKS``
+blocks). But a staker's outcome for an epoch is only decided once its
+target block plus the attestation window has passed; until the target
+block nothing can change, and after the window closes nothing will.
+
+:class:`AttestationWindows` keeps one :class:`WindowPlan` per staker and
+epoch:
+
+  1. at the epoch boundary (or when a staker is first subscribed) it
+     reads the operator address and
+     :func:`~services.attestation_service.fetch_target_attestation_block`
+     once — the window length is cached process-wide;
+  2. it sleeps until the target block, then, while the window is open,
+     polls ``is_attestation_done_in_curr_epoch`` every
+     ``ATTESTATION_OPEN_POLL_BLOCKS`` blocks — an early attestation ends
+     the epoch's work for that staker;
+  3. one block after ``target + window`` it runs the decisive status
+     read: not attested by then means the epoch is missed, and the alert
+     goes out right away instead of at the next boundary.
+
+Stakers whose target can't be read (not an attester yet, RPC failure)
+are retried every ``ATTESTATION_TARGET_RETRY_BLOCKS`` blocks and, failing
+that, checked once at the next boundary, when the previous epoch's miss
+count is final.
+
+A decision is an :class:`~services.staking_dto.AttestationStatus` whose
+``missed_epochs`` already counts the current epoch when it is lost, so
+the per-user alert state machine in :mod:`tasks.attestation_alerts`
+works on it unchanged.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable
+
+from loguru import logger
+
+from services.snapshot_store import address_part
+from services.staking_dto import AttestationStatus
+
+_OPEN_POLL_BLOCKS = int(os.getenv("ATTESTATION_OPEN_POLL_BLOCKS", "20"))
+_TARGET_RETRY_BLOCKS = int(os.getenv("ATTESTATION_TARGET_RETRY_BLOCKS", "30"))
+
+
+@dataclass
+class WindowPlan:
+    staker: str
+    epoch: int
+    operational: str | None = None
+    target_block: int | None = None
+    window: int | None = None
+    next_block: int = 0  # act once the head reaches this block
+    decided: bool = False
+
+    @property
+    def closes_at(self) -> int | None:
+        if self.target_block is None or self.window is None:
+            return None
+        return self.target_block + self.window
+
+
+class AttestationWindows:
+    """Window-aware check plan for a set of stakers; reads are injected."""
+
+    def __init__(
+        self,
+        *,
+        fetch_operational: Callable[[str], Awaitable[str | None]],
+        fetch_target: Callable[[str], Awaitable[int | None]],
+        fetch_window: Callable[[], Awaitable[int | None]],
+        fetch_attested: Callable[[str], Awaitable[bool]],
+        fetch_status: Callable[[str, int], Awaitable[AttestationStatus]],
+        open_poll_blocks: int = _OPEN_POLL_BLOCKS,
+        target_retry_blocks: int = _TARGET_RETRY_BLOCKS,
+    ) -> None:
+        self._fetch_operational = fetch_operational
+        self._fetch_target = fetch_target
+        self._fetch_window = fetch_window
+        self._fetch_attested = fetch_attested
+        self._fetch_status = fetch_status
+        self.open_poll_blocks = max(1, open_poll_blocks)
+        self.target_retry_blocks = max(1, target_retry_blocks)
+        self.epoch: int | None = None
+        self.plans: dict[str, WindowPlan] = {}
+        self.reads = 0  # this epoch
+        self.decisions = 0  # this epoch
+
+    # -- plan lifecycle ---------------------------------------------------
+
+    async def start_epoch(
+        self, epoch: int, head: int, stakers: Iterable[str]
+    ) -> dict[str, AttestationStatus]:
+        """Re-plan every staker for ``epoch``.
+
+        Returns the final status of the stakers the previous epoch never
+        decided (their target was never readable).
+        """
+        leftovers = [p.staker for p in self.plans.values() if not p.decided]
+        if self.epoch is not None:
+            logger.info(f"attestation windows: epoch {self.epoch} {self.stats()}")
+        self.epoch = epoch
+        self.plans = {}
+        self.reads = self.decisions = 0
+        settled: dict[str, AttestationStatus] = {}
+        if leftovers:
+            results = await asyncio.gather(
+                *(self._status(s, epoch) for s in leftovers), return_exceptions=True
+            )
+            for staker, result in zip(leftovers, results, strict=True):
+                if isinstance(result, AttestationStatus):
+                    settled[staker] = result
+        await self.sync_stakers(stakers, head)
+        return settled
+
+    async def sync_stakers(self, stakers: Iterable[str], head: int) -> None:
+        """Plan newly subscribed stakers; drop the ones nobody watches."""
+        if self.epoch is None:
+            return
+        wanted = {address_part(s) for s in stakers if s}
+        for staker in set(self.plans) - wanted:
+            del self.plans[staker]
+        new = [WindowPlan(s, self.epoch) for s in wanted - set(self.plans)]
+        for plan in new:
+            self.plans[plan.staker] = plan
+        await asyncio.gather(*(self._plan(p, head) for p in new))
+
+    async def _plan(self, plan: WindowPlan, head: int) -> None:
+        try:
+            if plan.operational is None:
+                self.reads += 1
+                plan.operational = await self._fetch_operational(plan.staker)
+            if plan.operational:
+                self.reads += 1
+                plan.target_block = await self._fetch_target(plan.operational)
+            plan.window = await self._fetch_window()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"attestation windows: planning {plan.staker} failed: {exc!r}")
+        closes = plan.closes_at
+        if closes is None:
+            plan.next_block = head + self.target_retry_blocks
+        else:
+            plan.next_block = max(head, min(plan.target_block + self.open_poll_blocks, closes + 1))
+
+    # -- acting -----------------------------------------------------------
+
+    def next_wake(self) -> int | None:
+        """Lowest block at which some undecided staker needs a read."""
+        pending = [p.next_block for p in self.plans.values() if not p.decided]
+        return min(pending) if pending else None
+
+    async def on_head(self, head: int) -> dict[str, AttestationStatus]:
+        """Run every read due at ``head``; returns the stakers decided now."""
+        due = [p for p in self.plans.values() if not p.decided and p.next_block <= head]
+        results = await asyncio.gather(
+            *(self._act(p, head) for p in due), return_exceptions=True
+        )
+        decided: dict[str, AttestationStatus] = {}
+        for plan, result in zip(due, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"attestation windows: check {plan.staker} failed: {result!r}")
+                plan.next_block = head + 1
+            elif result is not None:
+                plan.decided = True
+                self.decisions += 1
+                decided[plan.staker] = result
+        return decided
+
+    async def _act(self, plan: WindowPlan, head: int) -> AttestationStatus | None:
+        closes = plan.closes_at
+        if closes is None:
+            await self._plan(plan, head)
+            return None
+        if head > closes:
+            # Decisive: the window is over, the epoch's outcome is fixed.
+            status = await self._status(plan.staker, plan.epoch)
+            if not status.is_attesting_this_epoch:
+                status = status.model_copy(
+                    update={"missed_epochs": max(0, plan.epoch - status.last_epoch_attested)}
+                )
+            return status
+        self.reads += 1
+        if await self._fetch_attested(plan.staker):
+            return AttestationStatus(
+                last_epoch_attested=plan.epoch,
+                current_epoch=plan.epoch,
+                missed_epochs=0,
+                is_attesting_this_epoch=True,
+                target_block=plan.target_block,
+                attestation_window_blocks=plan.window,
+                current_block=head,
+            )
+        plan.next_block = min(head + self.open_poll_blocks, closes + 1)
+        return None
+
+    async def _status(self, staker: str, epoch: int) -> AttestationStatus:
+        self.reads += 2  # last epoch attested + attested this epoch
+        return await self._fetch_status(staker, epoch)
+
+    def stats(self) -> dict[str, int | float | None]:
+        stakers = len(self.plans)
+        return {
+            "stakers": stakers,
+            "decided": self.decisions,
+            "no_target": sum(1 for p in self.plans.values() if p.closes_at is None),
+            "reads": self.reads,
+            "reads_per_staker": round(self.reads / stakers, 2) if stakers else None,
+            "next_wake": self.next_wake(),
+        }
@@ -0,0 +1,198 @@
+"""One parsed ABI, many contract addresses.
+
+Every delegation pool is an instance of the same contract class, yet
+``Contract(address=..., abi=...)`` re-parses the whole ABI and rebuilds
+every function serializer for each address (~2-4 s of CPU), and keeping
+one full ``Contract`` per pool made memory grow with the number of pools
+users track.
+
+:class:`ContractTemplate` pays the parse once. :meth:`ContractTemplate.bind`
+returns a :class:`ContractHandle` — an address plus a reference to the
+template — whose ``functions[name].call(...)`` behaves like starknet-py's
+``ContractFunction.call`` (same serializers, same ``block_hash`` /
+``block_number`` keywords, same ``TupleDataclass`` result). Binding is a
+couple of attribute assignments, so handles are created on demand and
+never cached.
+
+The parsed result — one serialization adapter per function — is also
+persisted under ``FILES_DIR/cache`` by :meth:`ContractTemplate.cached`,
+keyed by a hash of the ABI plus the starknet-py and Python versions. The
+bot's two workers and the API process each used to re-parse the same
+ABIs at start-up; now the first one writes the cache and the others (and
+every later boot) unpickle it in well under a millisecond.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from loguru import logger
+from starknet_py.contract import Contract, ContractFunction, PreparedFunctionCall
+from starknet_py.net.client import Client
+from starknet_py.net.client_models import Tag
+
+from data.all_paths import CACHE_DIR
+
+# Anything that changes how starknet-py builds serializers, or how pickle
+# lays them out, must change the key.
+_CACHE_SALT = f"starknet-py={version('starknet-py')};py={sys.version_info[:2]}"
+
+# Overridable for benchmarks / read-only deployments.
+_CACHE_DIR = Path(os.getenv("ABI_CACHE_DIR") or CACHE_DIR)
+
+
+def parse_serializers(abi: list, provider: Client) -> dict[str, Any]:
+    """Run starknet-py's ABI parse once; return ``{function: adapter}``."""
+    # Address 0 is never called: the prototype exists only to run
+    # starknet-py's ABI parsing and serializer construction.
+    prototype = Contract(address=0, abi=abi, provider=provider)
+    return {
+        name: fn._payload_transformer for name, fn in prototype.functions.items()
+    }
+
+
+def abi_cache_key(abi: list) -> str:
+    canonical = json.dumps(abi, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{_CACHE_SALT}\n{canonical}".encode()).hexdigest()[:32]
+
+
+def load_serializers(
+    abi: list, provider: Client, cache_dir: Path | None = None
+) -> dict[str, Any]:
+    """:func:`parse_serializers` with an on-disk cache in ``cache_dir``.
+
+    The cache is only ever written by this process family into our own
+    ``FILES_DIR``; an unreadable or stale file is ignored and rewritten.
+    """
+    cache_dir = Path(cache_dir or _CACHE_DIR)
+    path = cache_dir / f"abi-{abi_cache_key(abi)}.pickle"
+    try:
+        with path.open("rb") as fh:
+            return pickle.load(fh)
+    except FileNotFoundError:
+        pass
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"ABI cache {path.name} unreadable, rebuilding: {exc}")
+
+    serializers = parse_serializers(abi, provider)
+    tmp: str | None = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees half a file.
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".abi-", suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(serializers, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning(f"ABI cache not written ({path}): {exc}")
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+    return serializers
+
+
+class ContractTemplate:
+    """Parsed ABI + function serializers shared by every address of a class."""
+
+    def __init__(
+        self,
+        abi: list,
+        provider: Client,
+        *,
+        serializers: dict[str, Any] | None = None,
+    ) -> None:
+        self.abi = abi
+        self.client: Client = provider
+        self._serializers = (
+            serializers if serializers is not None else parse_serializers(abi, provider)
+        )
+        self._selectors: dict[str, int] = {
+            name: ContractFunction.get_selector(name) for name in self._serializers
+        }
+
+    @classmethod
+    def cached(
+        cls, abi: list, provider: Client, cache_dir: Path | None = None
+    ) -> "ContractTemplate":
+        """Template whose serializers come from the on-disk cache when possible."""
+        return cls(abi, provider, serializers=load_serializers(abi, provider, cache_dir))
+
+    @property
+    def function_names(self) -> list[str]:
+        return list(self._serializers)
+
+    def bind(self, address: Union[int, str]) -> "ContractHandle":
+        as_int = int(address, 16) if isinstance(address, str) else int(address)
+        return ContractHandle(self, as_int)
+
+
+class ContractHandle:
+    """Address bound to a :class:`ContractTemplate` (``Contract`` look-alike)."""
+
+    __slots__ = ("template", "address")
+
+    def __init__(self, template: ContractTemplate, address: int) -> None:
+        self.template = template
+        self.address = address
+
+    @property
+    def client(self) -> Client:
+        return self.template.client
+
+    @property
+    def functions(self) -> "_BoundFunctions":
+        return _BoundFunctions(self)
+
+
+class _BoundFunctions:
+    __slots__ = ("_handle",)
+
+    def __init__(self, handle: ContractHandle) -> None:
+        self._handle = handle
+
+    def __getitem__(self, name: str) -> "BoundFunction":
+        template = self._handle.template
+        if name not in template._serializers:
+            raise KeyError(name)
+        return BoundFunction(template, name, self._handle.address)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._handle.template._serializers
+
+
+class BoundFunction:
+    """``ContractFunction.call`` / ``prepare_call`` for one handle."""
+
+    __slots__ = ("_template", "name", "_address")
+
+    def __init__(self, template: ContractTemplate, name: str, address: int) -> None:
+        self._template = template
+        self.name = name
+        self._address = address
+
+    def prepare_call(self, *args: Any, **kwargs: Any) -> PreparedFunctionCall:
+        transformer = self._template._serializers[self.name]
+        return PreparedFunctionCall(
+            to_addr=self._address,
+            calldata=transformer.serialize(*args, **kwargs),
+            selector=self._template._selectors[self.name],
+            _client=self._template.client,
+            _payload_transformer=transformer,
+        )
+
+    async def call(
+        self,
+        *args: Any,
+        block_hash: Optional[str] = None,
+        block_number: Optional[Union[int, Tag]] = None,
+        **kwargs: Any,
+    ):
+        return await self.prepare_call(*args, **kwargs).call(
+            block_hash=block_hash, block_number=block_number
+        )
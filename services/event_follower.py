@@ -0,0 +1,396 @@
+"""Follow staking / pool / attestation events to know what actually changed.
+
+Every notifier cycle and every Mini App refresh used to re-read every
+tracked staker and delegator from scratch, although in a typical hour
+only a handful of them see any on-chain activity. :class:`EventFollower`
+pages through ``starknet_getEvents`` from a persisted cursor block up to
+the current head and records, per address, the last block at which an
+event touched it:
+
+  - staking contract events carry the staker as the first key (a few
+    carry the pool member as ``identifier``);
+  - attestation successes carry the staker;
+  - pool contract events carry the pool member (``NewPoolMember`` and
+    ``StakerRemoved`` also name the staker). Pools are deployed per
+    staker and token, so instead of one filter per pool address the
+    follower runs a single address-less stream filtered on the pool
+    event selectors.
+
+Contract-wide changes (epoch parameters, token list, attestation window)
+and epoch rollovers — which change every card's epoch / attestation
+fields without emitting anything — mark *everything* dirty.
+
+Consumers store each resolved entry with the follower's cursor at read
+time and ask :meth:`EventFollower.is_fresh` whether any of its addresses
+was touched since; :func:`services.tracking_service.fetch_tracking_entries`
+uses that to serve unchanged entries from its last snapshot. Each sync
+also forgets any remembered "does not exist" answer for the addresses it
+saw (:mod:`services.negative_cache`).
+
+The cursor and the touched map are persisted as JSON under ``FILES_DIR``
+(one file per process role, since the notifier and the API follow
+independently), so a restart resumes without a gap. A node that fell
+more than ``EVENT_FOLLOWER_MAX_CATCHUP_BLOCKS`` behind is not replayed:
+the follower jumps to head and marks everything dirty.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from loguru import logger
+from starknet_py.hash.selector import get_selector_from_name
+
+from data.all_paths import FILES_DIR
+
+_ENABLED = os.getenv("EVENT_FOLLOWER", "1") not in ("0", "false", "False")
+_CHUNK_SIZE = int(os.getenv("EVENT_FOLLOWER_CHUNK_SIZE", "512"))
+_MAX_CATCHUP_BLOCKS = int(os.getenv("EVENT_FOLLOWER_MAX_CATCHUP_BLOCKS", "20000"))
+_INTERVAL_S = float(os.getenv("EVENT_FOLLOWER_INTERVAL_S", "30"))
+
+# Marker for "every entry": contract-wide events and epoch rollovers.
+GLOBAL = "*"
+
+
+def _norm(address: Union[int, str]) -> str:
+    return hex(int(address, 16) if isinstance(address, str) else int(address))
+
+
+def staker_key(address: Union[int, str]) -> str:
+    return f"staker:{_norm(address)}"
+
+
+def member_key(address: Union[int, str]) -> str:
+    return f"member:{_norm(address)}"
+
+
+@dataclass(frozen=True)
+class _EventRule:
+    """Which event keys name a staker / pool member (``keys[0]`` is the selector)."""
+
+    name: str
+    staker_keys: tuple[int, ...] = ()
+    member_keys: tuple[int, ...] = ()
+    is_global: bool = False
+
+    @property
+    def selector(self) -> int:
+        return get_selector_from_name(self.name)
+
+
+def _rules(*rules: _EventRule) -> dict[int, _EventRule]:
+    return {rule.selector: rule for rule in rules}
+
+
+_STAKER_EVENTS = (
+    "StakeOwnBalanceChanged",
+    "StakeDelegatedBalanceChanged",
+    "NewDelegationPool",
+    "StakerExitIntent",
+    "StakerRewardAddressChanged",
+    "OperationalAddressChanged",
+    "NewStaker",
+    "CommissionChanged",
+    "CommissionInitialized",
+    "StakerRewardClaimed",
+    "DeleteStaker",
+    "RewardsSuppliedToDelegationPool",
+    "CommissionCommitmentSet",
+    "StakerRewardsUpdated",
+)
+
+STAKING_RULES = _rules(
+    *(_EventRule(name, staker_keys=(1,)) for name in _STAKER_EVENTS),
+    _EventRule("OperationalAddressDeclared", staker_keys=(2,)),
+    # keys: staker, pool, token, identifier (= pool member)
+    _EventRule("RemoveFromDelegationPoolIntent", staker_keys=(1,), member_keys=(4,)),
+    # keys: pool, token, identifier
+    _EventRule("RemoveFromDelegationPoolAction", member_keys=(3,)),
+    _EventRule("ChangeDelegationPoolIntent", member_keys=(3,)),
+    _EventRule("EpochInfoChanged", is_global=True),
+    _EventRule("ExitWaitWindowChanged", is_global=True),
+    _EventRule("TokenAdded", is_global=True),
+    _EventRule("TokenEnabled", is_global=True),
+    _EventRule("TokenDisabled", is_global=True),
+)
+
+POOL_RULES = _rules(
+    _EventRule("PoolMemberExitIntent", member_keys=(1,)),
+    _EventRule("PoolMemberBalanceChanged", member_keys=(1,)),
+    _EventRule("PoolMemberRewardAddressChanged", member_keys=(1,)),
+    _EventRule("PoolMemberRewardClaimed", member_keys=(1,)),
+    _EventRule("PoolMemberExitAction", member_keys=(1,)),
+    _EventRule("NewPoolMember", member_keys=(1,), staker_keys=(2,)),
+    _EventRule("SwitchDelegationPool", member_keys=(1,)),
+    _EventRule("StakerRemoved", staker_keys=(1,)),
+)
+
+ATTESTATION_RULES = _rules(
+    _EventRule("StakerAttestationSuccessful", staker_keys=(1,)),
+    _EventRule("AttestationWindowChanged", is_global=True),
+)
+
+
+@dataclass(frozen=True)
+class EventSource:
+    """One ``starknet_getEvents`` stream.
+
+    ``address=None`` follows every contract but only the selectors in
+    ``rules`` (used for the per-staker pool contracts).
+    """
+
+    label: str
+    address: Optional[int]
+    rules: dict[int, _EventRule]
+
+
+def _felt(value: Union[int, str]) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def affected_keys(event: Any, rules: dict[int, _EventRule]) -> set[str]:
+    """Dirty keys produced by one emitted event (``set()`` if not ours)."""
+    keys = [_felt(k) for k in event.keys]
+    if not keys:
+        return set()
+    rule = rules.get(keys[0])
+    if rule is None:
+        return set()
+    if rule.is_global:
+        return {GLOBAL}
+    out: set[str] = set()
+    for i in rule.staker_keys:
+        if i < len(keys):
+            out.add(staker_key(keys[i]))
+    for i in rule.member_keys:
+        if i < len(keys):
+            out.add(member_key(keys[i]))
+    return out
+
+
+class EventFollower:
+    """Cursor over contract events plus the last block each address changed."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        sources: Iterable[EventSource],
+        state_path: Path,
+        *,
+        epoch_source: Callable[[], Awaitable[int]] | None = None,
+        on_dirty: Callable[[set[str]], Awaitable[Any]] | None = None,
+        chunk_size: int = _CHUNK_SIZE,
+        max_catchup_blocks: int = _MAX_CATCHUP_BLOCKS,
+    ) -> None:
+        self._client_factory = client_factory
+        self.sources = list(sources)
+        self.state_path = Path(state_path)
+        self._epoch_source = epoch_source
+        self._on_dirty = on_dirty
+        self.chunk_size = chunk_size
+        self.max_catchup_blocks = max_catchup_blocks
+        self._lock = asyncio.Lock()
+
+        self.cursor: int | None = None
+        self.epoch: int | None = None
+        self.touched: dict[str, int] = {}
+        self.synced = False
+        self.events_seen = 0
+        self._load()
+
+    # -- persistence ------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning(f"event follower state {self.state_path.name} unreadable: {exc}")
+            return
+        self.cursor = state.get("cursor")
+        self.epoch = state.get("epoch")
+        self.touched = {str(k): int(v) for k, v in (state.get("touched") or {}).items()}
+
+    def _save(self) -> None:
+        state = {"cursor": self.cursor, "epoch": self.epoch, "touched": self.touched}
+        tmp: str | None = None
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                dir=self.state_path.parent, prefix=".events-", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as fh:
+                json.dump(state, fh, separators=(",", ":"))
+            os.replace(tmp, self.state_path)
+        except OSError as exc:
+            logger.warning(f"event follower state not written ({self.state_path}): {exc}")
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+
+    # -- queries ----------------------------------------------------------
+
+    def is_fresh(self, keys: Iterable[str], since_block: int | None) -> bool:
+        """True when nothing in ``keys`` changed after ``since_block``.
+
+        Always ``False`` before the first successful :meth:`sync`.
+        """
+        if not self.synced or since_block is None:
+            return False
+        if self.touched.get(GLOBAL, -1) > since_block:
+            return False
+        return all(self.touched.get(k, -1) <= since_block for k in keys)
+
+    def _touch(self, keys: Iterable[str], block: int) -> None:
+        for key in keys:
+            if block > self.touched.get(key, -1):
+                self.touched[key] = block
+        if GLOBAL in self.touched:
+            # Anything touched at or before a global mark is dominated by it.
+            floor = self.touched[GLOBAL]
+            self.touched = {
+                k: b for k, b in self.touched.items() if k == GLOBAL or b > floor
+            }
+
+    # -- sync -------------------------------------------------------------
+
+    async def _page(self, client: Any, source: EventSource, start: int, end: int):
+        token: str | None = None
+        keys = None if source.address is not None else [list(source.rules)]
+        while True:
+            chunk = await client.get_events(
+                address=source.address,
+                keys=keys,
+                from_block_number=start,
+                to_block_number=end,
+                continuation_token=token,
+                chunk_size=self.chunk_size,
+            )
+            for event in chunk.events:
+                yield event
+            token = chunk.continuation_token
+            if not token:
+                return
+
+    async def sync(self) -> int:
+        """Advance the cursor to head; return how many keys were marked dirty.
+
+        RPC errors propagate and leave the cursor where it was, so the
+        next call retries the same range.
+        """
+        async with self._lock:
+            client = self._client_factory()
+            head = int(await client.get_block_number())
+            marked: set[str] = set()
+
+            if self._epoch_source is not None:
+                epoch = int(await self._epoch_source())
+                if self.epoch is not None and epoch != self.epoch:
+                    marked.add(GLOBAL)
+                self.epoch = epoch
+
+            if self.cursor is None or head - self.cursor > self.max_catchup_blocks:
+                # Nothing to replay from (first run / too far behind).
+                marked.add(GLOBAL)
+            elif head > self.cursor:
+                start = self.cursor + 1
+                for source in self.sources:
+                    async for event in self._page(client, source, start, head):
+                        keys = affected_keys(event, source.rules)
+                        self.events_seen += 1
+                        if keys:
+                            block = event.block_number if event.block_number is not None else head
+                            self._touch(keys, block)
+                            marked |= keys
+
+            if GLOBAL in marked:
+                self._touch((GLOBAL,), head)
+            self.cursor = max(head, self.cursor or 0)
+            self.synced = True
+            self._save()
+            if marked:
+                logger.debug(f"event follower @{head}: {len(marked)} dirty keys")
+                if self._on_dirty is not None:
+                    try:
+                        await self._on_dirty(marked)
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning(f"event follower on_dirty hook failed: {exc!r}")
+            return len(marked)
+
+    def stats(self) -> dict[str, int | None]:
+        return {
+            "cursor": self.cursor,
+            "tracked_keys": len(self.touched),
+            "events_seen": self.events_seen,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide follower
+# ---------------------------------------------------------------------------
+
+_follower: EventFollower | None = None
+
+
+def default_sources() -> list[EventSource]:
+    from data.contracts import get_network_addresses
+
+    addrs = get_network_addresses()
+    return [
+        EventSource("staking", _felt(addrs.staking_contract), STAKING_RULES),
+        EventSource("attestation", _felt(addrs.attestation_contract), ATTESTATION_RULES),
+        EventSource("pools", None, POOL_RULES),
+    ]
+
+
+def start_event_follower(role: str) -> EventFollower | None:
+    """Create this process's follower (idempotent). ``None`` when disabled."""
+    global _follower
+    if not _ENABLED:
+        return None
+    if _follower is None:
+        from services.negative_cache import forget_address
+        from services.rpc_client import get_client
+        from services.staking_service import fetch_current_epoch
+
+        async def _forget_missing(keys: set[str]) -> None:
+            # An event naming an address means it exists now: drop any
+            # remembered "does not exist" answer for it.
+            for key in keys - {GLOBAL}:
+                forget_address(key.split(":", 1)[1])
+
+        _follower = EventFollower(
+            get_client,
+            default_sources(),
+            FILES_DIR / f"event_cursor_{role}.json",
+            epoch_source=fetch_current_epoch,
+            on_dirty=_forget_missing,
+        )
+    return _follower
+
+
+def active_follower() -> EventFollower | None:
+    """The follower, once it has synced at least once; otherwise ``None``."""
+    if _follower is not None and _follower.synced:
+        return _follower
+    return None
+
+
+async def run_event_follower(role: str, interval: float = _INTERVAL_S) -> None:
+    """Sync forever every ``interval`` seconds (API process)."""
+    follower = start_event_follower(role)
+    if follower is None:
+        return
+    while True:
+        started = time.monotonic()
+        try:
+            await follower.sync()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"event follower sync failed: {exc!r}")
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
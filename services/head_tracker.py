@@ -0,0 +1,392 @@
+"""Chain-head tracker: new blocks and epoch boundaries as events.
+
+The watchers in :mod:`tasks` used to wake on the wall clock — attestation
+every 60 s, rewards at xx:00 — whether or not the chain had moved, and
+found out about epoch flips by polling ``get_current_epoch`` and diffing
+against a module-level ``_last_seen_epoch``.
+
+:class:`HeadTracker` follows the head instead and publishes two events:
+
+  - :class:`Head` for every new block (coalesced: a slow subscriber sees
+    the latest head, not a backlog);
+  - :class:`EpochBoundary` when the block number crosses into a new
+    epoch, computed locally from the staking contract's ``EpochInfo``
+    (``starting_block`` / ``starting_epoch`` / ``length``) so no epoch
+    read is needed per block. ``EpochInfo`` is re-read at each boundary
+    in case governance changed the parameters.
+
+Heads come from the first working :class:`HeadSource`:
+
+  1. :class:`WebSocketHeadSource` — ``starknet_subscribeNewHeads`` on
+     ``STARKNET_WS_URL`` (when set);
+  2. :class:`PollingHeadSource` — ``starknet_blockHashAndNumber`` every
+     ``HEAD_POLL_INTERVAL_S`` through the regular RPC client.
+
+If the socket drops or stalls the tracker falls back to polling and
+retries the socket every ``HEAD_WS_RETRY_S``. :class:`FakeHeadSource`
+lets tests drive the tracker block by block.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Protocol, Union
+
+from loguru import logger
+
+_ENABLED = os.getenv("HEAD_TRACKER", "1") not in ("0", "false", "False")
+_WS_URL = os.getenv("STARKNET_WS_URL", "")
+_POLL_INTERVAL_S = float(os.getenv("HEAD_POLL_INTERVAL_S", "6"))
+_WS_STALL_S = float(os.getenv("HEAD_WS_STALL_S", "60"))
+_WS_RETRY_S = float(os.getenv("HEAD_WS_RETRY_S", "300"))
+
+
+@dataclass(frozen=True)
+class Head:
+    number: int
+    block_hash: Optional[int] = None
+    timestamp: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class EpochBoundary:
+    """The chain entered ``epoch`` at ``block_number``.
+
+    ``previous`` is ``None`` for the first epoch the tracker observes
+    after start-up, which consumers treat like a flip (as the old
+    ``_last_seen_epoch = 0`` did).
+    """
+
+    epoch: int
+    block_number: int
+    previous: Optional[int]
+
+
+HeadEvent = Union[Head, EpochBoundary]
+
+
+# ---------------------------------------------------------------------------
+# Epoch arithmetic
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class EpochSchedule:
+    """Block → epoch mapping from the staking contract's ``EpochInfo``."""
+
+    length: int
+    starting_block: int
+    starting_epoch: int
+    previous_length: int
+
+    @classmethod
+    def from_epoch_info(cls, info: dict | None) -> "EpochSchedule | None":
+        if not info:
+            return None
+        try:
+            length = int(info.get("length") or 0)
+            schedule = cls(
+                length=length,
+                starting_block=int(info.get("starting_block") or 0),
+                starting_epoch=int(info.get("starting_epoch") or 0),
+                previous_length=int(info.get("previous_length") or length),
+            )
+        except (TypeError, ValueError):
+            return None
+        return schedule if length > 0 else None
+
+    def epoch_at(self, block: int) -> int:
+        if block >= self.starting_block:
+            return self.starting_epoch + (block - self.starting_block) // self.length
+        # Before a scheduled parameter change: count back with the old length
+        # (floor division of the negative offset rounds away from zero).
+        return self.starting_epoch + (block - self.starting_block) // max(
+            1, self.previous_length
+        )
+
+    def first_block(self, epoch: int) -> int:
+        return self.starting_block + (epoch - self.starting_epoch) * self.length
+
+
+# ---------------------------------------------------------------------------
+# Head sources
+# ---------------------------------------------------------------------------
+
+
+class HeadSource(Protocol):
+    name: str
+
+    def heads(self) -> AsyncIterator[Head]:
+        """Yield heads until the source fails (raise) or is exhausted."""
+        ...
+
+
+class WebSocketHeadSource:
+    """``starknet_subscribeNewHeads`` over starknet-py's WebSocket client."""
+
+    name = "websocket"
+
+    def __init__(self, url: str, *, stall_timeout: float = _WS_STALL_S) -> None:
+        self.url = url
+        self.stall_timeout = stall_timeout
+
+    async def heads(self) -> AsyncIterator[Head]:
+        from starknet_py.net.websockets.websocket_client import WebsocketClient
+
+        ws = WebsocketClient(self.url)
+        await ws.connect()
+        queue: asyncio.Queue = asyncio.Queue()
+        try:
+            await ws.subscribe_new_heads(lambda note: queue.put_nowait(note.result))
+            while True:
+                # A dead listener or a silent node both end up here.
+                header = await asyncio.wait_for(queue.get(), self.stall_timeout)
+                yield Head(header.block_number, header.block_hash, header.timestamp)
+        finally:
+            with suppress(Exception):
+                await ws.disconnect()
+
+
+class PollingHeadSource:
+    """Poll ``starknet_blockHashAndNumber`` through the shared RPC client."""
+
+    name = "polling"
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        *,
+        interval: float = _POLL_INTERVAL_S,
+    ) -> None:
+        self._client_factory = client_factory
+        self.interval = interval
+
+    async def heads(self) -> AsyncIterator[Head]:
+        last: int | None = None
+        while True:
+            latest = await self._client_factory().get_block_hash_and_number()
+            if last is None or latest.block_number > last:
+                last = latest.block_number
+                yield Head(latest.block_number, latest.block_hash)
+            await asyncio.sleep(self.interval)
+
+
+class FakeHeadSource:
+    """In-memory source for tests: ``await push(n)`` publishes block ``n``."""
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[Head | None] = asyncio.Queue()
+
+    async def push(self, number: int, timestamp: int | None = None) -> None:
+        await self._queue.put(Head(number, number, timestamp))
+
+    def close(self) -> None:
+        self._queue.put_nowait(None)
+
+    async def heads(self) -> AsyncIterator[Head]:
+        while (head := await self._queue.get()) is not None:
+            yield head
+
+
+# ---------------------------------------------------------------------------
+# Subscriptions
+# ---------------------------------------------------------------------------
+
+
+class HeadSubscription:
+    """Per-consumer mailbox: every epoch boundary, only the latest head."""
+
+    def __init__(self, tracker: "HeadTracker") -> None:
+        self._tracker = tracker
+        self._epochs: deque[EpochBoundary] = deque()
+        self._head: Head | None = None
+        self._wake = asyncio.Event()
+
+    def _offer(self, event: HeadEvent) -> None:
+        if isinstance(event, EpochBoundary):
+            self._epochs.append(event)
+        else:
+            self._head = event
+        self._wake.set()
+
+    async def next(self) -> HeadEvent:
+        while True:
+            if self._epochs:
+                return self._epochs.popleft()
+            if self._head is not None:
+                head, self._head = self._head, None
+                return head
+            self._wake.clear()
+            await self._wake.wait()
+
+    def close(self) -> None:
+        self._tracker._subscribers.discard(self)
+
+    def __aiter__(self) -> "HeadSubscription":
+        return self
+
+    async def __anext__(self) -> HeadEvent:
+        return await self.next()
+
+
+# ---------------------------------------------------------------------------
+# Tracker
+# ---------------------------------------------------------------------------
+
+
+class HeadTracker:
+    def __init__(
+        self,
+        sources: list[HeadSource],
+        *,
+        epoch_info_source: Callable[[], Awaitable[dict | None]] | None = None,
+        primary_retry_s: float = _WS_RETRY_S,
+        error_backoff_s: float = _POLL_INTERVAL_S,
+    ) -> None:
+        if not sources:
+            raise ValueError("HeadTracker needs at least one head source")
+        self.sources = sources
+        self._epoch_info_source = epoch_info_source
+        self.primary_retry_s = primary_retry_s
+        self.error_backoff_s = error_backoff_s
+
+        self.head: Head | None = None
+        self.epoch: int | None = None
+        self.schedule: EpochSchedule | None = None
+        self.source_name: str | None = None
+        self._subscribers: set[HeadSubscription] = set()
+        self._changed = asyncio.Condition()
+
+    # -- consumers --------------------------------------------------------
+
+    def subscribe(self) -> HeadSubscription:
+        sub = HeadSubscription(self)
+        self._subscribers.add(sub)
+        return sub
+
+    async def wait_for_block(self, number: int) -> Head:
+        """Return the first head at or past ``number``."""
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self.head is not None and self.head.number >= number
+            )
+            assert self.head is not None
+            return self.head
+
+    # -- publishing -------------------------------------------------------
+
+    async def _refresh_schedule(self) -> None:
+        if self._epoch_info_source is None:
+            return
+        try:
+            schedule = EpochSchedule.from_epoch_info(await self._epoch_info_source())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"head tracker: epoch info unavailable: {exc}")
+            return
+        if schedule is not None:
+            self.schedule = schedule
+
+    async def publish(self, head: Head) -> None:
+        """Feed one head (sources call this; also handy in tests)."""
+        if self.head is not None and head.number <= self.head.number:
+            return  # duplicate / reordered notification
+        events: list[HeadEvent] = []
+        if self.schedule is None:
+            await self._refresh_schedule()
+        if self.schedule is not None:
+            epoch = self.schedule.epoch_at(head.number)
+            if epoch != self.epoch:
+                # Parameters may have changed at the boundary; recompute.
+                await self._refresh_schedule()
+                epoch = self.schedule.epoch_at(head.number)
+            if epoch != self.epoch:
+                events.append(EpochBoundary(epoch, head.number, self.epoch))
+                self.epoch = epoch
+        events.append(head)
+
+        async with self._changed:
+            self.head = head
+            self._changed.notify_all()
+        for sub in list(self._subscribers):
+            for event in events:
+                sub._offer(event)
+
+    # -- driving ----------------------------------------------------------
+
+    async def _consume(self, source: HeadSource, budget: float | None) -> None:
+        async def _drain() -> None:
+            async for head in source.heads():
+                if self.source_name != source.name:
+                    logger.info(f"head tracker: following {source.name} at block {head.number}")
+                    self.source_name = source.name
+                await self.publish(head)
+
+        if budget is None:
+            await _drain()
+        else:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(_drain(), budget)
+
+    async def run(self) -> None:
+        """Follow heads forever, falling back down ``sources`` on failure.
+
+        The first source is the preferred one: while a fallback is in use
+        it is retried every ``primary_retry_s`` seconds.
+        """
+        while True:
+            for i, source in enumerate(self.sources):
+                budget = None if i == 0 or len(self.sources) == 1 else self.primary_retry_s
+                try:
+                    await self._consume(source, budget)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning(f"head tracker: {source.name} source failed: {exc!r}")
+                    continue
+                if budget is not None:
+                    break  # fallback served its turn; retry the primary
+            await asyncio.sleep(self.error_backoff_s)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "head": self.head.number if self.head else None,
+            "epoch": self.epoch,
+            "source": self.source_name,
+            "subscribers": len(self._subscribers),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide tracker
+# ---------------------------------------------------------------------------
+
+_tracker: HeadTracker | None = None
+
+
+def start_head_tracker() -> HeadTracker | None:
+    """Create this process's tracker (idempotent). ``None`` when disabled.
+
+    The caller still has to schedule :meth:`HeadTracker.run`.
+    """
+    global _tracker
+    if not _ENABLED:
+        return None
+    if _tracker is None:
+        from services.rpc_client import get_client
+        from services.staking_service import fetch_epoch_info
+
+        sources: list[HeadSource] = []
+        if _WS_URL:
+            sources.append(WebSocketHeadSource(_WS_URL))
+        sources.append(PollingHeadSource(get_client))
+        _tracker = HeadTracker(sources, epoch_info_source=fetch_epoch_info)
+    return _tracker
+
+
+def get_head_tracker() -> HeadTracker | None:
+    return _tracker
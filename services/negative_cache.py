@@ -0,0 +1,159 @@
+"""Remembered "does not exist" answers from the staking contracts.
+
+``fetch_staker_raw``, ``fetch_staker_pools_raw`` and
+``fetch_pool_member_raw`` map deterministic domain reverts ("Staker does
+not exist", Option::None, …) to ``None``. Without memory, a mistyped or
+exited address in someone's tracking list repeats the same failed RPC
+every cycle, forever. :class:`NegativeCache` keeps those answers for
+``NEGATIVE_CACHE_TTL_S`` and serves them locally.
+
+Only confirmed absences are recorded — RPC failures, which the fetchers
+also turn into ``None``, never are. Entries are dropped early when
+something suggests the address became valid:
+
+  * the event follower saw an event for it (``NewStaker``,
+    ``NewPoolMember``, …) — wired in
+    :func:`services.event_follower.start_event_follower`;
+  * a user explicitly adds it to their tracking list.
+
+Absent answers for a tracked address — a staker that does not exist, a
+delegator with no position in any of the staker's pools — bump a
+per-address counter; :func:`dead_addresses` lists the addresses that
+keep coming back, which is how dead tracking entries show up in the
+notifier log. Per-pool membership misses are cached but not tallied: a
+STRK-only delegator is legitimately absent from the staker's BTC pools.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Callable
+
+_TTL_S = float(os.getenv("NEGATIVE_CACHE_TTL_S", "600"))
+_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "50000"))
+
+
+def _norm(address: str) -> str:
+    try:
+        return hex(int(address, 16))
+    except (TypeError, ValueError):
+        return (address or "").lower()
+
+
+class NegativeCache:
+    """``(kind, *addresses)`` → "known absent until" with per-address counters."""
+
+    def __init__(
+        self,
+        ttl: float = _TTL_S,
+        *,
+        max_entries: int = _MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._expires: dict[tuple[str, ...], tuple[float, bool]] = {}
+        self._by_address: dict[str, set[tuple[str, ...]]] = {}
+        self.misses: dict[str, int] = {}
+        self.hits = 0
+
+    @staticmethod
+    def _key(kind: str, addresses: tuple[str, ...]) -> tuple[str, ...]:
+        return (kind, *(_norm(a) for a in addresses))
+
+    def tally(self, address: str) -> None:
+        """Count one absent answer for ``address`` (see :func:`dead_addresses`)."""
+        address = _norm(address)
+        self.misses[address] = self.misses.get(address, 0) + 1
+
+    def is_absent(self, kind: str, *addresses: str) -> bool:
+        """True while a recorded absence for ``(kind, *addresses)`` is live."""
+        key = self._key(kind, addresses)
+        entry = self._expires.get(key)
+        if entry is None:
+            return False
+        expires, tallied = entry
+        if self._clock() >= expires:
+            self._drop(key)
+            return False
+        self.hits += 1
+        if tallied:
+            self.tally(key[-1])
+        return True
+
+    def record(self, kind: str, *addresses: str, tally: bool = True) -> None:
+        """Remember that the chain confirmed ``(kind, *addresses)`` does not exist.
+
+        With ``tally`` the last address is counted as a miss, now and on
+        every answer served from the cache.
+        """
+        key = self._key(kind, addresses)
+        if key not in self._expires and len(self._expires) >= self.max_entries:
+            # Insertion order is expiry order (one TTL): drop the oldest tenth.
+            for old in list(self._expires)[: max(1, self.max_entries // 10)]:
+                self._drop(old)
+        self._expires.pop(key, None)
+        self._expires[key] = (self._clock() + self.ttl, tally)
+        for address in key[1:]:
+            self._by_address.setdefault(address, set()).add(key)
+        if tally:
+            self.tally(key[-1])
+
+    def forget_address(self, address: str) -> int:
+        """Drop every absence mentioning ``address``; returns how many."""
+        address = _norm(address)
+        keys = self._by_address.pop(address, set())
+        self.misses.pop(address, None)
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    def _drop(self, key: tuple[str, ...]) -> None:
+        self._expires.pop(key, None)
+        for address in key[1:]:
+            keys = self._by_address.get(address)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_address[address]
+
+    def clear(self) -> None:
+        self._expires.clear()
+        self._by_address.clear()
+        self.misses.clear()
+        self.hits = 0
+
+    def dead_addresses(self, min_misses: int = 3, limit: int = 20) -> list[tuple[str, int]]:
+        """Most-missed addresses first; an address seen valid again is reset."""
+        dead = [
+            (address, count)
+            for address, count in self.misses.items()
+            if count >= min_misses
+        ]
+        dead.sort(key=lambda item: item[1], reverse=True)
+        return dead[:limit]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._expires),
+            "hits": self.hits,
+            "addresses": len(self._by_address),
+            "tallied": len(self.misses),
+        }
+
+
+# One table per process, shared by every fetcher.
+absent = NegativeCache()
+
+
+def forget_address(address: str) -> int:
+    return absent.forget_address(address)
+
+
+def dead_addresses(min_misses: int = 3, limit: int = 20) -> list[tuple[str, int]]:
+    return absent.dead_addresses(min_misses, limit)
+
+
+def negative_cache_stats() -> dict[str, int]:
+    return absent.stats()
@@ -0,0 +1,182 @@
+"""Compiled call table for the hot staking / pool / attestation reads.
+
+``Contract.functions[...].call(...)`` pays twice: building the ``Contract``
+parses the whole ABI (seconds for the staking contract), and every call
+runs the generic ABI-driven serializer over a handful of felts. The six
+reads below make up almost all RPC traffic of a digest, so they go
+straight through ``client.call_contract`` instead — the same way
+``token_service.fetch_strk_balance`` already does for ``balance_of``:
+
+* selectors are computed once at import;
+* each output is decoded by a small hand-written function that walks the
+  felt array and returns exactly the shape starknet-py produces (dicts
+  with the ABI member names, ``None`` for ``Option::None``, ``{"seconds":
+  n}`` for ``Timestamp``), so callers in ``staking_service`` and
+  ``attestation_service`` don't change.
+
+Cairo serde recap: ``u8``..``u128`` / ``ContractAddress`` / ``felt252`` are
+one felt each; ``Option<T>`` is a variant index (``0`` = ``Some``, ``1`` =
+``None``) followed by ``T`` for ``Some``; ``Span<T>`` is a length followed
+by the elements.
+
+``tests/test_raw_calls.py`` checks every decoder against starknet-py's own
+deserializer for the shipped ABIs; ``scripts/bench_raw_calls.py`` compares
+the two paths.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.client_models import Call
+from starknet_py.serialization.errors import InvalidValueException
+
+from services.rpc_client import get_client, snapshot_block_kwargs
+
+
+class _Felts:
+    """Forward-only cursor over a ``starknet_call`` result."""
+
+    __slots__ = ("_data", "_pos", "_fn")
+
+    def __init__(self, data: Sequence[int], fn: str) -> None:
+        self._data = data
+        self._pos = 0
+        self._fn = fn
+
+    def next(self) -> int:
+        try:
+            value = self._data[self._pos]
+        except IndexError:
+            raise InvalidValueException(
+                f"{self._fn}: result ended after {self._pos} felts"
+            ) from None
+        self._pos += 1
+        return int(value)
+
+    def is_some(self) -> bool:
+        variant = self.next()
+        if variant not in (0, 1):
+            raise InvalidValueException(f"{self._fn}: bad Option variant {variant}")
+        return variant == 0
+
+    def timestamp_option(self) -> dict | None:
+        return {"seconds": self.next()} if self.is_some() else None
+
+
+def _decode_u(fn: str) -> Callable[[Sequence[int]], int]:
+    def _decode(felts: Sequence[int]) -> int:
+        return _Felts(felts, fn).next()
+
+    return _decode
+
+
+def _decode_staker_info_v1(felts: Sequence[int]) -> dict | None:
+    """``Option<StakerInfoV1>``."""
+    r = _Felts(felts, "get_staker_info_v1")
+    if not r.is_some():
+        return None
+    info = {
+        "reward_address": r.next(),
+        "operational_address": r.next(),
+        "unstake_time": r.timestamp_option(),
+        "amount_own": r.next(),
+        "unclaimed_rewards_own": r.next(),
+        "pool_info": None,
+    }
+    if r.is_some():
+        info["pool_info"] = {
+            "pool_contract": r.next(),
+            "amount": r.next(),
+            "commission": r.next(),
+        }
+    return info
+
+
+def _decode_staker_pool_info(felts: Sequence[int]) -> dict:
+    """``StakerPoolInfoV2 { commission: Option<u16>, pools: Span<PoolInfo> }``."""
+    r = _Felts(felts, "staker_pool_info")
+    commission = r.next() if r.is_some() else None
+    pools = [
+        {"pool_contract": r.next(), "token_address": r.next(), "amount": r.next()}
+        for _ in range(r.next())
+    ]
+    return {"commission": commission, "pools": pools}
+
+
+def _decode_pool_member_info_v1(felts: Sequence[int]) -> dict | None:
+    """``Option<PoolMemberInfoV1>``."""
+    r = _Felts(felts, "get_pool_member_info_v1")
+    if not r.is_some():
+        return None
+    return {
+        "reward_address": r.next(),
+        "amount": r.next(),
+        "unclaimed_rewards": r.next(),
+        "commission": r.next(),
+        "unpool_amount": r.next(),
+        "unpool_time": r.timestamp_option(),
+    }
+
+
+def _decode_epoch_info(felts: Sequence[int]) -> dict:
+    """``EpochInfo`` — six plain integers."""
+    r = _Felts(felts, "get_epoch_info")
+    return {
+        "epoch_duration": r.next(),
+        "length": r.next(),
+        "starting_block": r.next(),
+        "starting_epoch": r.next(),
+        "previous_length": r.next(),
+        "previous_epoch_duration": r.next(),
+    }
+
+
+@dataclass(frozen=True)
+class RawCall:
+    """One precompiled view function: selector + output decoder."""
+
+    name: str
+    selector: int
+    decode: Callable[[Sequence[int]], Any]
+
+
+def _entry(name: str, decode: Callable[[Sequence[int]], Any]) -> RawCall:
+    return RawCall(name=name, selector=get_selector_from_name(name), decode=decode)
+
+
+CALL_TABLE: dict[str, RawCall] = {
+    spec.name: spec
+    for spec in (
+        # staking contract
+        _entry("get_staker_info_v1", _decode_staker_info_v1),
+        _entry("staker_pool_info", _decode_staker_pool_info),
+        _entry("get_current_epoch", _decode_u("get_current_epoch")),
+        _entry("get_epoch_info", _decode_epoch_info),
+        # pool contract
+        _entry("get_pool_member_info_v1", _decode_pool_member_info_v1),
+        # attestation contract
+        _entry(
+            "get_last_epoch_attestation_done",
+            _decode_u("get_last_epoch_attestation_done"),
+        ),
+    )
+}
+
+
+async def call_view(address: int | str, name: str, *calldata: int) -> Any:
+    """Call a view function from :data:`CALL_TABLE` and decode its result.
+
+    Honours the active :func:`services.rpc_client.read_snapshot` just like
+    the ``Contract`` path. Reverts surface as ``ClientError`` and malformed
+    results as ``InvalidValueException``, so existing ``except`` clauses
+    and ``with_retry`` behave the same.
+    """
+    spec = CALL_TABLE[name]
+    to_addr = int(address, 16) if isinstance(address, str) else int(address)
+    result = await get_client().call_contract(
+        call=Call(to_addr=to_addr, selector=spec.selector, calldata=list(calldata)),
+        **await snapshot_block_kwargs(),
+    )
+    return spec.decode(result)
@@ -0,0 +1,328 @@
+"""JSON-RPC batch transport for the shared :class:`FullNodeClient`.
+
+starknet-py sends one HTTP POST per ``starknet_call``. A single
+``get_validator_info`` fans out ~10 reads, and the hourly notifier runs
+that for every tracked entry of every user, so the node sees thousands of
+tiny round-trips per cycle.
+
+:class:`BatchingRpcHttpClient` replaces the client's ``RpcHttpClient``.
+Every ``call()`` lands in a pending list; after a short window (or as soon
+as ``max_batch_size`` calls are queued) the list is flushed as a single
+JSON-RPC array request and each result is routed back to the coroutine
+that asked for it by ``id``.
+
+Providers that do not accept batches (some public gateways answer an
+array with a single error object, or with HTTP 400/405) flip the client
+into pass-through mode for the rest of the process: calls then go out
+one by one exactly like stock starknet-py.
+
+An optional ``single_flight`` (see :class:`services.rpc_client.SingleFlight`)
+sits in front of the queue: identical ``(method, params)`` pairs that are
+already pending or in flight are not queued a second time, and an optional
+``block_cache`` (see :class:`services.rpc_client.BlockCallCache`) answers
+``starknet_call`` reads pinned to an explicit block number from memory.
+
+With an optional ``pool`` (see :class:`services.rpc_pool.RpcEndpointPool`)
+each HTTP request — single call or whole batch — is routed to the
+healthiest of several endpoints instead of always going to ``url``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from aiohttp import ClientSession
+from loguru import logger
+from starknet_py.constants import EXPECTED_RPC_VERSION
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.http_client import HttpMethod, RpcHttpClient, ServerError
+
+# HTTP statuses with which a provider tells us "I don't speak batches".
+# 429 / 5xx are deliberately absent: those are transient and belong to
+# ``with_retry``, not to a permanent downgrade.
+_BATCH_REJECT_STATUSES = frozenset({"400", "405", "415", "501"})
+
+
+@dataclass
+class BatchStats:
+    """Counters exposed for logs / diagnostics (per client instance)."""
+
+    calls: int = 0
+    batches: int = 0
+    batched_calls: int = 0
+    single_calls: int = 0
+    fallbacks: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        avg = self.batched_calls / self.batches if self.batches else 0.0
+        return {
+            "calls": self.calls,
+            "batches": self.batches,
+            "batched_calls": self.batched_calls,
+            "single_calls": self.single_calls,
+            "fallbacks": self.fallbacks,
+            "avg_batch_size": round(avg, 2),
+        }
+
+
+@dataclass
+class _PendingCall:
+    method: str
+    params: Any
+    future: asyncio.Future
+
+
+class BatchingRpcHttpClient(RpcHttpClient):
+    """``RpcHttpClient`` that coalesces concurrent calls into JSON-RPC batches.
+
+    :param window_seconds: how long the first queued call waits for company
+        before the batch is flushed. A few milliseconds is enough to catch
+        every call issued by one ``asyncio.gather``.
+    :param max_batch_size: hard cap per HTTP request; reaching it flushes
+        immediately. ``1`` disables batching entirely.
+    :param single_flight: object with an async ``run(key, op)`` used to
+        collapse identical concurrent calls; ``None`` sends every call.
+    :param block_cache: object with ``key_for`` / ``get`` / ``put`` used to
+        memoize block-pinned calls; ``None`` disables it.
+    :param pool: object with an async ``post(payload, send, limiter=...)``
+        that picks the endpoint for each HTTP request (and holds the
+        ``limiter`` slot); ``None`` always posts to ``url``.
+    :param limiter: object whose ``slot(url)`` async context manager bounds
+        in-flight HTTP requests per endpoint; ``None`` leaves them unbounded.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        window_seconds: float = 0.005,
+        max_batch_size: int = 50,
+        session: Optional[ClientSession] = None,
+        method_prefix: str = "starknet",
+        single_flight: Any = None,
+        block_cache: Any = None,
+        pool: Any = None,
+        limiter: Any = None,
+    ) -> None:
+        super().__init__(url, session=session, method_prefix=method_prefix)
+        self.single_flight = single_flight
+        self.block_cache = block_cache
+        self.pool = pool
+        self.limiter = limiter
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.batch_supported = self.max_batch_size > 1
+        self.stats = BatchStats()
+        self._pending: list[_PendingCall] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Strong refs to in-flight flush tasks so they aren't GC'd mid-send.
+        self._tasks: set[asyncio.Task] = set()
+
+    async def call(self, method_name: str, params: Optional[dict] = None):
+        await self._warn_if_incompatible_rpc_version()
+        cache_key = (
+            self.block_cache.key_for(method_name, params)
+            if self.block_cache is not None
+            else None
+        )
+        if cache_key is not None:
+            cached = self.block_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+            result = await self._deduplicated(method_name, params)
+            self.block_cache.put(cache_key, tuple(result))
+            return result
+        return await self._deduplicated(method_name, params)
+
+    async def _deduplicated(self, method_name: str, params: Optional[dict]):
+        if self.single_flight is None or method_name.startswith("add"):
+            # ``add*Transaction`` writes are never deduplicated.
+            return await self._dispatch(method_name, params)
+        key = (self.url, method_name, json.dumps(params, sort_keys=True, default=str))
+        return await self.single_flight.run(
+            key, lambda: self._dispatch(method_name, params)
+        )
+
+    async def _dispatch(self, method_name: str, params: Optional[dict]):
+        self.stats.calls += 1
+        if not self.batch_supported:
+            self.stats.single_calls += 1
+            return await self._call_single(method_name, params)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The process-wide client outlives event loops in tests and in
+            # ``asyncio.run`` restarts; never mix futures across loops.
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+
+        future = loop.create_future()
+        self._pending.append(
+            _PendingCall(
+                method=f"{self.method_prefix}_{method_name}",
+                params=params if params else [],
+                future=future,
+            )
+        )
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    async def _call_single(self, method_name: str, params: Optional[dict]):
+        payload = {
+            "jsonrpc": "2.0",
+            "method": f"{self.method_prefix}_{method_name}",
+            "id": 0,
+            "params": params if params else [],
+        }
+        result = await self._post(payload)
+        if "result" not in result:
+            self.handle_rpc_error(result)
+        return result["result"]
+
+    async def _post(self, payload: Any) -> Any:
+        """Send one HTTP request, through the endpoint pool when there is one."""
+        if self.pool is not None:
+            # The pool takes the limiter slot itself, ahead of its latency
+            # clock and hedge timer.
+            return await self.pool.post(payload, self._post_to, limiter=self.limiter)
+        if self.limiter is None:
+            return await self._post_to(self.url, payload)
+        async with self.limiter.slot(self.url):
+            return await self._post_to(self.url, payload)
+
+    async def _post_to(self, url: str, payload: Any) -> Any:
+        return await self.request(
+            http_method=HttpMethod.POST, address=url, payload=payload
+        )
+
+    async def _warn_if_incompatible_rpc_version(self):
+        # Stock starknet-py probes ``specVersion`` with a direct POST to
+        # ``self.url``; go through ``_post`` so the probe is pooled too.
+        if self._is_spec_version_verified:
+            return
+        if self.pool is None:
+            await super()._warn_if_incompatible_rpc_version()
+            return
+        res = await self._post(
+            {"jsonrpc": "2.0", "method": f"{self.method_prefix}_specVersion", "id": 0}
+        )
+        if res.get("result") != EXPECTED_RPC_VERSION:
+            logger.warning(
+                f"RPC pool: specVersion {res.get('result')!r}, "
+                f"expected {EXPECTED_RPC_VERSION}"
+            )
+        self._is_spec_version_verified = True
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[_PendingCall]) -> None:
+        if len(batch) == 1:
+            self.stats.single_calls += 1
+            await self._send_one(batch[0])
+            return
+
+        payload = [
+            {"jsonrpc": "2.0", "method": p.method, "id": i, "params": p.params}
+            for i, p in enumerate(batch)
+        ]
+        try:
+            response = await self._post(payload)
+        except ClientError as exc:
+            if str(exc.code) in _BATCH_REJECT_STATUSES:
+                self._disable_batching(f"HTTP {exc.code}")
+                await self._send_individually(batch)
+                return
+            _fail_all(batch, exc)
+            return
+        except Exception as exc:  # noqa: BLE001
+            _fail_all(batch, exc)
+            return
+
+        if not isinstance(response, list):
+            # A single error object in reply to an array request is how
+            # most gateways say "batching not supported".
+            self._disable_batching(f"non-array response: {str(response)[:200]}")
+            await self._send_individually(batch)
+            return
+
+        self.stats.batches += 1
+        self.stats.batched_calls += len(batch)
+        by_id = {
+            item.get("id"): item for item in response if isinstance(item, dict)
+        }
+        for i, pending in enumerate(batch):
+            item = by_id.get(i)
+            if item is None:
+                _resolve(pending.future, exc=ServerError(body={"missing_id": i}))
+            elif "result" in item:
+                _resolve(pending.future, result=item["result"])
+            else:
+                try:
+                    self.handle_rpc_error(item)
+                except Exception as exc:  # noqa: BLE001
+                    _resolve(pending.future, exc=exc)
+
+    async def _send_one(self, pending: _PendingCall) -> None:
+        payload = {
+            "jsonrpc": "2.0",
+            "method": pending.method,
+            "id": 0,
+            "params": pending.params,
+        }
+        try:
+            result = await self._post(payload)
+            if "result" not in result:
+                self.handle_rpc_error(result)
+        except Exception as exc:  # noqa: BLE001
+            _resolve(pending.future, exc=exc)
+            return
+        _resolve(pending.future, result=result["result"])
+
+    async def _send_individually(self, batch: list[_PendingCall]) -> None:
+        self.stats.single_calls += len(batch)
+        await asyncio.gather(*(self._send_one(p) for p in batch))
+
+    def _disable_batching(self, reason: str) -> None:
+        if self.batch_supported:
+            logger.warning(
+                f"RPC provider {self.url} rejected a JSON-RPC batch ({reason}); "
+                f"falling back to one request per call"
+            )
+        self.batch_supported = False
+        self.stats.fallbacks += 1
+
+
+def _resolve(
+    future: asyncio.Future,
+    *,
+    result: Any = None,
+    exc: BaseException | None = None,
+) -> None:
+    # The awaiting caller may have been cancelled (timeout, shutdown).
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+def _fail_all(batch: list[_PendingCall], exc: BaseException) -> None:
+    for pending in batch:
+        _resolve(pending.future, exc=exc)
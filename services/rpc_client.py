@@ -2,13 +2,28 @@
 
 Adds retry with exponential backoff around transient RPC failures while
 letting domain errors (invalid address, staker-not-exists) pass through
-immediately.
+immediately, and owns the process-wide transport pieces plugged into
+:class:`BatchingRpcHttpClient`: single-flight dedup, the block-keyed call
+cache, the endpoint pool and the AIMD concurrency limiter.
 """
 from __future__ import annotations
 
 import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
-from typing import Any, Awaitable, Callable, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterator,
+    TypeVar,
+)
 
 from loguru import logger
 from starknet_py.net.client_errors import ClientError
@@ -21,10 +36,288 @@ from tenacity import (
     wait_exponential,
 )
 
-from data.contracts import STARKNET_RPC_URL
+from data.contracts import STARKNET_RPC_URL, STARKNET_RPC_URLS
+from services.rpc_batch import BatchingRpcHttpClient
+from services.rpc_pool import RpcEndpointPool
 
 T = TypeVar("T")
 
+# JSON-RPC batching (see :mod:`services.rpc_batch`). ``RPC_BATCH_MAX_SIZE=1``
+# turns it off and restores stock one-request-per-call behaviour.
+_BATCH_WINDOW_MS = float(os.getenv("RPC_BATCH_WINDOW_MS", "5"))
+_BATCH_MAX_SIZE = int(os.getenv("RPC_BATCH_MAX_SIZE", "50"))
+# Entries kept by the block-keyed ``starknet_call`` cache (see BlockCallCache).
+_BLOCK_CACHE_SIZE = int(os.getenv("RPC_BLOCK_CACHE_SIZE", "20000"))
+
+# Multi-endpoint pool (only used when STARKNET_RPC_URLS adds endpoints).
+_HEDGE = os.getenv("RPC_HEDGE", "1") not in ("0", "false", "False")
+_BREAKER_FAILURES = int(os.getenv("RPC_BREAKER_FAILURES", "5"))
+_BREAKER_COOLDOWN_S = float(os.getenv("RPC_BREAKER_COOLDOWN_S", "30"))
+
+# AIMD in-flight cap per endpoint (see AimdLimiter).
+_CONCURRENCY_INITIAL = int(os.getenv("RPC_CONCURRENCY_INITIAL", "16"))
+_CONCURRENCY_MIN = int(os.getenv("RPC_CONCURRENCY_MIN", "1"))
+_CONCURRENCY_MAX = int(os.getenv("RPC_CONCURRENCY_MAX", "128"))
+
+
+class SingleFlight:
+    """Collapse identical concurrent operations onto one shared task.
+
+    The first caller for a key starts the operation; everyone arriving
+    while it is still running awaits the same task and receives the same
+    result — or the same exception. The entry is dropped as soon as the
+    task settles, so this is deduplication, not caching: a call issued
+    after completion goes to the node again.
+
+    The shared task is shielded from its callers, so one caller timing
+    out or being cancelled does not cancel the read for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def run(self, key: Hashable, op: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.hits += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(op())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._settle(k, t))
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so an all-callers-cancelled task doesn't
+        # log "exception was never retrieved"; callers still re-raise it.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": len(self._inflight),
+        }
+
+
+# One dedup table per process, shared by every transport ``get_client``
+# hands out. Key = (JSON-RPC method, canonical params), which for
+# ``starknet_call`` is exactly (contract, selector, calldata, block).
+_single_flight = SingleFlight()
+
+
+class BlockCallCache:
+    """LRU of ``starknet_call`` results pinned to an explicit block number.
+
+    A call against block ``N`` can never change its answer, so inside a
+    :func:`read_snapshot` every repeated read — the same popular staker
+    rendered for hundreds of users — is a dict lookup. Calls against a
+    tag (``latest`` / ``pre_confirmed``) are never cached.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(method_name: str, params: Any) -> Hashable | None:
+        """``(block, to, selector, calldata)`` for pinned calls, else ``None``."""
+        if method_name != "call" or not isinstance(params, dict):
+            return None
+        block_id = params.get("block_id")
+        if not isinstance(block_id, dict) or "block_number" not in block_id:
+            return None
+        request = params.get("request") or {}
+        return (
+            int(block_id["block_number"]),
+            request.get("contract_address"),
+            request.get("entry_point_selector"),
+            tuple(request.get("calldata") or ()),
+        )
+
+    def get(self, key: Hashable) -> Any | None:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+_block_cache = BlockCallCache(_BLOCK_CACHE_SIZE)
+
+
+def _is_overload(exc: BaseException) -> bool:
+    """429 or a timeout: the node is telling us to send less."""
+    if isinstance(exc, ClientError):
+        return str(exc.code) == "429"
+    return isinstance(exc, asyncio.TimeoutError)
+
+
+class _AimdEndpoint:
+    def __init__(self, initial: int) -> None:
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.latencies: deque[float] = deque(maxlen=50)
+        self.last_decrease = float("-inf")
+        self.decreases = 0
+
+
+class AimdLimiter:
+    """Adaptive cap on in-flight HTTP requests, one cap per endpoint.
+
+    ``data.models.semaphore`` bounds *users*, but each user fans out an
+    unbounded ``gather`` of reads, so the node can see hundreds of
+    concurrent requests and answer with 429s that ``with_retry`` then
+    repeats. This limiter sits under every HTTP request of the transport:
+
+    * **additive increase** — each success whose latency stays within
+      ``latency_tolerance`` × the recent minimum adds ``1/limit``, i.e.
+      about +1 per round-trip's worth of requests;
+    * **multiplicative decrease** — a 429 or a timeout multiplies the limit
+      by ``backoff``. Only requests started after the previous decrease can
+      cut again, so one burst of 429s halves the limit once, not N times.
+
+    Requests over the limit wait in FIFO order; ``stats()`` exposes the
+    current limit, in-flight count and queue depth per endpoint.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.initial = min(self.max_limit, max(self.min_limit, int(initial)))
+        self.backoff = float(backoff)
+        self.latency_tolerance = float(latency_tolerance)
+        self._clock = clock
+        self._endpoints: dict[str, _AimdEndpoint] = {}
+
+    def _endpoint(self, url: str) -> _AimdEndpoint:
+        ep = self._endpoints.get(url)
+        if ep is None:
+            ep = self._endpoints[url] = _AimdEndpoint(self.initial)
+        return ep
+
+    def limit(self, url: str) -> int:
+        return int(self._endpoint(url).limit)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one in-flight slot of ``url`` for the duration of a request."""
+        ep = self._endpoint(url)
+        await self._acquire(ep)
+        started = self._clock()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self._release(ep)
+            raise
+        except BaseException as exc:
+            if _is_overload(exc):
+                self._on_overload(ep, started)
+            self._release(ep)
+            raise
+        self._on_success(ep, self._clock() - started)
+        self._release(ep)
+
+    async def _acquire(self, ep: _AimdEndpoint) -> None:
+        if ep.in_flight < int(ep.limit) and not ep.waiters:
+            ep.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        ep.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we were cancelled: pass it on.
+                self._release(ep)
+            elif waiter in ep.waiters:
+                ep.waiters.remove(waiter)
+            raise
+
+    def _release(self, ep: _AimdEndpoint) -> None:
+        ep.in_flight -= 1
+        while ep.waiters and ep.in_flight < int(ep.limit):
+            waiter = ep.waiters.popleft()
+            if waiter.done():
+                continue
+            ep.in_flight += 1
+            waiter.set_result(None)
+
+    def _on_success(self, ep: _AimdEndpoint, latency: float) -> None:
+        ep.latencies.append(latency)
+        if latency > self.latency_tolerance * min(ep.latencies):
+            return  # queueing at the node: hold the limit where it is
+        ep.limit = min(self.max_limit, ep.limit + 1.0 / ep.limit)
+
+    def _on_overload(self, ep: _AimdEndpoint, started: float) -> None:
+        if started < ep.last_decrease:
+            return
+        ep.limit = max(self.min_limit, ep.limit * self.backoff)
+        ep.last_decrease = self._clock()
+        ep.decreases += 1
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            url: {
+                "limit": int(ep.limit),
+                "in_flight": ep.in_flight,
+                "queued": len(ep.waiters),
+                "decreases": ep.decreases,
+            }
+            for url, ep in self._endpoints.items()
+        }
+
+
+_limiter = AimdLimiter(
+    initial=_CONCURRENCY_INITIAL,
+    min_limit=_CONCURRENCY_MIN,
+    max_limit=_CONCURRENCY_MAX,
+)
+
+_endpoint_pool: RpcEndpointPool | None = (
+    RpcEndpointPool(
+        STARKNET_RPC_URLS,
+        hedge=_HEDGE,
+        failure_threshold=_BREAKER_FAILURES,
+        cooldown_seconds=_BREAKER_COOLDOWN_S,
+    )
+    if len(STARKNET_RPC_URLS) > 1
+    else None
+)
+
 
 @lru_cache(maxsize=1)
 def get_client() -> FullNodeClient:
@@ -33,8 +326,56 @@ def get_client() -> FullNodeClient:
     Read-only calls do not need an Account, despite what the legacy code
     implied; an Account was only required because starknet-py 0.24 refuses
     to build a Contract without a provider that has a chain id.
+
+    The client's transport is swapped for :class:`BatchingRpcHttpClient`
+    so concurrent reads issued within a few milliseconds of each other
+    share one HTTP round-trip, and identical in-flight reads are collapsed
+    onto one request by :class:`SingleFlight`. With several endpoints
+    configured, every HTTP request goes through :class:`RpcEndpointPool`.
+    Each endpoint's in-flight requests are capped by :class:`AimdLimiter`.
+    """
+    client = FullNodeClient(node_url=STARKNET_RPC_URL)
+    client._client = BatchingRpcHttpClient(
+        url=STARKNET_RPC_URL,
+        window_seconds=_BATCH_WINDOW_MS / 1000,
+        max_batch_size=_BATCH_MAX_SIZE,
+        single_flight=_single_flight,
+        block_cache=_block_cache,
+        pool=_endpoint_pool,
+        limiter=_limiter,
+    )
+    return client
+
+
+def batch_stats() -> dict[str, float]:
+    """Batching counters of the shared client (calls, batches, fallbacks)."""
+    transport = getattr(get_client(), "_client", None)
+    stats = getattr(transport, "stats", None)
+    return stats.as_dict() if stats is not None else {}
+
+
+def single_flight_stats() -> dict[str, int]:
+    """Hit / miss counters of the shared single-flight table.
+
+    ``hits`` is the number of RPC requests that never left the process
+    because an identical one was already in flight.
     """
-    return FullNodeClient(node_url=STARKNET_RPC_URL)
+    return _single_flight.stats()
+
+
+def block_cache_stats() -> dict[str, int]:
+    """Hit / miss / size counters of the block-keyed call cache."""
+    return _block_cache.stats()
+
+
+def concurrency_stats() -> dict[str, dict[str, int]]:
+    """Per-endpoint AIMD limit, in-flight requests and queue depth."""
+    return _limiter.stats()
+
+
+def endpoint_pool_stats() -> dict[str, Any]:
+    """Per-endpoint p50/p95, error rate and breaker state (``{}`` if unpooled)."""
+    return _endpoint_pool.stats() if _endpoint_pool is not None else {}
 
 
 async def with_retry(
@@ -102,3 +443,92 @@ def is_domain_revert(exc: BaseException) -> bool:
         msg = str(exc).lower()
         return any(marker in msg for marker in _DOMAIN_REVERT_MARKERS)
     return False
+
+
+# ---------------------------------------------------------------------------
+# Read snapshots (block-pinned reads)
+# ---------------------------------------------------------------------------
+
+
+class ReadSnapshot:
+    """One consistent view of the chain for a cycle, digest or API request.
+
+    The head block is resolved lazily — on the first read that asks for
+    it — and then shared by every read in the snapshot, including the
+    concurrent ones spawned through ``asyncio.gather``. A snapshot that
+    never issues a read (tests with stubbed services, empty tracking
+    lists) costs nothing.
+    """
+
+    def __init__(self, block_number: int | None = None) -> None:
+        self._task: asyncio.Task | None = None
+        self._pinned = block_number
+
+    async def block_number(self) -> int | None:
+        """The pinned block, or ``None`` when the head could not be read."""
+        if self._pinned is not None:
+            return self._pinned
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._resolve())
+        return await asyncio.shield(self._task)
+
+    @staticmethod
+    async def _resolve() -> int | None:
+        client = get_client()
+        try:
+            block = await with_retry(
+                client.get_block_number, description="get_block_number() [snapshot]"
+            )
+        except Exception as exc:  # noqa: BLE001
+            # Degrade to unpinned reads rather than failing the request.
+            logger.warning(f"read snapshot: head block unavailable, reads unpinned: {exc}")
+            return None
+        return int(block)
+
+
+_snapshot: ContextVar[ReadSnapshot | None] = ContextVar("read_snapshot", default=None)
+
+
+@contextmanager
+def read_snapshot(block_number: int | None = None) -> Iterator[ReadSnapshot]:
+    """Pin every staking / pool / attestation / ERC-20 read to one block.
+
+    Usage::
+
+        with read_snapshot():
+            entries = await fetch_tracking_entries(doc)
+
+    ``block_number`` pins to a known block (e.g. the head a
+    :mod:`services.head_tracker` event announced) instead of resolving
+    the head on first read. Nested snapshots reuse the outer one, so a
+    cycle that opens a snapshot and then calls ``get_validator_info``
+    (which opens its own) still resolves the head exactly once.
+    """
+    current = _snapshot.get()
+    if current is not None:
+        yield current
+        return
+    snap = ReadSnapshot(block_number)
+    token = _snapshot.set(snap)
+    try:
+        yield snap
+    finally:
+        _snapshot.reset(token)
+
+
+def current_snapshot() -> ReadSnapshot | None:
+    return _snapshot.get()
+
+
+async def snapshot_block_kwargs() -> dict[str, int]:
+    """``block_number=`` kwargs for the active snapshot, ``{}`` outside one.
+
+    Spread into ``Contract.functions[...].call(...)`` or
+    ``client.call_contract(...)``; an empty dict keeps starknet-py's own
+    default block tag.
+    """
+    snap = _snapshot.get()
+    if snap is None:
+        return {}
+    block = await snap.block_number()
+    return {} if block is None else {"block_number": block}
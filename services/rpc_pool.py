@@ -0,0 +1,326 @@
+"""Multi-endpoint routing for the shared RPC transport.
+
+With a single ``STARKNET_RPC_URL`` one slow or flapping provider stalls
+both the bot and the notifier. :class:`RpcEndpointPool` spreads requests
+over every URL in ``STARKNET_RPC_URLS`` and keeps, per endpoint, a
+rolling window of latencies and outcomes:
+
+* **Routing** — each request goes to the healthy endpoint with the lowest
+  p50 (inflated by its recent error rate).
+* **Hedging** — once the primary has been slower than its own p95, the
+  same payload is sent to the next endpoint; the first answer wins and
+  the loser is cancelled. Reads are idempotent, so a duplicate is safe.
+* **Failover** — a transport failure (connection error, timeout, 429,
+  5xx) moves the request on to the next endpoint instead of surfacing.
+* **Circuit breaker** — ``failure_threshold`` consecutive failures eject
+  an endpoint for ``cooldown_seconds``; after that one live request is let
+  through as a probe, and its outcome closes or re-opens the circuit.
+
+The pool only decides *where* a payload goes; the HTTP request itself is
+the ``send(url, payload)`` callable supplied by the transport
+(:meth:`services.rpc_batch.BatchingRpcHttpClient._post`). The transport
+also hands over its per-endpoint ``limiter``: the pool takes the slot
+before an attempt's latency clock and the hedge timer start, so time
+queued on our own limiter is never blamed on the node.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import nullcontext
+from statistics import median
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+from loguru import logger
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.http_client import ServerError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Send = Callable[[str, Any], Awaitable[Any]]
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    """True for errors that say "this node is unwell", not "bad request".
+
+    A contract revert or a malformed call fails identically on every
+    node, so it must neither trip the breaker nor be retried elsewhere.
+    """
+    if isinstance(exc, ClientError):
+        code = str(exc.code)
+        return code == "429" or (code.isdigit() and int(code) >= 500)
+    return isinstance(
+        exc, (aiohttp.ClientError, asyncio.TimeoutError, OSError, ServerError, ValueError)
+    )
+
+
+class EndpointHealth:
+    """Rolling latency / error window plus breaker state for one URL."""
+
+    def __init__(self, url: str, *, window: int = 200) -> None:
+        self.url = url
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+        self.hedges_won = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[idx]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return median(self.latencies) if self.latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def score(self) -> float:
+        """Lower is better. Unmeasured endpoints score 0 so they get tried.
+
+        The additive error term keeps a node that has only ever failed
+        (no latency samples) behind the ones that answer.
+        """
+        p50 = self.p50 or 0.0
+        return p50 * (1.0 + 4.0 * self.error_rate) + self.error_rate
+
+    def as_dict(self) -> dict[str, Any]:
+        def _ms(v: Optional[float]) -> Optional[float]:
+            return None if v is None else round(v * 1000, 1)
+
+        return {
+            "url": self.url,
+            "state": self.state,
+            "p50_ms": _ms(self.p50),
+            "p95_ms": _ms(self.p95),
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class RpcEndpointPool:
+    """Latency-aware, hedged, circuit-broken routing over several RPC URLs.
+
+    :param hedge: send a duplicate to the runner-up when the primary
+        exceeds its p95. Needs at least two endpoints.
+    :param min_samples: latency samples an endpoint needs before its p95
+        is trusted as a hedge trigger.
+    :param hedge_min_delay: floor for the hedge trigger (seconds), so a
+        very fast node doesn't get every request duplicated on jitter.
+    :param clock: injectable monotonic clock (tests).
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        hedge: bool = True,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        min_samples: int = 20,
+        hedge_min_delay: float = 0.05,
+        window: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        unique = list(dict.fromkeys(u for u in urls if u))
+        if not unique:
+            raise ValueError("RpcEndpointPool needs at least one endpoint URL")
+        self.endpoints = [EndpointHealth(u, window=window) for u in unique]
+        self.hedge = hedge and len(self.endpoints) > 1
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = float(cooldown_seconds)
+        self.min_samples = max(1, int(min_samples))
+        self.hedge_min_delay = float(hedge_min_delay)
+        self._clock = clock
+        self.hedges = 0
+        self.failovers = 0
+
+    # -- routing -----------------------------------------------------------
+
+    def ranked(self) -> list[EndpointHealth]:
+        """Endpoints eligible right now, best first.
+
+        A half-open endpoint whose cooldown has elapsed is put in front so
+        the probe happens on live traffic (failover covers a failed
+        probe). If every circuit is open, the one ejected longest ago is
+        tried anyway — better a likely failure than no attempt at all.
+        """
+        now = self._clock()
+        probes: list[EndpointHealth] = []
+        healthy: list[EndpointHealth] = []
+        for ep in self.endpoints:
+            if ep.state == CLOSED:
+                healthy.append(ep)
+            elif not ep.probing and now - ep.opened_at >= self.cooldown_seconds:
+                probes.append(ep)
+        healthy.sort(key=EndpointHealth.score)
+        ranked = probes[:1] + healthy
+        if not ranked:
+            ranked = [min(self.endpoints, key=lambda e: e.opened_at)]
+        return ranked
+
+    def _hedge_delay(self, ep: EndpointHealth) -> Optional[float]:
+        if not self.hedge or len(ep.latencies) < self.min_samples:
+            return None
+        return max(self.hedge_min_delay, ep.p95 or 0.0)
+
+    async def post(self, payload: Any, send: Send, *, limiter: Any = None) -> Any:
+        """Send ``payload`` through the best endpoint(s) and return the reply.
+
+        ``limiter`` (an object whose ``slot(url)`` async context manager
+        bounds in-flight requests per endpoint) is held around each
+        attempt's ``send``.
+        """
+        primary, *queue = self.ranked()
+        admitted = asyncio.Event()
+        tasks: dict[asyncio.Task, EndpointHealth] = {
+            asyncio.ensure_future(
+                self._attempt(primary, payload, send, limiter=limiter, admitted=admitted)
+            ): primary
+        }
+        delay = self._hedge_delay(primary)
+        hedged = False
+        last_exc: BaseException | None = None
+        try:
+            if limiter is not None and delay is not None and queue:
+                # The hedge clock starts once the primary holds its slot: a
+                # wait on our own limiter says nothing about the node.
+                waiter = asyncio.ensure_future(admitted.wait())
+                try:
+                    await asyncio.wait([waiter, *tasks], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    waiter.cancel()
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=delay if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Primary is past its p95: hedge once to the runner-up.
+                    delay = None
+                    hedged = True
+                    ep = queue.pop(0)
+                    self.hedges += 1
+                    tasks[asyncio.ensure_future(
+                        self._attempt(ep, payload, send, limiter=limiter)
+                    )] = ep
+                    continue
+                for task in done:
+                    ep = tasks.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        if hedged and ep is not primary:
+                            ep.hedges_won += 1
+                        return task.result()
+                    if not is_endpoint_failure(exc):
+                        raise exc
+                    last_exc = exc
+                if not tasks and queue:
+                    self.failovers += 1
+                    ep = queue.pop(0)
+                    tasks[asyncio.ensure_future(
+                        self._attempt(ep, payload, send, limiter=limiter)
+                    )] = ep
+        finally:
+            for task in tasks:
+                task.cancel()
+        assert last_exc is not None
+        raise last_exc
+
+    async def _attempt(
+        self,
+        ep: EndpointHealth,
+        payload: Any,
+        send: Send,
+        *,
+        limiter: Any = None,
+        admitted: asyncio.Event | None = None,
+    ) -> Any:
+        probe = ep.state != CLOSED
+        if probe:
+            ep.state = HALF_OPEN
+            ep.probing = True
+        try:
+            async with limiter.slot(ep.url) if limiter is not None else nullcontext():
+                if admitted is not None:
+                    admitted.set()
+                return await self._send(ep, payload, send)
+        except asyncio.CancelledError:
+            if probe:
+                ep.probing = False
+            raise
+
+    async def _send(self, ep: EndpointHealth, payload: Any, send: Send) -> Any:
+        # Timed from here, inside the limiter slot: the request itself only.
+        started = self._clock()
+        ep.requests += 1
+        try:
+            result = await send(ep.url, payload)
+        except asyncio.CancelledError:
+            # Lost a hedge race: the elapsed time is a lower bound on its
+            # latency — recording it keeps a slow node ranked low.
+            ep.latencies.append(self._clock() - started)
+            raise
+        except BaseException as exc:
+            if is_endpoint_failure(exc):
+                self._record_failure(ep, exc)
+            else:
+                self._record_success(ep, self._clock() - started)
+            raise
+        self._record_success(ep, self._clock() - started)
+        return result
+
+    # -- breaker -----------------------------------------------------------
+
+    def _record_success(self, ep: EndpointHealth, latency: float) -> None:
+        ep.latencies.append(latency)
+        ep.outcomes.append(True)
+        ep.consecutive_failures = 0
+        ep.probing = False
+        if ep.state != CLOSED:
+            logger.info(f"rpc pool: {ep.url} recovered, circuit closed")
+            ep.state = CLOSED
+
+    def _record_failure(self, ep: EndpointHealth, exc: BaseException) -> None:
+        ep.outcomes.append(False)
+        ep.failures += 1
+        ep.consecutive_failures += 1
+        was_probe = ep.probing
+        ep.probing = False
+        if was_probe or ep.consecutive_failures >= self.failure_threshold:
+            if ep.state == CLOSED:
+                logger.warning(
+                    f"rpc pool: ejecting {ep.url} after "
+                    f"{ep.consecutive_failures} failures ({type(exc).__name__}: {exc})"
+                )
+            ep.state = OPEN
+            ep.opened_at = self._clock()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "endpoints": [ep.as_dict() for ep in self.endpoints],
+        }
@@ -0,0 +1,198 @@
+"""Stable per-user slots and a sharded scheduler built on them.
+
+The reward notifier used to check every user at xx:00 UTC: one burst of
+RPC reads and Telegram sends per hour, idle the rest of it, and an
+overrun pushed the whole next cycle late. :class:`ShardedScheduler`
+spreads a population over its interval instead:
+
+  * every key (user id) gets a stable offset inside the interval, from a
+    hash of the key — the same minute every hour, across restarts and
+    processes (``hash()`` is salted per process, so blake2b it is);
+  * the interval is cut into ``shards`` ticks; each tick hands the keys
+    whose slot passed since the previous tick to ``handle`` as one small
+    batch;
+  * a tick that runs late (the previous shard overran, the loop was
+    blocked) takes everything due since the last one — nobody is
+    skipped or checked twice; a backlog longer than a whole interval is
+    cut to one interval.
+
+The roster (``load``) is re-read once per interval, at the first tick of
+each round; ``handle`` gets bare keys and loads fresh rows itself.
+
+Slot drift (how long after its slot a key's check started) and shard
+latency (how long ``handle`` took) are kept over a sliding window and
+reported by :meth:`ShardedScheduler.stats`.
+
+Used by :mod:`tasks.strk_notification` (hourly rewards) and the
+wall-clock mode of :mod:`tasks.attestation_alerts`.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import time
+from collections import deque
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+from loguru import logger
+
+K = TypeVar("K", bound=Hashable)
+
+# Drift / latency samples kept for the percentiles in ``stats()``.
+_SAMPLE_WINDOW = 4096
+
+
+def slot_offset(key: Hashable, interval: float, *, salt: str = "") -> float:
+    """Stable offset of ``key`` in ``[0, interval)``, uniform over keys."""
+    digest = hashlib.blake2b(f"{salt}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64 * interval
+
+
+def _percentile(samples: Iterable[float], q: float) -> float | None:
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+
+class ShardedScheduler(Generic[K]):
+    """Run ``handle`` over a roster of keys, each at its own slot per interval."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        interval: float,
+        shards: int,
+        load: Callable[[], Awaitable[Iterable[K]]],
+        handle: Callable[[list[K]], Awaitable[None]],
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if interval <= 0 or shards < 1:
+            raise ValueError("interval must be positive and shards at least 1")
+        self.name = name
+        self.interval = float(interval)
+        self.shards = shards
+        self.tick = self.interval / shards
+        self._load = load
+        self._handle = handle
+        self._clock = clock
+        self._sleep = sleep
+        self._offsets: list[float] = []  # sorted
+        self._keys: list[K] = []  # aligned with _offsets
+        self._round: int | None = None
+        self._cursor: float | None = None
+        self._drift: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._latency: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self.shards_run = 0
+        self.keys_checked = 0
+        self.failures = 0
+        self.skipped_s = 0.0
+
+    def slot(self, key: K) -> float:
+        # Salted with the scheduler's name: two schedules over the same
+        # users don't pile onto the same second.
+        return slot_offset(key, self.interval, salt=self.name)
+
+    def set_roster(self, keys: Iterable[K]) -> None:
+        pairs = sorted(((self.slot(k), k) for k in set(keys)), key=lambda p: p[0])
+        self._offsets = [offset for offset, _ in pairs]
+        self._keys = [key for _, key in pairs]
+
+    @property
+    def roster_size(self) -> int:
+        return len(self._keys)
+
+    def due(self, start: float, end: float) -> list[tuple[K, float]]:
+        """Keys whose slot falls in ``[start, end)`` with that slot's time.
+
+        ``end - start`` must not exceed one interval.
+        """
+        span = end - start
+        if span <= 0 or not self._keys:
+            return []
+        a = start % self.interval
+        b = a + span
+        ranges = [(a, min(b, self.interval))]
+        if b > self.interval:
+            ranges.append((0.0, b - self.interval))
+        out: list[tuple[K, float]] = []
+        for lo, hi in ranges:
+            i = bisect.bisect_left(self._offsets, lo)
+            j = bisect.bisect_left(self._offsets, hi)
+            for offset, key in zip(self._offsets[i:j], self._keys[i:j], strict=True):
+                out.append((key, start + (offset - a) % self.interval))
+        return out
+
+    async def _refresh_roster(self, now: float) -> None:
+        current = int(now // self.interval)
+        if current == self._round:
+            return
+        if self._round is not None:
+            logger.info(f"{self.name}: schedule {self.stats()}")
+        try:
+            self.set_roster(await self._load())
+        except Exception as exc:  # noqa: BLE001
+            # Keep the previous round's roster; the next tick retries.
+            logger.warning(f"{self.name}: roster load failed: {exc!r}")
+            return
+        self._round = current
+
+    async def run_once(self) -> int:
+        """Handle every key due since the previous call; returns how many."""
+        now = self._clock()
+        if self._cursor is None:
+            # Start-up: first checks at each key's next slot.
+            self._cursor = now
+        start = self._cursor
+        if now - start > self.interval:
+            self.skipped_s += now - start - self.interval
+            logger.warning(
+                f"{self.name}: {now - start:.0f}s behind, catching up one interval only"
+            )
+            start = now - self.interval
+        await self._refresh_roster(now)
+        due = self.due(start, now)
+        self._cursor = now
+        if not due:
+            return 0
+
+        began = self._clock()
+        # A catch-up batch can outgrow the window: sample it evenly.
+        for _key, at in due[:: max(1, len(due) // _SAMPLE_WINDOW)]:
+            self._drift.append(began - at)
+        try:
+            await self._handle([key for key, _ in due])
+        except Exception as exc:  # noqa: BLE001
+            self.failures += 1
+            logger.error(f"{self.name}: shard of {len(due)} failed: {exc!r}")
+        self._latency.append(self._clock() - began)
+        self.shards_run += 1
+        self.keys_checked += len(due)
+        return len(due)
+
+    async def run_forever(self) -> None:
+        logger.info(
+            f"{self.name}: sharded schedule, {self.shards} shards of "
+            f"{self.tick:.1f}s over {self.interval:.0f}s"
+        )
+        while True:
+            await self.run_once()
+            now = self._clock()
+            await self._sleep((now // self.tick + 1) * self.tick - now)
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            "roster": self.roster_size,
+            "shards_run": self.shards_run,
+            "checked": self.keys_checked,
+            "failures": self.failures,
+            "skipped_s": round(self.skipped_s, 1),
+            "drift_p50_s": _percentile(self._drift, 0.5),
+            "drift_p95_s": _percentile(self._drift, 0.95),
+            "drift_max_s": round(max(self._drift), 3) if self._drift else None,
+            "latency_p50_s": _percentile(self._latency, 0.5),
+            "latency_p95_s": _percentile(self._latency, 0.95),
+        }
@@ -0,0 +1,194 @@
+"""Process-wide stale-while-revalidate store for on-chain DTOs.
+
+A popular staker is tracked by hundreds of users, and every consumer —
+the digest notifier, the card refresh callback, the API ``/entries`` /
+``/dashboard`` / ``/yield-data`` endpoints, the attestation watcher —
+used to rebuild its :class:`ValidatorInfo` once per user. This module
+keeps one snapshot per *address* instead:
+
+  * ``("validator", staker)``             → :class:`ValidatorInfo`
+  * ``("delegation", staker, delegator)`` → :class:`DelegatorMultiPositions`
+  * ``("attestation", staker, epoch)``    → :class:`AttestationStatus`
+
+Each read names its consumer, and the consumer's freshness budget
+(:data:`FRESHNESS_BUDGETS`) decides what "fresh" means: the attestation
+watcher accepts a few seconds, the digest a minute. A snapshot past the
+budget but within the consumer's stale allowance (``SNAPSHOT_STALE_S``;
+none for alerts) is served as-is while exactly one background refresh
+runs; older or missing snapshots are loaded in the foreground, with
+concurrent callers joining the same load
+(:class:`services.rpc_client.SingleFlight`). RPC load therefore scales
+with unique addresses, not users × entries.
+
+Callers can sharpen the age rule with a ``validate`` hook — the event
+follower (:mod:`services.event_follower`) proves a snapshot current or
+known-changed regardless of its age.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+from loguru import logger
+
+from services.rpc_client import SingleFlight
+
+T = TypeVar("T")
+
+_STALE_S = float(os.getenv("SNAPSHOT_STALE_S", "300"))
+_MAX_ENTRIES = int(os.getenv("SNAPSHOT_MAX_ENTRIES", "20000"))
+
+
+@dataclass(frozen=True)
+class Budget:
+    fresh_s: float  # served without a refresh
+    stale_s: float  # further seconds served while one refresh runs
+
+
+FRESHNESS_BUDGETS: dict[str, Budget] = {
+    # Alerts never take a stale answer: the watcher's ticks are further
+    # apart than its budget, so serve-then-refresh would always lag a tick.
+    "attestation": Budget(float(os.getenv("SNAPSHOT_FRESH_ATTESTATION_S", "5")), 0.0),
+    "card": Budget(float(os.getenv("SNAPSHOT_FRESH_CARD_S", "15")), _STALE_S),
+    "api": Budget(float(os.getenv("SNAPSHOT_FRESH_API_S", "30")), _STALE_S),
+    "digest": Budget(float(os.getenv("SNAPSHOT_FRESH_DIGEST_S", "60")), _STALE_S),
+}
+
+
+def freshness_budget(consumer: str) -> Budget:
+    try:
+        return FRESHNESS_BUDGETS[consumer]
+    except KeyError:
+        raise ValueError(f"unknown snapshot consumer: {consumer!r}") from None
+
+
+def address_part(address: str) -> str:
+    """Canonical ``0x…`` form so ``0x0AbC`` and ``0xabc`` share a snapshot."""
+    try:
+        return hex(int(address, 16))
+    except (TypeError, ValueError):
+        return (address or "").lower()
+
+
+@dataclass
+class Snapshot(Generic[T]):
+    value: T
+    fetched_at: float
+    # Opaque caller stamp taken *before* the load (e.g. the follower
+    # cursor), handed back to ``validate``.
+    stamp: Optional[int] = None
+
+
+class SnapshotStore:
+    """Keyed snapshots with per-read freshness and background revalidation."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = _MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: dict[Hashable, Snapshot] = {}
+        self._flight = SingleFlight()
+        self._background: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+
+    async def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        *,
+        consumer: str,
+        validate: Callable[[Snapshot], Optional[bool]] | None = None,
+        stamp: Callable[[], Optional[int]] | None = None,
+    ) -> T:
+        """Return the snapshot for ``key``, loading or revalidating it as needed.
+
+        ``validate(snapshot)`` may return ``True`` (known current: serve,
+        whatever its age), ``False`` (known changed: reload in the
+        foreground) or ``None`` (unknown: the consumer's budget decides).
+        ``None`` results from ``loader`` are returned but never stored.
+        """
+        budget = freshness_budget(consumer)
+        snap = self._entries.get(key)
+        if snap is not None:
+            verdict = validate(snap) if validate is not None else None
+            age = self._clock() - snap.fetched_at
+            if verdict is True or (verdict is None and age <= budget.fresh_s):
+                self.hits += 1
+                return snap.value
+            if verdict is None and age <= budget.fresh_s + budget.stale_s:
+                self.stale_hits += 1
+                self._revalidate(key, loader, stamp)
+                return snap.value
+        return await self._load(key, loader, stamp)
+
+    async def _load(self, key, loader, stamp) -> T:
+        async def _op():
+            self.loads += 1
+            mark = stamp() if stamp is not None else None
+            value = await loader()
+            if value is not None:
+                self._store(key, Snapshot(value, self._clock(), mark))
+            return value
+
+        return await self._flight.run(key, _op)
+
+    def _revalidate(self, key, loader, stamp) -> None:
+        # A fresh context: the caller's read snapshot (services.rpc_client)
+        # would otherwise pin the refresh to the block being replaced.
+        task = asyncio.get_running_loop().create_task(
+            self._load(key, loader, stamp), context=contextvars.Context()
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # The stale value keeps being served; the next read past the
+            # budget tries again.
+            logger.warning(f"snapshot refresh failed: {task.exception()!r}")
+
+    def _store(self, key: Hashable, snap: Snapshot) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            # Insertion order doubles as age order; drop the oldest tenth.
+            for old in list(self._entries)[: max(1, self.max_entries // 10)]:
+                del self._entries[old]
+        self._entries.pop(key, None)
+        self._entries[key] = snap
+
+    def peek(self, key: Hashable) -> Snapshot | None:
+        return self._entries.get(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def drain(self) -> None:
+        """Wait for in-flight background refreshes (tests, shutdown)."""
+        while self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "loads": self.loads,
+            "refreshing": len(self._background),
+        }
+
+
+# One store per process: every consumer shares it.
+snapshots = SnapshotStore()
@@ -2,21 +2,31 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from functools import lru_cache
 from typing import Any
 
 from loguru import logger
-from starknet_py.contract import Contract
 from starknet_py.net.client_errors import ClientError
 from starknet_py.serialization.errors import InvalidValueException
 
-from data.contracts import STARKNET_NETWORK, get_network_addresses, load_abi
+from data.abi_profile import load_profiled_abi
+from data.contracts import STARKNET_NETWORK, get_network_addresses
 from services.attestation_service import (
     fetch_attestation_status,
     fetch_current_block_number,
 )
-from services.rpc_client import get_client, is_domain_revert, with_retry
+from services.contract_template import ContractHandle, ContractTemplate
+from services.negative_cache import absent
+from services.raw_calls import call_view
+from services.rpc_client import (
+    get_client,
+    is_domain_revert,
+    read_snapshot,
+    snapshot_block_kwargs,
+    with_retry,
+)
 from services.staking_dto import (
     DelegatorInfo,
     DelegatorMultiPositions,
@@ -45,68 +55,59 @@ def _unwrap_seconds(value: Any) -> int:
 
 # starknet-py's ``Contract(...)`` constructor parses the entire ABI eagerly
 # (12+ seconds in our case for the staking contract's hand-written cairo
-# interface). Cache one instance per address so we pay that cost exactly
-# once per process. ``maxsize`` is generous to cover all the pools a single
-# user might track without thrashing.
+# interface). Build from the trimmed ABI profile (see ``data.abi_profile``)
+# so the parse only covers the views we call, take the parsed serializers
+# from the on-disk cache when another process already produced them, and
+# keep the single handle for the life of the process.
 @lru_cache(maxsize=1)
-def _staking_contract() -> Contract:
+def _staking_contract() -> ContractHandle:
     addrs = get_network_addresses()
-    return Contract(
-        address=int(addrs.staking_contract, 16),
-        abi=load_abi("l2_staking_contract"),
-        provider=get_client(),
+    template = ContractTemplate.cached(
+        load_profiled_abi("l2_staking_contract"), provider=get_client()
     )
+    return template.bind(addrs.staking_contract)
 
 
-_pool_cache: dict[str, Contract] = {}
-_pool_cache_lock = asyncio.Lock()
+# Every pool is an instance of the same contract class: parse its ABI and
+# build the function serializers once (``ContractTemplate``), then bind
+# addresses to it on demand. A new pool costs two attribute assignments
+# instead of a ~2-4 s re-parse, and nothing per pool is retained.
+_pool_template: ContractTemplate | None = None
+_pool_template_lock = asyncio.Lock()
 
 
-def _build_pool_contract(address_hex: str) -> Contract:
-    # ~2.3s of synchronous ABI parsing.
-    return Contract(
-        address=int(address_hex, 16),
-        abi=load_abi("l2_pool_contract"),
-        provider=get_client(),
+def _build_pool_template() -> ContractTemplate:
+    # Synchronous ABI parsing (or a cache load), paid once per process.
+    return ContractTemplate.cached(
+        load_profiled_abi("l2_pool_contract"), provider=get_client()
     )
 
 
-async def _pool_contract_async(address_hex: str) -> Contract:
-    """Cached, off-thread pool Contract factory.
+async def _pool_contract_async(address_hex: str) -> ContractHandle:
+    """Pool contract handle; the first call parses the ABI off-thread.
 
-    The starknet-py constructor parses the full ABI synchronously and takes
-    ~2 seconds per address. Running it on the event loop blocked every
-    digest (5 pools × 2s = 10s of latency *and* every other handler stalled
-    behind it). We move it to ``asyncio.to_thread`` so multiple pool builds
-    can run in parallel, and we cache by address so each pool only parses
-    once for the lifetime of the process.
+    The parse runs in ``asyncio.to_thread`` so it never blocks the event
+    loop, and under a lock so concurrent first digests share one parse.
     """
-    cached = _pool_cache.get(address_hex)
-    if cached is not None:
-        return cached
-    async with _pool_cache_lock:
-        cached = _pool_cache.get(address_hex)
-        if cached is not None:
-            return cached
-        contract = await asyncio.to_thread(_build_pool_contract, address_hex)
-        _pool_cache[address_hex] = contract
-        return contract
-
-
-def _pool_contract(address_hex: str) -> Contract:
-    """Sync accessor — only safe after the address has been warmed."""
-    cached = _pool_cache.get(address_hex)
-    if cached is not None:
-        return cached
-    contract = _build_pool_contract(address_hex)
-    _pool_cache[address_hex] = contract
-    return contract
+    global _pool_template
+    if _pool_template is None:
+        async with _pool_template_lock:
+            if _pool_template is None:
+                _pool_template = await asyncio.to_thread(_build_pool_template)
+    return _pool_template.bind(address_hex)
+
+
+def _pool_contract(address_hex: str) -> ContractHandle:
+    """Sync accessor — parses the pool ABI inline if nobody warmed it yet."""
+    global _pool_template
+    if _pool_template is None:
+        _pool_template = _build_pool_template()
+    return _pool_template.bind(address_hex)
 
 
 def warm_pool_abi() -> None:
-    """Pre-build a throwaway pool Contract so the parser hits its hot path
-    before we accept user input. Doesn't help other addresses much (each
-    address re-parses), but it does pay the very-first-parse tax up front.
+    """Parse the shared pool ABI before we accept user input, so the first
+    digest that touches a pool doesn't pay for it.
     """
     _pool_contract("0x" + "0" * 63 + "1")
 
@@ -138,14 +139,15 @@ async def fetch_staker_raw(staker_address: str) -> dict | None:
     exist. ``get_staker_info_v1`` returns ``Option<StakerInfoV1>``, so the
     ``None`` case is distinguishable from RPC failure.
     """
-    contract = _staking_contract()
+    if absent.is_absent("staker_info", staker_address):
+        return None
+    staking = get_network_addresses().staking_contract
 
     async def _call() -> dict | None:
         try:
-            (result,) = await contract.functions["get_staker_info_v1"].call(
-                int(staker_address, 16)
+            return await call_view(
+                staking, "get_staker_info_v1", int(staker_address, 16)
             )
-            return result
         except InvalidValueException:
             return None
         except ClientError as exc:
@@ -156,10 +158,13 @@ async def fetch_staker_raw(staker_address: str) -> dict | None:
             raise exc
 
     try:
-        return await with_retry(_call, description=f"get_staker_info_v1({staker_address})")
+        result = await with_retry(_call, description=f"get_staker_info_v1({staker_address})")
     except Exception as exc:  # noqa: BLE001
         logger.error(f"fetch_staker_raw failed for {staker_address}: {exc}")
         return None
+    if result is None:
+        absent.record("staker_info", staker_address)
+    return result
 
 
 async def fetch_staker_pools_raw(staker_address: str) -> dict | None:
@@ -169,14 +174,15 @@ async def fetch_staker_pools_raw(staker_address: str) -> dict | None:
     (list of ``{pool_contract, token_address, amount}``), or ``None`` if the
     staker does not exist.
     """
-    contract = _staking_contract()
+    if absent.is_absent("staker_pools", staker_address):
+        return None
+    staking = get_network_addresses().staking_contract
 
     async def _call() -> dict | None:
         try:
-            (result,) = await contract.functions["staker_pool_info"].call(
-                int(staker_address, 16)
+            return await call_view(
+                staking, "staker_pool_info", int(staker_address, 16)
             )
-            return result
         except ClientError as exc:
             # "Requested entrypoint does not exist" would mean we hit an older
             # implementation — treat it like "no data". Domain reverts (e.g.
@@ -187,20 +193,22 @@ async def fetch_staker_pools_raw(staker_address: str) -> dict | None:
             raise exc
 
     try:
-        return await with_retry(
+        result = await with_retry(
             _call, description=f"staker_pool_info({staker_address})"
         )
     except Exception as exc:  # noqa: BLE001
         logger.error(f"fetch_staker_pools_raw failed for {staker_address}: {exc}")
         return None
+    if result is None:
+        absent.record("staker_pools", staker_address)
+    return result
 
 
 async def fetch_current_epoch() -> int:
-    contract = _staking_contract()
+    staking = get_network_addresses().staking_contract
 
     async def _call() -> int:
-        (epoch,) = await contract.functions["get_current_epoch"].call()
-        return int(epoch)
+        return await call_view(staking, "get_current_epoch")
 
     return await with_retry(_call, description="get_current_epoch")
 
@@ -225,11 +233,10 @@ async def fetch_epoch_info() -> dict | None:
     call per fetch_validator_info is negligible compared to the pool /
     attestation reads that already run in parallel.
     """
-    contract = _staking_contract()
+    staking = get_network_addresses().staking_contract
 
     async def _call() -> dict:
-        (info,) = await contract.functions["get_epoch_info"].call()
-        return info
+        return await call_view(staking, "get_epoch_info")
 
     try:
         return await with_retry(_call, description="get_epoch_info")
@@ -294,7 +301,9 @@ async def fetch_active_tokens() -> list[str]:
     contract = _staking_contract()
 
     async def _call() -> list[str]:
-        (tokens,) = await contract.functions["get_active_tokens"].call()
+        (tokens,) = await contract.functions["get_active_tokens"].call(
+            **await snapshot_block_kwargs()
+        )
         return [_addr_hex(t) for t in tokens]
 
     return await with_retry(_call, description="get_active_tokens")
@@ -308,11 +317,18 @@ async def fetch_system_info() -> StakingSystemInfo:
     RPC. The two extra reads piggy-back on the same parallel gather, so
     the cost stays one round-trip.
     """
+    with read_snapshot():
+        return await _fetch_system_info()
+
+
+async def _fetch_system_info() -> StakingSystemInfo:
     addrs = get_network_addresses()
     contract = _staking_contract()
 
     async def _params() -> dict:
-        (res,) = await contract.functions["contract_parameters_v1"].call()
+        (res,) = await contract.functions["contract_parameters_v1"].call(
+            **await snapshot_block_kwargs()
+        )
         return res
 
     params, epoch, active_tokens, epoch_info, current_block = await asyncio.gather(
@@ -344,14 +360,80 @@ async def fetch_system_info() -> StakingSystemInfo:
     )
 
 
+@dataclass(frozen=True)
+class FetchProfile:
+    """Which optional sub-reads :func:`get_validator_info` runs.
+
+    The core — ``get_staker_info_v1``, ``get_staker_pool_info`` and the
+    current epoch — always runs; everything else is opt-in.
+    """
+
+    attestation: bool = False  # last epoch attested + attesting-this-epoch
+    attestation_blocks: bool = False  # + target block, window, chain head
+    operator_balance: bool = False  # operator wallet STRK balance
+    epoch_timeline: bool = False  # EpochInfo + chain head
+
+
+# Named profiles, narrowest first. Node reads per validator (token
+# metadata is served from the registry): rewards 3, attestation 5,
+# card / full 11.
+FETCH_PROFILES: dict[str, FetchProfile] = {
+    # Unclaimed rewards, stake and pools: the yield calculator, the
+    # reward digest when attestation monitoring is off.
+    "rewards": FetchProfile(),
+    # … plus the missed-epoch count: reward digests, dashboard chips.
+    "attestation": FetchProfile(attestation=True),
+    # Everything a rendered validator card shows.
+    "card": FetchProfile(
+        attestation=True, attestation_blocks=True, operator_balance=True, epoch_timeline=True
+    ),
+    # The whole DTO (``/api/v1/validators``, ``/entries``). Same reads as
+    # "card" today; kept apart so the card can shed fields independently.
+    "full": FetchProfile(
+        attestation=True, attestation_blocks=True, operator_balance=True, epoch_timeline=True
+    ),
+}
+
+
+def fetch_profile(profile: str | FetchProfile) -> FetchProfile:
+    if isinstance(profile, FetchProfile):
+        return profile
+    try:
+        return FETCH_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"unknown fetch profile: {profile!r}") from None
+
+
 async def get_validator_info(
     staker_address: str,
     *,
-    with_attestation: bool = True,
-    with_operator_balance: bool = True,
+    profile: str | FetchProfile = "full",
+    with_attestation: bool | None = None,
+    with_operator_balance: bool | None = None,
 ) -> ValidatorInfo | None:
     """Aggregate the V2 validator view (info + multi-pool + attestation +
-    operator wallet STRK balance)."""
+    operator wallet STRK balance).
+
+    ``profile`` (see :data:`FETCH_PROFILES`) picks which sub-reads run;
+    fields outside it stay ``None``. ``with_attestation=False`` /
+    ``with_operator_balance=False`` narrow it further.
+
+    Every read is pinned to one block (see :func:`read_snapshot`), so the
+    card never mixes values from two heads. Inside a caller's snapshot
+    (digest, notifier cycle) the caller's block is reused.
+    """
+    chosen = fetch_profile(profile)
+    if with_attestation is False:
+        chosen = replace(chosen, attestation=False, attestation_blocks=False)
+    if with_operator_balance is False:
+        chosen = replace(chosen, operator_balance=False)
+    with read_snapshot():
+        return await _get_validator_info(staker_address, chosen)
+
+
+async def _get_validator_info(
+    staker_address: str, profile: FetchProfile
+) -> ValidatorInfo | None:
     staker_raw, pools_raw, epoch = await asyncio.gather(
         fetch_staker_raw(staker_address),
         fetch_staker_pools_raw(staker_address),
@@ -370,10 +452,13 @@ async def get_validator_info(
         commission_opt = pools_raw.get("commission")
         if isinstance(commission_opt, int):
             commission_bps = int(commission_opt)
-        for p in pools_list:
+        # Every pool's token in one concurrent batch (usually all cached).
+        token_metas = await token_registry.get_many(
+            _addr_hex(p.get("token_address", 0)) for p in pools_list
+        )
+        for p, token_meta in zip(pools_list, token_metas, strict=True):
             token_hex = _addr_hex(p.get("token_address", 0))
             amount_raw = int(p.get("amount", 0))
-            token_meta = await token_registry.get(token_hex)
             pools.append(
                 PoolInfoDto(
                     pool_contract=_addr_hex(p.get("pool_contract", 0)),
@@ -405,26 +490,28 @@ async def get_validator_info(
     operational_hex = _addr_hex(staker_raw.get("operational_address", 0))
 
     # Attestation health + operator-wallet STRK balance + epoch timeline
-    # all run in parallel. Each is independent and any one failing is
-    # non-fatal — we just leave the corresponding field empty so the
-    # renderer falls back to the short / no-tail variant of the card.
+    # all run in parallel, each only when the profile asks for it. Each
+    # is independent and any one failing is non-fatal — we just leave the
+    # corresponding field empty so the renderer falls back to the short /
+    # no-tail variant of the card.
     from services.token_service import fetch_strk_balance  # local import: avoids cycle
 
     async def _att() -> "AttestationStatus | None":
-        if not with_attestation:
+        if not profile.attestation:
             return None
         try:
             return await fetch_attestation_status(
                 staker_address,
                 current_epoch=epoch,
                 operational_address=operational_hex,
+                with_blocks=profile.attestation_blocks,
             )
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"attestation lookup failed for {staker_address}: {exc}")
             return None
 
     async def _bal() -> "Decimal | None":
-        if not with_operator_balance or not operational_hex or operational_hex == "0x0":
+        if not profile.operator_balance or not operational_hex or operational_hex == "0x0":
             return None
         try:
             return await fetch_strk_balance(operational_hex)
@@ -436,6 +523,8 @@ async def get_validator_info(
         # EpochInfo is short and the chain head only takes one RPC. Both
         # return None on failure; ``_compute_epoch_timeline`` then yields
         # None too and the renderer drops the tail.
+        if not profile.epoch_timeline:
+            return None, None
         return await asyncio.gather(
             fetch_epoch_info(),
             fetch_current_block_number(),
@@ -471,15 +560,19 @@ async def get_validator_info(
 
 
 async def fetch_pool_member_raw(pool_address: str, member_address: str) -> dict | None:
-    """Call ``get_pool_member_info_v1`` on a pool contract."""
-    contract = await _pool_contract_async(pool_address)
+    """Call ``get_pool_member_info_v1`` on a pool contract.
+
+    Goes through the precompiled call table, so no pool ``Contract`` (and
+    no ABI parse) is needed for the address.
+    """
+    if absent.is_absent("pool_member", pool_address, member_address):
+        return None
 
     async def _call() -> dict | None:
         try:
-            (result,) = await contract.functions["get_pool_member_info_v1"].call(
-                int(member_address, 16)
+            return await call_view(
+                pool_address, "get_pool_member_info_v1", int(member_address, 16)
             )
-            return result
         except InvalidValueException:
             return None
         except ClientError as exc:
@@ -488,7 +581,7 @@ async def fetch_pool_member_raw(pool_address: str, member_address: str) -> dict
             raise exc
 
     try:
-        return await with_retry(
+        result = await with_retry(
             _call, description=f"get_pool_member_info_v1({pool_address},{member_address})"
         )
     except Exception as exc:  # noqa: BLE001
@@ -496,6 +589,9 @@ async def fetch_pool_member_raw(pool_address: str, member_address: str) -> dict
             f"fetch_pool_member_raw failed ({pool_address}/{member_address}): {exc}"
         )
         return None
+    if result is None:
+        absent.record("pool_member", pool_address, member_address, tally=False)
+    return result
 
 
 async def fetch_pool_parameters_raw(pool_address: str) -> dict | None:
@@ -503,7 +599,9 @@ async def fetch_pool_parameters_raw(pool_address: str) -> dict | None:
     contract = await _pool_contract_async(pool_address)
 
     async def _call() -> dict | None:
-        (result,) = await contract.functions["contract_parameters_v1"].call()
+        (result,) = await contract.functions["contract_parameters_v1"].call(
+            **await snapshot_block_kwargs()
+        )
         return result
 
     try:
@@ -516,21 +614,34 @@ async def fetch_pool_parameters_raw(pool_address: str) -> dict | None:
 
 
 async def get_delegator_info(
-    pool_address: str, delegator_address: str
+    pool_address: str,
+    delegator_address: str,
+    *,
+    token_address: str | None = None,
 ) -> DelegatorInfo | None:
-    """Compose the delegator view, resolving the pool's token decimals."""
-    member_raw, pool_params = await asyncio.gather(
-        fetch_pool_member_raw(pool_address, delegator_address),
-        fetch_pool_parameters_raw(pool_address),
-    )
+    """Compose the delegator view, resolving the pool's token decimals.
+
+    Callers that already know the pool's token (``get_staker_pool_info``
+    lists it per pool) pass ``token_address`` and skip the
+    ``contract_parameters_v1`` read.
+    """
+    if token_address is None:
+        member_raw, pool_params = await asyncio.gather(
+            fetch_pool_member_raw(pool_address, delegator_address),
+            fetch_pool_parameters_raw(pool_address),
+        )
+        if isinstance(pool_params, dict) and pool_params.get("token_address"):
+            token_address = pool_params["token_address"]
+    else:
+        member_raw = await fetch_pool_member_raw(pool_address, delegator_address)
     if member_raw is None:
         return None
 
     token_hex: str | None = None
     decimals = 18  # STRK fallback
     symbol: str | None = None
-    if isinstance(pool_params, dict) and pool_params.get("token_address"):
-        token_hex = _addr_hex(pool_params["token_address"])
+    if token_address:
+        token_hex = _addr_hex(token_address)
         try:
             tok = await token_registry.get(token_hex)
             decimals, symbol = tok.decimals, tok.symbol
@@ -574,6 +685,13 @@ async def get_delegator_positions(
     multiple token pools (STRK + BTC wrappers). Asking the user for a
     specific pool address was a V1-era constraint.
     """
+    with read_snapshot():
+        return await _get_delegator_positions(staker_address, delegator_address)
+
+
+async def _get_delegator_positions(
+    staker_address: str, delegator_address: str
+) -> DelegatorMultiPositions:
     pools_raw = await fetch_staker_pools_raw(staker_address)
     if not pools_raw or not isinstance(pools_raw, dict):
         return DelegatorMultiPositions(
@@ -582,16 +700,25 @@ async def get_delegator_positions(
             positions=[],
         )
 
-    pool_contracts: list[str] = []
+    pools: list[tuple[str, str | None]] = []
     for p in pools_raw.get("pools") or []:
-        pool_contracts.append(_addr_hex(p.get("pool_contract", 0)))
+        token = p.get("token_address")
+        pools.append(
+            (_addr_hex(p.get("pool_contract", 0)), _addr_hex(token) if token else None)
+        )
 
-    # Probe every pool in parallel; non-members get dropped.
-    async def _probe(pool_addr: str) -> DelegatorInfo | None:
-        return await get_delegator_info(pool_addr, delegator_address)
+    # Probe every pool in parallel; non-members get dropped. The pool's
+    # token comes from the listing above, so each probe is one read.
+    async def _probe(pool_addr: str, token_hex: str | None) -> DelegatorInfo | None:
+        return await get_delegator_info(
+            pool_addr, delegator_address, token_address=token_hex
+        )
 
-    results = await asyncio.gather(*(_probe(p) for p in pool_contracts))
+    results = await asyncio.gather(*(_probe(p, t) for p, t in pools))
     positions = [r for r in results if r is not None]
+    if not positions:
+        # Not a member of any of the staker's pools: a dead delegation.
+        absent.tally(delegator_address)
 
     return DelegatorMultiPositions(
         delegator_address=_addr_hex(delegator_address),
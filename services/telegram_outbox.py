@@ -0,0 +1,275 @@
+"""One Telegram outbox per process: pooled connections, paced sends.
+
+The background workers talk to the Bot API directly (they run in their
+own processes and can't share aiogram's ``Bot`` from ``main``). Each
+module used to carry its own ``send_message`` that opened a fresh
+``aiohttp.ClientSession`` per message, fired as fast as its caller
+looped, and dropped the message on a 429. A 5k-user alert burst then
+hit Telegram's flood limits and lost DMs.
+
+:class:`TelegramOutbox` is the single path now:
+
+  * one ``ClientSession`` with a bounded connection pool, kept open;
+  * a global pacer — ``TELEGRAM_OUTBOX_RATE`` messages/s (Telegram
+    allows ~30/s per bot) with ``TELEGRAM_OUTBOX_BURST`` back-to-back;
+  * per-chat pacing (``TELEGRAM_OUTBOX_CHAT_INTERVAL_S`` between two
+    messages to the same chat) and strict per-chat order, so a chunked
+    digest arrives in sequence;
+  * a 429 pauses the whole outbox for its ``retry_after``, then the
+    message is retried; network errors and 5xx retry with exponential
+    backoff (``TELEGRAM_OUTBOX_MAX_ATTEMPTS`` attempts in all); other 4xx
+    (blocked bot, chat not found) are final;
+  * delivery metrics in :func:`outbox_stats`.
+
+Budgets are per process: the notifier and the request worker each get
+their own. Lower ``TELEGRAM_OUTBOX_RATE`` if both burst at once.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable
+
+import aiohttp
+
+from data.tg_bot import BOT_TOKEN
+from utils.logger import logger
+
+TELEGRAM_API_BASE = "https://api.telegram.org/bot"
+
+_RATE = float(os.getenv("TELEGRAM_OUTBOX_RATE", "30"))
+_BURST = int(os.getenv("TELEGRAM_OUTBOX_BURST", "30"))
+_CHAT_INTERVAL_S = float(os.getenv("TELEGRAM_OUTBOX_CHAT_INTERVAL_S", "1.0"))
+_MAX_ATTEMPTS = int(os.getenv("TELEGRAM_OUTBOX_MAX_ATTEMPTS", "5"))
+_CONNECTIONS = int(os.getenv("TELEGRAM_OUTBOX_CONNECTIONS", "32"))
+_TIMEOUT_S = float(os.getenv("TELEGRAM_OUTBOX_TIMEOUT_S", "30"))
+_BACKOFF_MAX_S = 30.0
+_SAMPLE_WINDOW = 4096
+
+# (status, decoded JSON body or None)
+PostFn = Callable[[str, dict], Awaitable[tuple[int, Any]]]
+
+
+class Pacer:
+    """Generic cell rate: ``rate`` per second, ``burst`` of them back-to-back.
+
+    :meth:`reserve` books the next slot and returns how long the caller
+    must wait for it; reservations are served in call order.
+    """
+
+    def __init__(
+        self, rate: float, burst: int = 1, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.interval = 1.0 / rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tat = 0.0  # theoretical arrival time of the next message
+
+    def reserve(self) -> float:
+        now = self._clock()
+        tat = max(self._tat, now)
+        self._tat = tat + self.interval
+        return max(0.0, tat - now - (self.burst - 1) * self.interval)
+
+
+def _percentile(samples: Iterable[float], q: float) -> float | None:
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+
+class TelegramOutbox:
+    """Paced, retrying ``sendMessage`` over one pooled session."""
+
+    def __init__(
+        self,
+        token: str | None,
+        *,
+        rate: float = _RATE,
+        burst: int = _BURST,
+        chat_interval: float = _CHAT_INTERVAL_S,
+        max_attempts: int = _MAX_ATTEMPTS,
+        post: PostFn | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._token = token
+        self._clock = clock
+        self._sleep = sleep
+        self._global = Pacer(rate, burst, clock=clock)
+        self._chat_interval = chat_interval
+        self._chat_tat: dict[int, float] = {}
+        self._chat_locks: dict[int, asyncio.Lock] = {}
+        self._chat_users: dict[int, int] = {}
+        self.max_attempts = max(1, max_attempts)
+        self._post_fn = post
+        self._http: aiohttp.ClientSession | None = None
+        self._paused_until = 0.0
+        self._background: set[asyncio.Task] = set()
+        self._wait: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._latency: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self.in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.rejected = 0
+        self.retried = 0
+        self.rate_limited = 0
+
+    # -- transport ---------------------------------------------------------
+
+    async def _post(self, method: str, payload: dict) -> tuple[int, Any]:
+        if self._post_fn is not None:
+            return await self._post_fn(method, payload)
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=_TIMEOUT_S),
+            )
+        url = f"{TELEGRAM_API_BASE}{self._token}/{method}"
+        async with self._http.post(url, json=payload) as response:
+            try:
+                body = await response.json(content_type=None)
+            except (aiohttp.ContentTypeError, ValueError):
+                body = None
+            return response.status, body
+
+    async def close(self) -> None:
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+
+    # -- pacing ------------------------------------------------------------
+
+    def _reserve_chat(self, chat_id: int) -> float:
+        now = self._clock()
+        tat = max(self._chat_tat.get(chat_id, 0.0), now)
+        self._chat_tat[chat_id] = tat + self._chat_interval
+        if len(self._chat_tat) > 10_000:
+            # Forget chats whose pacing slot is long past.
+            for cid in [c for c, t in self._chat_tat.items() if t < now]:
+                del self._chat_tat[cid]
+        return tat - now
+
+    async def _wait_turn(self, chat_id: int) -> None:
+        delay = self._reserve_chat(chat_id)
+        if delay > 0:
+            await self._sleep(delay)
+        while True:
+            paused = self._paused_until - self._clock()
+            if paused > 0:
+                await self._sleep(paused)
+            delay = self._global.reserve()
+            if delay > 0:
+                await self._sleep(delay)
+            if self._paused_until <= self._clock():
+                return
+
+    def _backoff(self, attempt: int) -> float:
+        return min(_BACKOFF_MAX_S, 0.5 * 2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+
+    # -- public ------------------------------------------------------------
+
+    async def send(
+        self, chat_id: int, text: str, *, parse_mode: str | None = "HTML", **extra: Any
+    ) -> bool:
+        """Deliver one message; True once Telegram accepted it.
+
+        Waits for the global and per-chat pacers, retries per the module
+        docstring, never raises for delivery failures (they are logged
+        and counted).
+        """
+        payload: dict[str, Any] = {"chat_id": chat_id, "text": text, **extra}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        queued = self._clock()
+        self.in_flight += 1
+        self._chat_users[chat_id] = self._chat_users.get(chat_id, 0) + 1
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        try:
+            async with lock:
+                return await self._deliver(chat_id, payload, queued)
+        finally:
+            self.in_flight -= 1
+            self._chat_users[chat_id] -= 1
+            if not self._chat_users[chat_id]:
+                del self._chat_users[chat_id]
+                self._chat_locks.pop(chat_id, None)
+
+    async def _deliver(self, chat_id: int, payload: dict, queued: float) -> bool:
+        reason = ""
+        for attempt in range(1, self.max_attempts + 1):
+            await self._wait_turn(chat_id)
+            if attempt == 1:
+                self._wait.append(self._clock() - queued)
+            try:
+                status, body = await self._post("sendMessage", payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                status, body, reason = 0, None, repr(exc)
+            if status == 200:
+                self.sent += 1
+                self._latency.append(self._clock() - queued)
+                return True
+            if status == 429:
+                self.rate_limited += 1
+                params = (body or {}).get("parameters") or {}
+                retry_after = float(params.get("retry_after") or 1)
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+                logger.warning(f"telegram outbox: 429, pausing {retry_after:.0f}s")
+                reason = f"429 retry_after={retry_after:.0f}"
+            elif status and status < 500:
+                self.rejected += 1
+                description = (body or {}).get("description") if isinstance(body, dict) else body
+                logger.warning(f"sendMessage to {chat_id} rejected ({status}): {description}")
+                return False
+            else:
+                reason = reason if not status else f"HTTP {status}"
+                if attempt < self.max_attempts:
+                    await self._sleep(self._backoff(attempt))
+            if attempt < self.max_attempts:
+                self.retried += 1
+        self.failed += 1
+        logger.error(
+            f"sendMessage to {chat_id} failed after {self.max_attempts} attempts: {reason}"
+        )
+        return False
+
+    def enqueue(self, chat_id: int, text: str, **kwargs: Any) -> asyncio.Task:
+        """Fire-and-forget :meth:`send`; :meth:`drain` waits for the backlog."""
+        task = asyncio.get_running_loop().create_task(self.send(chat_id, text, **kwargs))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def drain(self) -> None:
+        while self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "rate_limited": self.rate_limited,
+            "in_flight": self.in_flight,
+            "wait_p50_s": _percentile(self._wait, 0.5),
+            "wait_p95_s": _percentile(self._wait, 0.95),
+            "latency_p95_s": _percentile(self._latency, 0.95),
+        }
+
+
+# One outbox per process: every sender shares its pacers and pool.
+outbox = TelegramOutbox(BOT_TOKEN)
+
+
+async def send_message(chat_id: int, text: str, *, parse_mode: str | None = "HTML") -> bool:
+    """Send an HTML message through the process outbox."""
+    return await outbox.send(chat_id, text, parse_mode=parse_mode)
+
+
+def outbox_stats() -> dict[str, float | int | None]:
+    return outbox.stats()
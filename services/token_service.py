@@ -1,26 +1,36 @@
-"""Token metadata lookup (symbol + decimals) with in-process caching.
+"""Token metadata lookup (symbol + decimals) with a persisted cache.
 
 Starknet V2 lets validators host multiple pools, one per staking-eligible
 token. To render balances correctly we need the ``decimals()`` and
-``symbol()`` of each token. These rarely change, so we cache them in the
-process.
+``symbol()`` of each token. These rarely change, so the registry keeps
+them in ``FILES_DIR/cache/token_registry.json`` (``TOKEN_REGISTRY_PATH``)
+and loads that file synchronously at import: a restarted process renders
+its first validator card without re-asking the chain. Entries older than
+``TOKEN_CACHE_TTL`` are still served and re-read in the background.
 """
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import json
 import os
+import tempfile
+import time
 from decimal import Decimal
 from functools import lru_cache
-from typing import Iterable
+from pathlib import Path
+from typing import Callable, Iterable
 
 from loguru import logger
 from starknet_py.contract import Contract
 from starknet_py.net.client_errors import ClientError
 
-from services.rpc_client import get_client, with_retry
+from data.all_paths import CACHE_DIR
+from services.rpc_client import get_client, snapshot_block_kwargs, with_retry
 from services.staking_dto import TokenInfo
 
 _TTL = int(os.getenv("TOKEN_CACHE_TTL", "3600"))
+_REGISTRY_PATH = Path(os.getenv("TOKEN_REGISTRY_PATH") or CACHE_DIR / "token_registry.json")
 
 # Minimal fragment of the ERC-20 view interface that we need. starknet-py can
 # parse it by itself; we hand-roll the ABI to avoid a round-trip for each token.
@@ -107,7 +117,8 @@ async def fetch_strk_balance(account_address: str) -> Decimal:
     )
 
     async def _call() -> int:
-        result = await client.call_contract(call=call, block_hash="latest")
+        block = await snapshot_block_kwargs() or {"block_hash": "latest"}
+        result = await client.call_contract(call=call, **block)
         # u256 = (low: u128, high: u128), little-endian as a 2-felt tuple.
         if not result or len(result) < 2:
             return 0
@@ -155,16 +166,88 @@ def _normalize(address_hex: str) -> str:
 
 
 class TokenRegistry:
-    """Async-safe cache keyed by contract address."""
+    """Async-safe cache keyed by contract address, persisted to ``path``.
 
-    def __init__(self) -> None:
+    Only metadata actually read from a token contract is persisted;
+    well-known tokens resolve from :data:`_WELL_KNOWN` for free, and a
+    failed read is kept in memory only so the next process retries it.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        ttl: float = _TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
         self._cache: dict[str, TokenInfo] = {}
+        self._fetched_at: dict[str, float] = {}
         self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshing: set[str] = set()
+        self._background: set[asyncio.Task] = set()
+        if path is not None:
+            self._load()
+
+    # -- persistence ------------------------------------------------------
+
+    def _read_file(self) -> dict[str, dict]:
+        try:
+            doc = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning(f"token registry {self.path.name} unreadable: {exc}")
+            return {}
+        tokens = doc.get("tokens") if isinstance(doc, dict) else None
+        return tokens if isinstance(tokens, dict) else {}
+
+    def _load(self) -> None:
+        for key, row in self._read_file().items():
+            try:
+                info = TokenInfo(address=key, symbol=row.get("symbol"), decimals=int(row["decimals"]))
+                fetched_at = float(row["fetched_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._cache[key] = info
+            self._fetched_at[key] = fetched_at
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        # Merge with what other processes (bot / API / notifier) wrote.
+        tokens = self._read_file()
+        tokens.update(
+            {
+                key: {
+                    "symbol": self._cache[key].symbol,
+                    "decimals": self._cache[key].decimals,
+                    "fetched_at": fetched_at,
+                }
+                for key, fetched_at in self._fetched_at.items()
+            }
+        )
+        tmp: str | None = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tokens-", suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump({"version": 1, "tokens": tokens}, fh, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            logger.warning(f"token registry not written ({self.path}): {exc}")
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+
+    # -- lookups ----------------------------------------------------------
 
     async def get(self, address: str | int) -> TokenInfo:
         key = _normalize(hex(address) if isinstance(address, int) else address)
         cached = self._cache.get(key)
         if cached is not None:
+            self._maybe_refresh(key)
             return cached
 
         lock = self._locks.setdefault(key, asyncio.Lock())
@@ -172,34 +255,79 @@ class TokenRegistry:
             cached = self._cache.get(key)
             if cached is not None:
                 return cached
+            await self._resolve(key)
+            return self._cache[key]
 
-            info = await self._fetch(key)
-            self._cache[key] = info
-            return info
+    async def get_many(self, addresses: Iterable[str | int]) -> list[TokenInfo]:
+        """Resolve a batch of token addresses concurrently, in order."""
+        return list(await asyncio.gather(*(self.get(a) for a in addresses)))
 
     async def prefetch(self, addresses: Iterable[str | int]) -> None:
         """Warm the cache concurrently for a batch of token addresses."""
         await asyncio.gather(*(self.get(a) for a in addresses), return_exceptions=True)
 
-    async def _fetch(self, address_hex: str) -> TokenInfo:
+    async def _resolve(self, key: str) -> None:
+        info, from_chain = await self._fetch(key)
+        if from_chain:
+            self._cache[key] = info
+            self._fetched_at[key] = self._clock()
+            self._save()
+        elif key not in self._cache:
+            self._cache[key] = info
+        elif key in self._fetched_at:
+            # Failed refresh: keep the last good value, retry after a TTL.
+            self._fetched_at[key] = self._clock()
+
+    def _maybe_refresh(self, key: str) -> None:
+        fetched_at = self._fetched_at.get(key)
+        if fetched_at is None or key in self._refreshing:
+            return
+        if self._clock() - fetched_at < self.ttl:
+            return
+        self._refreshing.add(key)
+        # Fresh context: the caller's read snapshot must not pin the refresh.
+        task = asyncio.get_running_loop().create_task(
+            self._resolve(key), context=contextvars.Context()
+        )
+        self._background.add(task)
+        task.add_done_callback(lambda t, k=key: self._refresh_done(k, t))
+
+    def _refresh_done(self, key: str, task: asyncio.Task) -> None:
+        self._refreshing.discard(key)
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"token metadata refresh failed for {key}: {task.exception()!r}")
+
+    async def drain(self) -> None:
+        """Wait for in-flight background refreshes (tests, shutdown)."""
+        while self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def _fetch(self, address_hex: str) -> tuple[TokenInfo, bool]:
+        """``(info, from_chain)``; ``from_chain`` is False for well-known
+        tokens and for reads that failed outright."""
         well_known = _WELL_KNOWN.get(address_hex)
         if well_known is not None:
             symbol, decimals = well_known
-            return TokenInfo(address=address_hex, symbol=symbol, decimals=decimals)
+            return TokenInfo(address=address_hex, symbol=symbol, decimals=decimals), False
 
         client = get_client()
         contract = Contract(address=int(address_hex, 16), abi=_ERC20_ABI, provider=client)
 
         async def _call_symbol() -> str | None:
             try:
-                (raw,) = await contract.functions["symbol"].call()
+                (raw,) = await contract.functions["symbol"].call(
+                    **await snapshot_block_kwargs()
+                )
                 return _felt_to_ascii(raw)
             except (ClientError, KeyError):
                 return None
 
         async def _call_decimals() -> int:
             try:
-                (raw,) = await contract.functions["decimals"].call()
+                (raw,) = await contract.functions["decimals"].call(
+                    **await snapshot_block_kwargs()
+                )
                 return int(raw)
             except (ClientError, KeyError):
                 return 18
@@ -211,9 +339,9 @@ class TokenRegistry:
             )
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"token metadata fetch failed for {address_hex}: {exc}")
-            symbol, decimals = None, 18
+            return TokenInfo(address=address_hex, symbol=None, decimals=18), False
 
-        return TokenInfo(address=address_hex, symbol=symbol, decimals=decimals)
+        return TokenInfo(address=address_hex, symbol=symbol, decimals=decimals), True
 
 
 def _felt_to_ascii(raw: int) -> str | None:
@@ -228,5 +356,6 @@ def _felt_to_ascii(raw: int) -> str | None:
         return None
 
 
-# Module-level singleton so every consumer shares one warm cache.
-token_registry = TokenRegistry()
+# Module-level singleton so every consumer shares one warm cache; the
+# persisted file is read here, at import, before any card is rendered.
+token_registry = TokenRegistry(_REGISTRY_PATH)
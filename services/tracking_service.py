@@ -17,19 +17,30 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+import time
 from dataclasses import dataclass
 from typing import Literal
 
 from loguru import logger
 
+from services.event_follower import active_follower, member_key, staker_key
 from services.formatting import (
     DIVIDER,
     _fmt_amount,
     render_delegator_card,
     render_validator_card,
 )
+from services.negative_cache import forget_address
+from services.rpc_client import read_snapshot
+from services.snapshot_store import Snapshot, address_part, snapshots
 from services.staking_dto import DelegatorInfo, DelegatorMultiPositions, ValidatorInfo
-from services.staking_service import get_delegator_positions, get_validator_info
+from services.staking_service import (
+    FETCH_PROFILES,
+    fetch_profile,
+    get_delegator_positions,
+    get_validator_info,
+)
 
 Mode = Literal["full", "reward"]
 
@@ -206,8 +217,56 @@ class TrackingEntry:
     data: ValidatorInfo | DelegatorMultiPositions | None
 
 
-async def fetch_tracking_entries(tracking_data_json: str | None) -> list[TrackingEntry]:
-    doc = load_tracking(tracking_data_json)
+# Resolved DTOs live in the process-wide snapshot store
+# (services.snapshot_store), shared by every user tracking the same
+# address. While the event follower (services.event_follower) has synced
+# and seen no event touching a snapshot's addresses, the snapshot is known
+# current regardless of the consumer's budget; the age cap is a backstop
+# for changes no event announces.
+_SNAPSHOT_MAX_AGE_S = float(os.getenv("EVENT_SNAPSHOT_MAX_AGE_S", "21600"))
+
+
+def _entry_dependencies(kind: str, a1: str, a2: str) -> list[str] | None:
+    """Follower keys whose events can change this entry's DTO.
+
+    ``None`` for addresses that are not hex felts: never proven current.
+    """
+    try:
+        if kind == "validator":
+            return [staker_key(a1)]
+        deps = [member_key(a1)]
+        if a2:
+            deps.append(staker_key(a2))
+        return deps
+    except ValueError:
+        return None
+
+
+def _snapshot_key(kind: str, a1: str, a2: str) -> tuple[str, ...]:
+    if kind == "validator":
+        return ("validator", address_part(a1))
+    return ("delegation", address_part(a2), address_part(a1))
+
+
+TrackedItem = tuple[str, str, str, str]  # (kind, a1, a2, label)
+
+
+def _profile_suffix(profile: str) -> tuple[str, ...]:
+    """Snapshot-key suffix for ``profile``: empty when it reads the full DTO.
+
+    A narrow profile leaves fields ``None``, so its snapshots must not be
+    served to a card; profiles that read everything share one snapshot.
+    """
+    return () if fetch_profile(profile) == FETCH_PROFILES["full"] else (profile,)
+
+
+def tracked_items(doc: dict) -> list[TrackedItem]:
+    """The doc's entries as ``(kind, a1, a2, label)``, in display order.
+
+    For validators ``a1`` is the staker and ``a2`` is empty; for
+    delegations ``a1`` is the delegator and ``a2`` the staker.
+    """
+    doc = _normalize(doc)
 
     # Build the canonical "natural order" job list (validators first,
     # delegations second) — same order this function used to produce
@@ -216,8 +275,8 @@ async def fetch_tracking_entries(tracking_data_json: str | None) -> list[Trackin
     # mention (concurrent-add path: an entry was inserted into the
     # underlying array AFTER the user opened reorder mode and tapped
     # Done; its key isn't in the saved order, so it lands at the end).
-    natural: list[tuple[str, str, str, str]] = []  # (kind, a1, a2, label)
-    by_key: dict[str, tuple[str, str, str, str]] = {}
+    natural: list[TrackedItem] = []
+    by_key: dict[str, TrackedItem] = {}
     for v in doc["validators"]:
         addr = v.get("address") or ""
         if not addr:
@@ -240,7 +299,7 @@ async def fetch_tracking_entries(tracking_data_json: str | None) -> list[Trackin
     # natural order at the end (concurrent-add path).
     raw_order = doc.get("display_order")
     if isinstance(raw_order, list) and raw_order:
-        ordered: list[tuple[str, str, str, str]] = []
+        ordered: list[TrackedItem] = []
         used: set[int] = set()
         for key in raw_order:
             if not isinstance(key, str):
@@ -261,25 +320,116 @@ async def fetch_tracking_entries(tracking_data_json: str | None) -> list[Trackin
             if id(item) not in used:
                 ordered.append(item)
         natural = ordered
+    return natural
+
+
+def entry_identity(kind: str, a1: str, a2: str) -> tuple[str, ...]:
+    """Canonical identity of a tracked entry: equal for every user tracking it."""
+    return _snapshot_key(kind, a1, a2)
 
-    jobs: list[tuple[int, str, str, str, str]] = [
-        (i, kind, a1, a2, label)
-        for i, (kind, a1, a2, label) in enumerate(natural)
-    ]
 
-    async def _one(
-        i: int, kind: str, a1: str, a2: str, label: str
-    ) -> TrackingEntry:
+async def resolve_tracked(
+    items: list[tuple[str, str, str]],
+    *,
+    consumer: str,
+    profile: str = "full",
+    concurrency: int | None = None,
+    strict: bool = True,
+) -> dict[tuple[str, ...], object]:
+    """Resolve ``(kind, a1, a2)`` items to DTOs, once per :func:`entry_identity`.
+
+    Reads go through the shared snapshot store. ``profile`` names the
+    validator fields needed (:data:`services.staking_service.FETCH_PROFILES`).
+    With ``strict=False`` a failed read maps to ``None`` (logged) instead
+    of raising. Runs inside the caller's :func:`read_snapshot` when there
+    is one.
+    """
+    suffix = _profile_suffix(profile)
+    profile_kwargs = {"profile": profile} if suffix else {}
+    follower = active_follower()
+    unique: dict[tuple[str, ...], tuple[str, str, str]] = {}
+    for kind, a1, a2 in items:
+        unique.setdefault(entry_identity(kind, a1, a2), (kind, a1, a2))
+
+    async def _resolve(kind: str, a1: str, a2: str):
         if kind == "validator":
-            info: ValidatorInfo | DelegatorMultiPositions | None = await get_validator_info(a1)
-            return TrackingEntry(i, kind, a1, a2, label, info)  # type: ignore[arg-type]
+            return await get_validator_info(a1, **profile_kwargs)
         # delegator: a1 = delegator address, a2 = staker address
-        multi = await get_delegator_positions(a2, a1) if a2 else None
-        return TrackingEntry(i, kind, a1, a2, label, multi)  # type: ignore[arg-type]
+        return await get_delegator_positions(a2, a1)
+
+    def _validator_for(deps: list[str] | None):
+        if follower is None or deps is None or not follower.synced:
+            return None
+
+        def _validate(snap: Snapshot) -> bool | None:
+            if snap.stamp is None or time.monotonic() - snap.fetched_at >= _SNAPSHOT_MAX_AGE_S:
+                return None
+            return follower.is_fresh(deps, snap.stamp)
+
+        return _validate
+
+    gate = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def _one(identity: tuple[str, ...], kind: str, a1: str, a2: str):
+        if kind != "validator" and not a2:
+            return None
+        # Delegations read the same fields under every profile.
+        key = (*identity, *suffix) if kind == "validator" else identity
+
+        async def _read():
+            return await snapshots.get(
+                key,
+                lambda: _resolve(kind, a1, a2),
+                consumer=consumer,
+                validate=_validator_for(_entry_dependencies(kind, a1, a2)),
+                # Stamp the cursor *before* reading: an event landing
+                # mid-read then makes the snapshot stale, not missed.
+                stamp=(lambda: follower.cursor) if follower is not None else None,
+            )
+
+        try:
+            if gate is None:
+                return await _read()
+            async with gate:
+                return await _read()
+        except Exception as exc:  # noqa: BLE001
+            if strict:
+                raise
+            logger.warning(f"resolve {kind} {a1} {a2}: {exc!r}")
+            return None
 
-    if not jobs:
+    results = await asyncio.gather(*(_one(ident, *item) for ident, item in unique.items()))
+    return dict(zip(unique, results, strict=True))
+
+
+async def fetch_tracking_entries(
+    tracking_data_json: str | None,
+    *,
+    consumer: str = "card",
+    profile: str = "card",
+) -> list[TrackingEntry]:
+    """Resolve every tracked row to its DTO, in display order.
+
+    ``consumer`` picks the freshness budget in
+    :data:`services.snapshot_store.FRESHNESS_BUDGETS`; ``profile`` the
+    validator sub-reads (callers that don't render cards ask for less).
+    """
+    items = tracked_items(load_tracking(tracking_data_json))
+    if not items:
         return []
-    return await asyncio.gather(*(_one(*j) for j in jobs))
+    # One head block for the whole list: every card in a digest / API
+    # response reflects the same chain state, and repeated reads of the
+    # same staker are served from the block-keyed call cache.
+    with read_snapshot():
+        data = await resolve_tracked(
+            [(kind, a1, a2) for kind, a1, a2, _ in items],
+            consumer=consumer,
+            profile=profile,
+        )
+    return [
+        TrackingEntry(i, kind, a1, a2, label, data[entry_identity(kind, a1, a2)])  # type: ignore[arg-type]
+        for i, (kind, a1, a2, label) in enumerate(items)
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -426,7 +576,11 @@ def _split_into_chunks(parts: list[str], glue: str = "\n\n") -> list[str]:
 
 
 async def render_user_tracking_chunks(
-    tracking_data_json: str | None, locale: str, mode: Mode = "full"
+    tracking_data_json: str | None,
+    locale: str,
+    mode: Mode = "full",
+    *,
+    consumer: str = "card",
 ) -> list[str]:
     """Render ``render_user_tracking``-style content as Telegram-sized chunks.
 
@@ -443,7 +597,12 @@ async def render_user_tracking_chunks(
     from data.languages import translate
     from services.price_service import get_usd_prices
 
-    entries = await fetch_tracking_entries(tracking_data_json)
+    # The reward digest shows amounts and the missed-epoch flag only.
+    entries = await fetch_tracking_entries(
+        tracking_data_json,
+        consumer=consumer,
+        profile="attestation" if mode == "reward" else "card",
+    )
     if not entries:
         return [translate("no_addresses_to_parse", locale)]
 
@@ -516,7 +675,11 @@ async def render_user_tracking_chunks(
 
 
 async def render_user_tracking(
-    tracking_data_json: str | None, locale: str, mode: Mode = "full"
+    tracking_data_json: str | None,
+    locale: str,
+    mode: Mode = "full",
+    *,
+    consumer: str = "card",
 ) -> str:
     """Back-compat shim that joins chunks for callers expecting a single string.
 
@@ -524,7 +687,9 @@ async def render_user_tracking(
     ``render_user_tracking_chunks`` directly so each chunk goes out as
     its own Telegram message and stays under the 4096-char cap.
     """
-    chunks = await render_user_tracking_chunks(tracking_data_json, locale, mode)
+    chunks = await render_user_tracking_chunks(
+        tracking_data_json, locale, mode, consumer=consumer
+    )
     return "\n\n".join(chunks)
 
 
@@ -748,6 +913,8 @@ async def add_validator_to_tracking(
     # On-chain check — same as the bot's confirm-step. Skipping attestation
     # avoids two extra RPC reads on the add-path; the dashboard pulls them
     # later once the row is saved.
+    # An explicit add is a hint the address may have become valid.
+    forget_address(address)
     info = await get_validator_info(address, with_attestation=False)
     if info is None:
         raise AddTrackingError(
@@ -807,6 +974,8 @@ async def add_delegator_to_tracking(
             "duplicate", "delegation already in your tracking list"
         )
 
+    forget_address(staker)
+    forget_address(delegator)
     multi = await get_delegator_positions(staker, delegator)
     if multi is None or not multi.has_any:
         raise AddTrackingError(
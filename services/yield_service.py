@@ -398,7 +398,10 @@ def _label_for_validator_lookup(validators: list[YieldValidatorEntry], staker_ad
 
 async def _build_payload_uncached(tracking_data: Optional[str]) -> YieldPayload:
     """Assemble the yield payload from scratch — no cache lookup."""
-    entries: list[TrackingEntry] = await fetch_tracking_entries(tracking_data)
+    # Commission and pool amounts only: no attestation / timeline reads.
+    entries: list[TrackingEntry] = await fetch_tracking_entries(
+        tracking_data, profile="rewards"
+    )
     try:
         prices = await get_usd_prices()
     except Exception as exc:  # noqa: BLE001
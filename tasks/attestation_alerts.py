@@ -9,26 +9,46 @@ Per-user opt-in via ``notification_config["attestation_alerts"]`` — off by
 default after a fresh validator add. State is kept in
 ``notification_config["_attestation_state"]`` so we don't re-spam the same
 "missed 3 epochs" message every cycle.
+
+With a head tracker the default schedule is window-driven: each staker is
+read around its own attestation window rather than on a fixed cadence
+(:mod:`services.attestation_windows`), and a miss is reported as soon as
+the window closes.
 """
 from __future__ import annotations
 
 import asyncio
 import os
-
-import aiohttp
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable
 
 from data.languages import translate
 from data.models import semaphore
-from data.tg_bot import BOT_TOKEN
 from db_api.database import (
     db,
-    get_strk_notification_users,
+    get_attestation_watchers,
+    get_subscriber_ids,
+    iter_subscribed_users,
     update_attestation_state,
     update_operator_balance_was_below,
 )
-from db_api.models import Users
-from services.attestation_service import fetch_attestation_status
+from db_api.models import UserRow, Users, resolve_attestation_stakers
+from services.attestation_service import (
+    fetch_attestation_status,
+    fetch_attestation_window,
+    fetch_is_attesting_this_epoch,
+    fetch_target_attestation_block,
+)
+from services.attestation_windows import AttestationWindows
+from services.head_tracker import EpochBoundary, HeadTracker, get_head_tracker
+from services.rpc_client import read_snapshot
+from services.slot_scheduler import ShardedScheduler
+from services.snapshot_store import address_part, snapshots
+from services.staking_dto import AttestationStatus
 from services.staking_service import fetch_current_epoch, fetch_staker_raw
+from services.telegram_outbox import send_message as _send
 from services.token_service import fetch_strk_balance
 from services.tracking_service import load_tracking
 from utils.logger import logger
@@ -47,17 +67,21 @@ def _addr_hex_norm(value) -> str:
     s = str(value).lower()
     return s if s.startswith("0x") else "0x" + s
 
-TELEGRAM_API_BASE = "https://api.telegram.org/bot"
 _INTERVAL = int(os.getenv("ATTESTATION_INTERVAL_SECONDS", "60"))
-
-
-async def _send(chat_id: int, text: str) -> None:
-    url = f"{TELEGRAM_API_BASE}{BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            if response.status != 200:
-                logger.error(f"sendMessage failed: {await response.text()}")
+# With a head tracker: re-check every N blocks, plus at every epoch boundary.
+_INTERVAL_BLOCKS = int(os.getenv("ATTESTATION_INTERVAL_BLOCKS", "10"))
+# Wall-clock mode: subscribers spread over this many ticks per interval.
+_SHARDS = max(1, int(os.getenv("ATTESTATION_SHARDS", "6")))
+# With a head tracker: "window" checks each staker around its attestation
+# window (services.attestation_windows); "blocks" re-checks everyone every
+# ATTESTATION_INTERVAL_BLOCKS blocks.
+_SCHEDULE = os.getenv("ATTESTATION_SCHEDULE", "window").lower()
+# Window mode re-reads the subscriber list this often (blocks).
+_ROSTER_BLOCKS = int(os.getenv("ATTESTATION_ROSTER_BLOCKS", "30"))
+# Phase-one staker reads in flight at once. Separate from the per-user
+# ``semaphore``: a one-user check reads its stakers while holding that.
+_READ_CONCURRENCY = int(os.getenv("ATTESTATION_READ_CONCURRENCY", "32"))
+_read_slots = asyncio.Semaphore(_READ_CONCURRENCY)
 
 
 def _validator_label(staker_address: str, validators: list[dict]) -> str:
@@ -75,22 +99,138 @@ def _validator_label(staker_address: str, validators: list[dict]) -> str:
 
 
 def _resolve_subscribed_set(cfg: dict, validators: list[dict]) -> set[str]:
-    """Return the lower-cased staker addresses the user wants alerts for.
+    """Return the lower-cased staker addresses the user wants alerts for
+    (:func:`db_api.models.resolve_attestation_stakers`, which also
+    derives the ``subscriptions`` index rows)."""
+    return resolve_attestation_stakers(cfg, validators)
 
-    Supports both the new per-validator schema (``attestation_alerts_for``)
-    and the legacy global boolean (``attestation_alerts``) so older configs
-    keep working without a migration job.
+
+async def _operational_address(staker: str) -> str | None:
+    raw = await fetch_staker_raw(staker)
+    if not raw:
+        return None
+    op_addr = _addr_hex_norm(raw.get("operational_address", 0))
+    return op_addr if op_addr and op_addr != "0x0" else None
+
+
+async def _operator_balance(staker: str) -> Decimal | None:
+    try:
+        op_addr = await _operational_address(staker)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"staker_raw fetch failed for {staker}: {exc}")
+        return None
+    if op_addr is None:
+        return None
+    try:
+        return await fetch_strk_balance(op_addr)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"operator balance fetch failed for {op_addr}: {exc}")
+        return None
+
+
+async def _attestation(staker: str, current_epoch: int) -> AttestationStatus | None:
+    try:
+        # Shared with the other watchers of this staker across ticks, too.
+        return await snapshots.get(
+            ("attestation", address_part(staker), current_epoch),
+            lambda: fetch_attestation_status(
+                staker, current_epoch=current_epoch, with_blocks=False
+            ),
+            consumer="attestation",
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"attestation fetch failed for {staker}: {exc}")
+        return None
+
+
+async def _read_stakers(
+    att_stakers: Iterable[str],
+    balance_stakers: Iterable[str],
+    current_epoch: int,
+    *,
+    statuses: dict[str, AttestationStatus] | None = None,
+) -> tuple[dict[str, AttestationStatus], dict[str, Decimal]]:
+    """Phase one of a tick: every unique staker's reads, once, concurrently.
+
+    Returns ``(statuses, balances)`` keyed by :func:`address_part`; a
+    failed read leaves its staker out. Passed ``statuses`` are used as
+    they are and no status is read.
     """
-    raw = cfg.get("attestation_alerts_for")
-    if isinstance(raw, list):
-        return {str(a).lower() for a in raw if a}
-    if cfg.get("attestation_alerts"):
-        return {(v.get("address") or "").lower() for v in validators}
-    return set()
+
+    async def _bounded(coro):
+        async with _read_slots:
+            return await coro
+
+    if statuses is None:
+        unique = {address_part(s): s for s in att_stakers if s}
+        results = await asyncio.gather(
+            *(_bounded(_attestation(s, current_epoch)) for s in unique.values())
+        )
+        statuses = {k: st for k, st in zip(unique, results, strict=True) if st is not None}
+    unique = {address_part(s): s for s in balance_stakers if s}
+    results = await asyncio.gather(
+        *(_bounded(_operator_balance(s)) for s in unique.values())
+    )
+    balances = {k: b for k, b in zip(unique, results, strict=True) if b is not None}
+    return statuses, balances
+
+
+@dataclass
+class _TickReads:
+    """One tick's staker reads, shared by the chunks of its subscriber scan.
+
+    Keyed by :func:`address_part`; a failed read is kept as ``None`` so a
+    later chunk doesn't retry it. ``statuses_final`` marks statuses handed
+    in by the window plan: no other staker's status is read.
+    """
+
+    statuses: dict[str, AttestationStatus | None] = field(default_factory=dict)
+    balances: dict[str, Decimal | None] = field(default_factory=dict)
+    statuses_final: bool = False
+    users: int = 0
+    read_s: float = 0.0
+    total_s: float = 0.0
+
+    async def fill(
+        self, att_stakers: Iterable[str], balance_stakers: Iterable[str], current_epoch: int
+    ) -> None:
+        att = [] if self.statuses_final else [
+            s for s in att_stakers if address_part(s) not in self.statuses
+        ]
+        bal = [s for s in balance_stakers if address_part(s) not in self.balances]
+        if not att and not bal:
+            return
+        statuses, balances = await _read_stakers(att, bal, current_epoch)
+        for s in att:
+            self.statuses[address_part(s)] = statuses.get(address_part(s))
+        for s in bal:
+            self.balances[address_part(s)] = balances.get(address_part(s))
+
+    def log(self) -> None:
+        log = logger.warning if self.total_s > _INTERVAL / 2 else logger.info
+        balances = sum(1 for b in self.balances.values() if b is not None)
+        log(
+            f"attestation tick: {self.users} users, {len(self.statuses)} stakers "
+            f"({balances} balances) — reads {self.read_s:.2f}s, "
+            f"evaluate {self.total_s - self.read_s:.2f}s, total {self.total_s:.2f}s"
+        )
+
+
+def _subscriptions(user: Users | UserRow) -> tuple[set[str], float]:
+    """``(stakers with alerts on, operator-balance threshold)`` of a user."""
+    cfg = user.get_notification_config()
+    validators = load_tracking(user.tracking_data).get("validators", [])
+    subscribed = _resolve_subscribed_set(cfg, validators) if validators else set()
+    return subscribed, float(cfg.get("operator_balance_min_strk") or 0)
 
 
 async def _check_user(
-    user: Users, current_epoch: int, *, epoch_changed: bool
+    user: Users | UserRow,
+    current_epoch: int,
+    *,
+    epoch_changed: bool,
+    statuses: dict[str, AttestationStatus | None] | None = None,
+    balances: dict[str, Decimal | None] | None = None,
 ) -> tuple[dict | None, dict | None]:
     """Run one attestation + operator-balance check for a single user.
 
@@ -106,6 +246,11 @@ async def _check_user(
     just tick" from the in-memory ``_last_seen_epoch`` in ``_run_cycle``.
     The attestation watcher itself stays continuous: missed epochs need a
     sub-minute alert SLA.
+
+    ``statuses`` and ``balances`` (keyed by :func:`address_part`) are the
+    tick's shared reads from :func:`_read_stakers`; stakers missing from
+    them are skipped this time. Without them the user's own stakers are
+    read first — a one-user tick.
     """
     cfg = user.get_notification_config()
     doc = load_tracking(user.tracking_data)
@@ -134,6 +279,14 @@ async def _check_user(
     # bandwidth saving, no behavioural impact (we'd rediscover the same
     # answer next boundary anyway).
     do_balance = epoch_changed and balance_min > 0
+    if statuses is None or (do_balance and balances is None):
+        statuses, balances = await _read_stakers(
+            subscribed_att,
+            subscribed_att if do_balance else (),
+            current_epoch,
+            statuses=statuses,
+        )
+    balances = balances or {}
 
     for v in validators:
         staker = (v.get("address") or "").lower()
@@ -142,39 +295,32 @@ async def _check_user(
         label = _validator_label(staker, validators)
 
         # ---- Attestation health (continuous, every tick) ---------------
-        if staker in subscribed_att:
-            try:
-                status = await fetch_attestation_status(
-                    staker, current_epoch=current_epoch
+        status = statuses.get(address_part(staker)) if staker in subscribed_att else None
+        if status is not None:
+            new_missed = status.missed_epochs
+            old_missed = int(att_state.get(staker, 0))
+            if new_missed > old_missed:
+                from services.i18n_plural import t_n
+                await _send(
+                    user.user_id,
+                    t_n(
+                        "attestation_alert_missed", new_missed, locale,
+                        label=label, count=new_missed,
+                        epoch=status.current_epoch,
+                    ),
                 )
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(f"attestation fetch failed for {staker}: {exc}")
-                status = None
-            if status is not None:
-                new_missed = status.missed_epochs
-                old_missed = int(att_state.get(staker, 0))
-                if new_missed > old_missed:
-                    from services.i18n_plural import t_n
-                    await _send(
-                        user.user_id,
-                        t_n(
-                            "attestation_alert_missed", new_missed, locale,
-                            label=label, count=new_missed,
-                            epoch=status.current_epoch,
-                        ),
-                    )
-                    att_state[staker] = new_missed
-                    att_changed = True
-                elif new_missed == 0 and old_missed > 0:
-                    await _send(
-                        user.user_id,
-                        translate("attestation_alert_recovered", locale, label=label),
-                    )
-                    att_state.pop(staker, None)
-                    att_changed = True
-                elif new_missed < old_missed and new_missed > 0:
-                    att_state[staker] = new_missed
-                    att_changed = True
+                att_state[staker] = new_missed
+                att_changed = True
+            elif new_missed == 0 and old_missed > 0:
+                await _send(
+                    user.user_id,
+                    translate("attestation_alert_recovered", locale, label=label),
+                )
+                att_state.pop(staker, None)
+                att_changed = True
+            elif new_missed < old_missed and new_missed > 0:
+                att_state[staker] = new_missed
+                att_changed = True
 
         # ---- Operator wallet STRK balance (epoch-boundary only) --------
         # Skip when the boundary hasn't ticked, the feature is disabled,
@@ -182,20 +328,8 @@ async def _check_user(
         # (the balance alert is part of the same per-validator channel).
         if not do_balance or staker not in subscribed_att:
             continue
-        try:
-            staker_raw = await fetch_staker_raw(staker)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning(f"staker_raw fetch failed for {staker}: {exc}")
-            continue
-        if not staker_raw:
-            continue
-        op_addr = _addr_hex_norm(staker_raw.get("operational_address", 0))
-        if not op_addr or op_addr == "0x0":
-            continue
-        try:
-            balance = await fetch_strk_balance(op_addr)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning(f"operator balance fetch failed for {op_addr}: {exc}")
+        balance = balances.get(address_part(staker))
+        if balance is None:
             continue
         balance_f = float(balance)
         was_below = was_below_state.get(staker, False)
@@ -237,59 +371,120 @@ async def _check_user(
             was_below_state if bal_changed else None)
 
 
-# In-memory cursor for "did the epoch number change since last cycle?".
-# Reset to 0 on process start so the first cycle after a restart always
-# counts as an epoch flip — that one wasted check is cheap, the
-# alternative (stashing the cursor in the DB) couples a notifier-only
-# concern to schema changes.
-_last_seen_epoch: int = 0
+# In-memory per-user cursor for "did the epoch number change since this
+# user's last check?", used by the wall-clock fallback only — with a head
+# tracker the epoch flip arrives as an ``EpochBoundary`` event. Per user
+# because the sharded schedule checks users at different times: a global
+# cursor would hand the boundary to the first shard only. Empty on
+# process start so the first check after a restart always counts as an
+# epoch flip — that one wasted check is cheap, the alternative (stashing
+# the cursor in the DB) couples a notifier-only concern to schema changes.
+_last_seen_epoch: dict[int, int] = {}
 
 
 def _reset_last_seen_epoch_for_tests() -> None:
-    """Test hook: clear the module-level epoch cursor between scenarios."""
-    global _last_seen_epoch
-    _last_seen_epoch = 0
-
-
-async def _run_cycle() -> None:
-    global _last_seen_epoch
-
-    users = await get_strk_notification_users()
-    # Keep ``get_strk_notification_users`` as the broad-net query; filter
-    # out non-subscribers here so the SQL stays simple. Subscription is
-    # the union of attestation alerts (legacy bool or per-validator list)
-    # and the new operator-balance alert.
-    def _has_subscription(u: Users) -> bool:
-        cfg = u.get_notification_config()
-        if cfg.get("attestation_alerts"):
-            return True
-        if cfg.get("attestation_alerts_for"):
-            return True
-        if float(cfg.get("operator_balance_min_strk") or 0) > 0:
-            return True
-        return False
-
-    candidates = [u for u in (users or []) if _has_subscription(u)]
-    if not candidates:
-        return
+    """Test hook: clear the module-level epoch cursors between scenarios."""
+    _last_seen_epoch.clear()
+
 
-    # One RPC for the whole cycle — current_epoch is the same for everyone.
+# Who the watcher checks: users with an "attestation" row in the
+# ``subscriptions`` index. An operator-balance threshold alone does
+# nothing here — the balance alert covers the stakers the user watches.
+_KINDS = ("attestation",)
+
+
+async def _run_cycle(
+    *,
+    block_number: int | None = None,
+    current_epoch: int | None = None,
+    epoch_changed: bool | None = None,
+    user_ids: list[int] | None = None,
+) -> None:
+    """One pass over every subscriber, or over ``user_ids`` (one shard).
+
+    Head-driven callers pass the announcing block and the tracker's epoch
+    state; the wall-clock schedule passes nothing and the cycle resolves
+    the head and the epoch itself.
+    """
+    # One pinned block and one epoch read for the whole cycle — every
+    # subscriber's checks see the same chain state. Subscribers stream in
+    # chunks (``USER_SCAN_CHUNK``); their staker reads are shared.
+    reads = _TickReads()
+    with read_snapshot(block_number):
+        async for chunk in iter_subscribed_users(_KINDS, user_ids):
+            if not reads.users:  # first chunk
+                if current_epoch is None:
+                    current_epoch = await _current_epoch()
+                    if current_epoch is None:
+                        return
+                if epoch_changed:
+                    logger.info(f"epoch boundary tick: now {current_epoch}")
+            await _run_checks(
+                chunk,
+                current_epoch=current_epoch,
+                epoch_changed=epoch_changed,
+                reads=reads,
+            )
+    if reads.users:
+        reads.log()
+
+
+async def _current_epoch() -> int | None:
     try:
-        current_epoch = await fetch_current_epoch()
+        return await fetch_current_epoch()
     except Exception as exc:  # noqa: BLE001
         logger.warning(f"attestation cycle: current_epoch fetch failed: {exc}")
-        return
-
-    epoch_changed = current_epoch != _last_seen_epoch
-    _last_seen_epoch = current_epoch
-    if epoch_changed:
-        logger.info(f"epoch boundary tick: now {current_epoch}")
-
-    async def _process(u: Users) -> None:
+        return None
+
+
+async def _run_checks(
+    candidates: list[Users | UserRow],
+    *,
+    current_epoch: int | None = None,
+    epoch_changed: bool | None = None,
+    reads: _TickReads | None = None,
+) -> None:
+    """Check ``candidates`` — all of a tick's subscribers, or one chunk of
+    them with the tick's shared ``reads`` (the caller then logs the tick)."""
+    own = reads is None
+    if own:
+        reads = _TickReads()
+        if current_epoch is None:
+            current_epoch = await _current_epoch()
+            if current_epoch is None:
+                return
+        if epoch_changed:
+            logger.info(f"epoch boundary tick: now {current_epoch}")
+
+    # Phase one: which stakers this tick needs, each read once however
+    # many subscribers share it.
+    started = time.monotonic()
+    changed_for: dict[int, bool] = {}
+    att_stakers: set[str] = set()
+    balance_stakers: set[str] = set()
+    for u in candidates:
+        changed = epoch_changed
+        if changed is None:
+            changed = _last_seen_epoch.get(u.user_id) != current_epoch
+        _last_seen_epoch[u.user_id] = current_epoch
+        changed_for[u.user_id] = changed
+        subscribed, balance_min = _subscriptions(u)
+        att_stakers |= subscribed
+        if changed and balance_min > 0:
+            balance_stakers |= subscribed
+    await reads.fill(att_stakers, balance_stakers, current_epoch)
+    read_s = time.monotonic() - started
+
+    # Phase two: every user's state machines against the shared reads.
+    async def _process(u: Users | UserRow) -> None:
         async with semaphore:
             try:
                 att_state, bal_state = await _check_user(
-                    u, current_epoch, epoch_changed=epoch_changed
+                    u,
+                    current_epoch,
+                    epoch_changed=changed_for[u.user_id],
+                    statuses=reads.statuses,
+                    balances=reads.balances,
                 )
                 if att_state is not None:
                     await update_attestation_state(u.user_id, att_state)
@@ -299,24 +494,145 @@ async def _run_cycle() -> None:
                 logger.error(f"attestation_alerts({u.user_id}) failed: {exc}")
 
     await asyncio.gather(*(_process(u) for u in candidates))
+    reads.users += len(candidates)
+    reads.read_s += read_s
+    reads.total_s += time.monotonic() - started
+    if own:
+        reads.log()
 
 
-import time as _time
+async def _follow_heads(tracker: HeadTracker) -> None:
+    """Head-driven watcher: every epoch boundary, then every N blocks.
 
+    Missed-epoch counts can only grow when an epoch closes, so the
+    boundary check is what delivers the alert; the block cadence picks up
+    recoveries (an attestation landing mid-epoch).
+    """
+    logger.info(
+        f"attestation watcher following chain heads (every {_INTERVAL_BLOCKS} blocks)"
+    )
+    next_block = 0
+    async for event in tracker.subscribe():
+        try:
+            if isinstance(event, EpochBoundary):
+                await _run_cycle(
+                    block_number=event.block_number,
+                    current_epoch=event.epoch,
+                    epoch_changed=True,
+                )
+                next_block = event.block_number + _INTERVAL_BLOCKS
+            elif event.number >= next_block:
+                await _run_cycle(
+                    block_number=event.number,
+                    current_epoch=tracker.epoch,
+                    epoch_changed=False if tracker.epoch is not None else None,
+                )
+                next_block = event.number + _INTERVAL_BLOCKS
+        except Exception as exc:  # noqa: BLE001
+            logger.error(f"attestation watcher cycle error: {exc!r}")
 
-def _sleep_until_next_boundary(interval: int) -> float:
-    """See ``tasks.strk_notification._sleep_until_next_boundary``."""
-    return interval - (_time.time() % interval)
 
+def attestation_windows() -> AttestationWindows:
+    return AttestationWindows(
+        fetch_operational=_operational_address,
+        fetch_target=fetch_target_attestation_block,
+        fetch_window=fetch_attestation_window,
+        fetch_attested=fetch_is_attesting_this_epoch,
+        fetch_status=lambda staker, epoch: fetch_attestation_status(
+            staker, current_epoch=epoch, with_blocks=False
+        ),
+    )
 
-async def send_attestation_alerts() -> None:
-    """Wall-clock-aligned watcher — fires at xx:xx:00 every minute (UTC)."""
-    logger.info(f"attestation watcher started (interval={_INTERVAL}s)")
-    await asyncio.sleep(_sleep_until_next_boundary(_INTERVAL))
-    while True:
+
+async def _follow_windows(tracker: HeadTracker) -> None:
+    """Window-driven watcher: each staker is read when its epoch outcome
+    can change, not on a fixed cadence (see :mod:`services.attestation_windows`).
+
+    Epoch boundaries still run the whole subscriber pass for the balance
+    alerts, with the attestation half fed by the stakers the previous
+    epoch left undecided.
+    """
+    logger.info("attestation watcher following attestation windows")
+    windows = attestation_windows()
+    watchers: dict[str, set[int]] = {}
+    roster_block = 0
+
+    async def _alert(
+        statuses: dict[str, AttestationStatus], block: int, *, boundary: bool
+    ) -> None:
+        if boundary:
+            user_ids = sorted(set().union(*watchers.values())) if watchers else []
+        else:
+            user_ids = sorted(set().union(*(watchers.get(s, set()) for s in statuses)))
+        if not user_ids:
+            return
+        reads = _TickReads(statuses=dict(statuses), statuses_final=True)
+        with read_snapshot(block):
+            async for chunk in iter_subscribed_users(_KINDS, user_ids):
+                await _run_checks(
+                    chunk,
+                    current_epoch=windows.epoch,
+                    epoch_changed=boundary,
+                    reads=reads,
+                )
+        if reads.users:
+            reads.log()
+
+    async for event in tracker.subscribe():
         try:
-            await _run_cycle()
+            if isinstance(event, EpochBoundary):
+                watchers = await get_attestation_watchers()
+                roster_block = event.block_number
+                settled = await windows.start_epoch(
+                    event.epoch, event.block_number, watchers
+                )
+                await _alert(settled, event.block_number, boundary=True)
+                continue
+            if windows.epoch is None:
+                continue  # waiting for the first boundary the tracker reports
+            if event.number - roster_block >= _ROSTER_BLOCKS:
+                watchers = await get_attestation_watchers()
+                roster_block = event.number
+                await windows.sync_stakers(watchers, event.number)
+            wake = windows.next_wake()
+            if wake is None or event.number < wake:
+                continue
+            decided = await windows.on_head(event.number)
+            if decided:
+                await _alert(decided, event.number, boundary=False)
         except Exception as exc:  # noqa: BLE001
             logger.error(f"attestation watcher cycle error: {exc!r}")
 
-        await asyncio.sleep(_sleep_until_next_boundary(_INTERVAL))
+
+async def _subscriber_roster() -> list[int]:
+    return await get_subscriber_ids(_KINDS)
+
+
+def attestation_scheduler() -> ShardedScheduler[int]:
+    """Wall-clock schedule: each subscriber once per interval, at their slot."""
+
+    async def _shard(user_ids: list[int]) -> None:
+        await _run_cycle(user_ids=user_ids)
+
+    return ShardedScheduler(
+        "attestation watcher",
+        interval=_INTERVAL,
+        shards=_SHARDS,
+        load=_subscriber_roster,
+        handle=_shard,
+    )
+
+
+async def send_attestation_alerts() -> None:
+    """Follow attestation windows (or, with ``ATTESTATION_SCHEDULE=blocks``,
+    every N blocks) when a tracker runs in this process; otherwise check
+    each subscriber once per ``ATTESTATION_INTERVAL_SECONDS``, spread over
+    ``ATTESTATION_SHARDS`` ticks."""
+    tracker = get_head_tracker()
+    if tracker is not None and _SCHEDULE == "blocks":
+        await _follow_heads(tracker)
+        return
+    if tracker is not None:
+        await _follow_windows(tracker)
+        return
+    await attestation_scheduler().run_forever()
@@ -1,6 +1,5 @@
 import asyncio
 import json
-import aiohttp
 from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,26 +8,11 @@ from db_api.database import db, Users, clear_request_queue, get_account
 from data.languages import translate
 from utils.logger import logger
 from utils.cache import clear_user_cache
-from data.tg_bot import BOT_TOKEN
+from services.telegram_outbox import send_message
 
 from bot.handlers.get_tracking_info import process_full_info, process_reward_info
 from bot.handlers.info import process_validator_info
 
-TELEGRAM_API_BASE = "https://api.telegram.org/bot"
-
-async def send_message(chat_id: int, text: str):
-    """Отправка сообщения через Telegram API."""
-    url = f"{TELEGRAM_API_BASE}{BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": text,
-        "parse_mode": "HTML"
-    }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            if response.status != 200:
-                logger.error(f"Ошибка отправки сообщения: {await response.text()}")
-
 async def get_users_with_requests() -> List[Users]:
     """Получает список пользователей с активными запросами в очереди"""
     async with AsyncSession(db.engine) as session:
@@ -10,45 +10,67 @@ when unclaimed rewards cross *any* of the user's thresholds:
 
 Also optionally flags missed attestation epochs when the feature flag
 ``ATTESTATION_MONITOR_ENABLED`` is set.
+
+A cycle is one fetch plan (:func:`_run_reward_plan`): the entries of all
+users are collected first, each unique validator / delegation is read
+once, and then every user's thresholds are evaluated against the shared
+results — a staker tracked by 500 users costs one read, not 500. Users
+stream in chunks of ``USER_SCAN_CHUNK`` rows
+(:func:`db_api.database.iter_subscribed_users`), one plan per chunk
+under the cycle's pinned block; a staker shared across chunks is read
+once too, the later chunks finding it in the snapshot store.
+
+By default users are not all checked at once: each has a stable slot in
+the hour and a cycle runs every ``REWARD_INTERVAL_SECONDS / REWARD_SHARDS``
+seconds over the users whose slot came up
+(:class:`services.slot_scheduler.ShardedScheduler`).
 """
 from __future__ import annotations
 
 import asyncio
 import os
+import time
 from decimal import Decimal
 
-import aiohttp
-
 from data.languages import translate
-from data.models import get_admins, semaphore
-from data.tg_bot import BOT_TOKEN
+from data.models import get_admins
 from db_api.database import (
     clear_notifications_if_empty,
-    get_strk_notification_users,
+    get_subscriber_ids,
+    iter_subscribed_users,
 )
-from db_api.models import Users
+from db_api.models import UserRow, Users
+from services.event_follower import start_event_follower
 from services.formatting import _fmt_amount
+from services.head_tracker import EpochBoundary, HeadTracker, get_head_tracker
+from services.negative_cache import dead_addresses, negative_cache_stats
 from services.price_service import get_usd_prices, usd_value
+from services.rpc_client import (
+    concurrency_stats,
+    endpoint_pool_stats,
+    read_snapshot,
+    single_flight_stats,
+)
+from services.slot_scheduler import ShardedScheduler
 from services.staking_dto import DelegatorMultiPositions, ValidatorInfo
+from services.telegram_outbox import outbox_stats, send_message
 from services.tracking_service import (
+    TrackedItem,
     TrackingEntry,
-    fetch_tracking_entries,
+    entry_identity,
     load_tracking,
+    resolve_tracked,
     total_tracked,
+    tracked_items,
 )
 from utils.logger import logger
 
-TELEGRAM_API_BASE = "https://api.telegram.org/bot"
 _ATTESTATION_ENABLED = os.getenv("ATTESTATION_MONITOR_ENABLED", "true").lower() == "true"
-
-
-async def send_message(chat_id: int, text: str) -> None:
-    url = f"{TELEGRAM_API_BASE}{BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            if response.status != 200:
-                logger.error(f"sendMessage failed: {await response.text()}")
+# Unique entries fetched at once in a cycle's fetch phase.
+_PLAN_CONCURRENCY = int(os.getenv("REWARD_PLAN_CONCURRENCY", "64"))
+# Validator fields the digest evaluates: rewards, plus the missed-epoch
+# flag when attestation monitoring is on (see _format_missed_attestation).
+_PLAN_PROFILE = "attestation" if _ATTESTATION_ENABLED else "rewards"
 
 
 def _unclaimed_by_symbol(entry: TrackingEntry) -> dict[str, Decimal]:
@@ -151,106 +173,272 @@ def _format_missed_attestation(entry: TrackingEntry, locale: str) -> str:
     )
 
 
-async def start_parse_and_send_notification(
-    user: Users, prices: dict[str, Decimal]
-) -> None:
-    async with semaphore:
+def _render_notification(
+    user: Users | UserRow,
+    entries: list[TrackingEntry],
+    prices: dict[str, Decimal],
+) -> str | None:
+    """The reward DM for one user, or ``None`` when nothing crossed."""
+    cfg = user.get_notification_config()
+    hits: list[tuple[TrackingEntry, list[str]]] = []
+    for e in entries:
+        reasons = _evaluate_thresholds(e, cfg, prices)
+        if reasons:
+            hits.append((e, reasons))
+
+    missed = [m for m in (_format_missed_attestation(e, user.user_language) for e in entries) if m]
+
+    if not hits and not missed:
+        return None
+
+    body = f"{translate('strk_notification_msg', user.user_language)}\n"
+    for e, reasons in hits:
+        body += _format_entry_alert(e, user.user_language)
+        body += f"\n• 📌 {' · '.join(reasons)}\n"
+    if missed:
+        body += "\n" + "\n".join(missed)
+    return body
+
+
+async def _send_notification(user: Users | UserRow, body: str) -> None:
+    # No DB write here on purpose: this function only sends a message,
+    # nothing on the user row changed. ``write_to_db`` would ``merge()``
+    # every column from a snapshot that's by now several seconds stale —
+    # exactly the race that overwrites concurrent UI edits (language,
+    # thresholds, etc.). The watcher owns no field that needs updating
+    # after a reward DM. Pacing is the outbox's job
+    # (services.telegram_outbox): the whole batch can be handed over.
+    await send_message(user.user_id, body)
+
+
+async def _run_reward_plan(
+    users: list[Users | UserRow],
+    prices: dict[str, Decimal],
+    block_number: int | None = None,
+) -> dict[str, float]:
+    """Reward digest for ``users`` as a three-phase fetch plan.
+
+    1. collect every user's tracked entries and the unique set of
+       validators / (delegator, staker) pairs behind them;
+    2. fetch each unique entry once, pinned to one block, with
+       ``_PLAN_PROFILE``: ``attestation`` (rewards plus the missed-epoch
+       fields) while ``ATTESTATION_MONITOR_ENABLED`` is on, ``rewards``
+       otherwise;
+    3. evaluate every user's thresholds against the shared results
+       and send the DMs.
+
+    Returns the cycle's counters and phase timings (seconds).
+    """
+    started = time.perf_counter()
+    plan: list[tuple[Users | UserRow, list[TrackedItem]]] = []
+    refs: list[tuple[str, str, str]] = []
+    for user in users:
+        items = tracked_items(load_tracking(user.tracking_data))
+        plan.append((user, items))
+        refs.extend((kind, a1, a2) for kind, a1, a2, _ in items)
+    collected = time.perf_counter()
+
+    with read_snapshot(block_number):
+        data = await resolve_tracked(
+            refs,
+            consumer="digest",
+            profile=_PLAN_PROFILE,
+            concurrency=_PLAN_CONCURRENCY,
+            strict=False,
+        )
+    fetched = time.perf_counter()
+
+    outgoing: list[tuple[Users | UserRow, str]] = []
+    for user, items in plan:
+        entries = [
+            TrackingEntry(i, kind, a1, a2, label, data[entry_identity(kind, a1, a2)])  # type: ignore[arg-type]
+            for i, (kind, a1, a2, label) in enumerate(items)
+        ]
         try:
-            entries = await fetch_tracking_entries(user.tracking_data)
+            body = _render_notification(user, entries, prices)
         except Exception as exc:  # noqa: BLE001
-            logger.error(f"notification fetch failed for {user.user_id}: {exc}")
-            return
-
-        cfg = user.get_notification_config()
-        hits: list[tuple[TrackingEntry, list[str]]] = []
-        for e in entries:
-            reasons = _evaluate_thresholds(e, cfg, prices)
-            if reasons:
-                hits.append((e, reasons))
+            logger.error(f"notification render failed for {user.user_id}: {exc}")
+            continue
+        if body is not None:
+            outgoing.append((user, body))
+    evaluated = time.perf_counter()
+
+    await asyncio.gather(*(_send_notification(u, body) for u, body in outgoing))
+    finished = time.perf_counter()
+
+    return {
+        "users": len(plan),
+        "entries": len(refs),
+        "unique": len(data),
+        "dedup_ratio": round(len(refs) / len(data), 2) if data else 1.0,
+        "messages": len(outgoing),
+        "collect_s": round(collected - started, 3),
+        "fetch_s": round(fetched - collected, 3),
+        "evaluate_s": round(evaluated - fetched, 3),
+        "send_s": round(finished - evaluated, 3),
+    }
 
-        missed = [m for m in (_format_missed_attestation(e, user.user_language) for e in entries) if m]
 
-        if not hits and not missed:
-            return
+_REWARD_INTERVAL = int(os.getenv("REWARD_INTERVAL_SECONDS", "3600"))
+# "sharded": each user at their own slot, one small cycle per shard tick.
+# "epoch": everyone right after each epoch boundary (needs a head tracker).
+_REWARD_SCHEDULE = os.getenv("REWARD_SCHEDULE", "sharded").lower()
+# Shard ticks per interval; 1 runs one batch per interval, at its boundary.
+_REWARD_SHARDS = max(1, int(os.getenv("REWARD_SHARDS", "60")))
+# Epoch boundaries jitter by a few blocks; allow a 10% early boundary.
+_REWARD_MIN_GAP = _REWARD_INTERVAL * 0.9
+
+
+def _add_plan_stats(totals: dict[str, float], stats: dict[str, float]) -> None:
+    """Fold one chunk's :func:`_run_reward_plan` counters into the cycle's."""
+    for key, value in stats.items():
+        if key != "dedup_ratio":
+            totals[key] = round(totals.get(key, 0) + value, 3)
+    totals["chunks"] = totals.get("chunks", 0) + 1
+    unique = totals.get("unique", 0)
+    totals["dedup_ratio"] = round(totals.get("entries", 0) / unique, 2) if unique else 1.0
+
+
+async def _active_users(chunk: list[UserRow]) -> list[UserRow]:
+    """The users of ``chunk`` that still track something; the others have
+    their notifications cleared."""
+    active: list[UserRow] = []
+    for user in chunk:
+        doc = load_tracking(user.tracking_data)
+        if total_tracked(doc) == 0:
+            # Stale snapshot says "no tracked addresses" — but the
+            # user might have re-added something since. Refetch and
+            # only clear if it's *still* empty; the helper writes a
+            # targeted UPDATE so concurrent edits to other columns
+            # (language, etc.) survive.
+            locale = await clear_notifications_if_empty(user.user_id)
+            if locale is None:
+                # User added a tracked address during the cycle — leave
+                # them alone, they'll be picked up on the next pass.
+                continue
+            await send_message(
+                user.user_id,
+                translate("no_addresses_to_parse_info", locale),
+            )
+            continue
+        active.append(user)
+    return active
 
-        body = f"{translate('strk_notification_msg', user.user_language)}\n"
-        for e, reasons in hits:
-            body += _format_entry_alert(e, user.user_language)
-            body += f"\n• 📌 {' · '.join(reasons)}\n"
-        if missed:
-            body += "\n" + "\n".join(missed)
 
-        # No DB write here on purpose: this function only sends a message,
-        # nothing on the user row changed. ``write_to_db`` would ``merge()``
-        # every column from a snapshot that's by now several seconds stale —
-        # exactly the race that overwrites concurrent UI edits (language,
-        # thresholds, etc.). The watcher owns no field that needs updating
-        # after a reward DM.
-        await send_message(user.user_id, body)
+async def _notification_cycle(
+    follower,
+    block_number: int | None = None,
+    *,
+    user_ids: list[int] | None = None,
+) -> None:
+    """One reward-digest pass over every opted-in user, or one shard of them."""
+    if follower is not None:
+        # Catch up on contract events first: entries none of them
+        # touched are served from the previous cycle's snapshot.
+        try:
+            dirty = await follower.sync()
+            logger.info(f"notifications: {dirty} addresses changed, events {follower.stats()}")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"notifications: event follower sync failed: {exc!r}")
+    try:
+        totals: dict[str, float] = {}
+        prices: dict[str, Decimal] | None = None
+        # One pinned head block for the whole cycle, however many chunks
+        # it takes; only one chunk of users is held at a time.
+        with read_snapshot(block_number):
+            async for chunk in iter_subscribed_users(user_ids=user_ids):
+                active = await _active_users(chunk)
+                if not active:
+                    continue
+                if prices is None:
+                    # One CoinGecko fetch per cycle (cached for 5 min anyway).
+                    prices = await get_usd_prices()
+                _add_plan_stats(totals, await _run_reward_plan(active, prices, block_number))
+
+        logger.info(f"notifications: {int(totals.get('users', 0))} users checked")
+        if totals:
+            logger.info(f"notifications: plan {totals}")
+            logger.info(f"notifications: rpc single-flight {single_flight_stats()}")
+            dead = dead_addresses()
+            if dead:
+                logger.info(
+                    f"notifications: negative cache {negative_cache_stats()}, "
+                    f"dead addresses (misses) {dead}"
+                )
+            logger.info(f"notifications: rpc concurrency {concurrency_stats()}")
+            logger.info(f"notifications: telegram outbox {outbox_stats()}")
+            pool = endpoint_pool_stats()
+            if pool:
+                logger.info(f"notifications: rpc endpoints {pool}")
+    except Exception as exc:  # noqa: BLE001
+        admins = get_admins()
+        logger.error(f"notification loop error: {exc!r}")
+        if admins:
+            await send_message(admins[0], f"Notification loop error: {exc!r}")
+
+
+async def _follow_epochs(tracker: HeadTracker, follower) -> None:
+    """Head-driven scheduler: one digest right after an epoch boundary.
+
+    Rewards move with attestations, which are settled per epoch, so the
+    boundary is when a fresh digest says something new. Boundaries closer
+    than ``_REWARD_MIN_GAP`` to the previous digest are skipped, keeping
+    ``REWARD_INTERVAL_SECONDS`` as the cadence floor when epochs are short.
+    The first epoch seen after start-up is not a boundary we crossed, so
+    it does not fire (the wall-clock loop also waited for its first slot).
+    If no boundary arrives for 1.5 intervals (epoch info unreadable), the
+    next head fires a digest anyway.
+    """
+    last_run = time.monotonic()
+    first = True
+    async for event in tracker.subscribe():
+        now = time.monotonic()
+        if isinstance(event, EpochBoundary):
+            if event.previous is None or (not first and now - last_run < _REWARD_MIN_GAP):
+                continue
+            logger.info(f"notifications: epoch {event.epoch} opened at block {event.block_number}")
+            block = event.block_number
+        elif now - last_run >= _REWARD_INTERVAL * 1.5:
+            logger.warning("notifications: no epoch boundary seen, firing on head")
+            block = event.number
+        else:
+            continue
+        first = False
+        last_run = now
+        await _notification_cycle(follower, block)
 
 
-import time
+async def _notification_roster() -> list[int]:
+    return await get_subscriber_ids()
 
-_REWARD_INTERVAL = int(os.getenv("REWARD_INTERVAL_SECONDS", "3600"))
 
+def reward_scheduler(follower) -> ShardedScheduler[int]:
+    """The notifier's sharded schedule: each opted-in user once per interval."""
 
-def _sleep_until_next_boundary(interval: int) -> float:
-    """Seconds until the next wall-clock interval boundary (UTC).
+    async def _shard(user_ids: list[int]) -> None:
+        await _notification_cycle(follower, user_ids=user_ids)
 
-    For ``interval=3600`` returns the seconds-until-the-next-xx:00:00 hour
-    edge. For ``interval=60`` returns the seconds-until-the-next-xx:xx:00
-    minute edge. Uses ``time.time()`` (Unix epoch, always UTC) so the
-    container's TZ doesn't matter.
-    """
-    return interval - (time.time() % interval)
+    return ShardedScheduler(
+        "notifications",
+        interval=_REWARD_INTERVAL,
+        shards=_REWARD_SHARDS,
+        load=_notification_roster,
+        handle=_shard,
+    )
 
 
 async def send_strk_notification() -> None:
-    """Wall-clock-aligned scheduler.
+    """Sharded by default; epoch-boundary driven with ``REWARD_SCHEDULE=epoch``
+    and a head tracker in this process.
 
-    Fires every full hour at xx:00 UTC instead of "an hour after the bot
-    booted". Cycle work happens during the slot that follows each boundary.
-    If the cycle overruns into the next slot, the next tick still aligns to
-    the following xx:00 — we never fire back-to-back.
+    Sharded mode checks each user at their own slot in the interval, a
+    small batch every shard tick (see :mod:`services.slot_scheduler`), so
+    the RPC and Telegram load is a steady stream instead of an xx:00 burst
+    and an overrunning shard only delays the next one.
     """
-    # First sleep aligns us to the next boundary, so subsequent ticks land
-    # on round hours rather than the start-up offset.
-    await asyncio.sleep(_sleep_until_next_boundary(_REWARD_INTERVAL))
-    while True:
-        try:
-            users = await get_strk_notification_users()
-            active: list[Users] = []
-            for user in users or []:
-                doc = load_tracking(user.tracking_data)
-                if total_tracked(doc) == 0:
-                    # Stale snapshot says "no tracked addresses" — but the
-                    # user might have re-added something since. Refetch and
-                    # only clear if it's *still* empty; the helper writes a
-                    # targeted UPDATE so concurrent edits to other columns
-                    # (language, etc.) survive.
-                    locale = await clear_notifications_if_empty(user.user_id)
-                    if locale is None:
-                        # User added a tracked address during the cycle — leave
-                        # them alone, they'll be picked up on the next pass.
-                        continue
-                    await send_message(
-                        user.user_id,
-                        translate("no_addresses_to_parse_info", locale),
-                    )
-                    continue
-                active.append(user)
-
-            logger.info(f"notifications: {len(active)} users to check")
-            if active:
-                # One CoinGecko fetch per cycle (cached for 5 min anyway).
-                prices = await get_usd_prices()
-                await asyncio.gather(
-                    *(start_parse_and_send_notification(u, prices) for u in active)
-                )
-        except Exception as exc:  # noqa: BLE001
-            admins = get_admins()
-            logger.error(f"notification loop error: {exc!r}")
-            if admins:
-                await send_message(admins[0], f"Notification loop error: {exc!r}")
-
-        await asyncio.sleep(_sleep_until_next_boundary(_REWARD_INTERVAL))
+    follower = start_event_follower("notifier")
+    tracker = get_head_tracker()
+    if tracker is not None and _REWARD_SCHEDULE == "epoch":
+        await _follow_epochs(tracker, follower)
+        return
+    await reward_scheduler(follower).run_forever()
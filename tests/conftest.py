@@ -2,12 +2,22 @@
 from __future__ import annotations
 
 import os
+import tempfile
 
 # Set BEFORE any project import so data.contracts / data.tg_bot don't abort.
 os.environ.setdefault("BOT_TOKEN", "12345:fake-test-token")
 os.environ.setdefault("STARKNET_RPC_URL", "https://rpc.starknet.lava.build")
 os.environ.setdefault("STARKNET_NETWORK", "mainnet")
 os.environ.setdefault("API_AUTH_MODE", "local")
+# The API startup hook would otherwise start following chain events.
+os.environ.setdefault("EVENT_FOLLOWER", "0")
+# Keep the shared SQLite cache and token registry out of the repo's files/.
+os.environ.setdefault(
+    "SHARED_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "shared_cache.db")
+)
+os.environ.setdefault(
+    "TOKEN_REGISTRY_PATH", os.path.join(tempfile.mkdtemp(), "token_registry.json")
+)
 
 import pytest  # noqa: E402
 
@@ -15,3 +25,17 @@ import pytest  # noqa: E402
 @pytest.fixture
 def strk_token_address() -> str:
     return "0x04718f5a0fc34cc1af16a1cdee98ffb20c31f5cd61d6ab07201858f4287c938d"
+
+
+@pytest.fixture(autouse=True)
+def _empty_snapshot_store():
+    """Tests reuse addresses; never let one test's DTOs (or remembered
+    "does not exist" answers) answer another's."""
+    from services.negative_cache import absent
+    from services.snapshot_store import snapshots
+
+    snapshots.clear()
+    absent.clear()
+    yield
+    snapshots.clear()
+    absent.clear()
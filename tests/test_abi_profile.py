@@ -0,0 +1,59 @@
+"""Tests for the trimmed ABI profiles in :mod:`data.abi_profile`."""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+from starknet_py.contract import Contract
+from starknet_py.net.full_node_client import FullNodeClient
+
+from data.abi_profile import ABI_PROFILES, load_profiled_abi, trim_abi
+from data.contracts import load_abi
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Which ABI files each service builds ``Contract`` objects from.
+SERVICE_ABIS = {
+    "services/staking_service.py": ("l2_staking_contract", "l2_pool_contract"),
+    "services/attestation_service.py": ("l2_attestation_contract",),
+}
+
+_CALLED = re.compile(r"""functions\[\s*["'](\w+)["']\s*\]""")
+
+
+@pytest.mark.parametrize("module", sorted(SERVICE_ABIS))
+def test_every_called_function_is_in_the_profile(module: str) -> None:
+    called = set(_CALLED.findall((ROOT / module).read_text(encoding="utf-8")))
+    assert called, f"no Contract calls found in {module}"
+    profiled = {fn for abi in SERVICE_ABIS[module] for fn in ABI_PROFILES[abi]}
+
+    missing = called - profiled
+    assert not missing, f"{module} calls {sorted(missing)} outside its ABI profile"
+
+
+@pytest.mark.parametrize("name", sorted(ABI_PROFILES))
+def test_trimmed_abi_builds_a_contract_with_the_profile(name: str) -> None:
+    trimmed = load_profiled_abi(name)
+    contract = Contract(
+        address=1, abi=trimmed, provider=FullNodeClient(node_url="http://node.invalid")
+    )
+
+    assert set(contract.functions) == set(ABI_PROFILES[name])
+    assert len(trimmed) < len(load_abi(name))
+
+
+def test_trim_keeps_nested_types() -> None:
+    trimmed = trim_abi(load_abi("l2_pool_contract"), ["get_pool_member_info_v1"])
+    names = {e["name"] for e in trimmed if e["type"] in ("struct", "enum")}
+
+    assert "staking::pool::interface::PoolMemberInfoV1" in names
+    assert "core::option::Option::<staking::pool::interface::PoolMemberInfoV1>" in names
+    # Reached only through PoolMemberInfoV1.unpool_time.
+    assert "starkware_utils::time::time::Timestamp" in names
+    assert not any(e["type"] == "event" for e in trimmed)
+
+
+def test_trim_rejects_unknown_function() -> None:
+    with pytest.raises(ValueError, match="no_such_view"):
+        trim_abi(load_abi("l2_attestation_contract"), ["no_such_view"])
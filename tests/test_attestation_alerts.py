@@ -249,3 +249,109 @@ async def test_legacy_state_migrates_on_read() -> None:
     cfg = user.get_notification_config()
     assert cfg["_operator_balance_was_below"] == {STAKER: True}
     assert "_operator_balance_state" not in cfg
+
+
+@pytest.mark.asyncio
+async def test_epoch_flip_reaches_every_shard() -> None:
+    """Sharded wall-clock schedule: users checked in later shards of the
+    same epoch still get their one boundary check."""
+    from tasks.attestation_alerts import _run_checks
+
+    first, second = _make_user(was_below=False), _make_user(was_below=False)
+    second.user_id = 43
+    check = AsyncMock(return_value=(None, None))
+    with patch("tasks.attestation_alerts._check_user", new=check):
+        await _run_checks([first], current_epoch=9591)
+        await _run_checks([second], current_epoch=9591)
+        await _run_checks([first, second], current_epoch=9591)
+
+    flags = [(c.args[0].user_id, c.kwargs["epoch_changed"]) for c in check.await_args_list]
+    assert flags == [(42, True), (43, True), (42, False), (43, False)]
+
+
+@pytest.mark.asyncio
+async def test_shared_staker_is_read_once_per_tick() -> None:
+    """Forty subscribers of one staker: one status read, one balance read,
+    forty low-balance DMs."""
+    from services.staking_dto import AttestationStatus
+    from tasks.attestation_alerts import _run_checks
+
+    users = []
+    for i in range(40):
+        u = _make_user(was_below=False)
+        u.user_id = 100 + i
+        users.append(u)
+    status = AttestationStatus(
+        last_epoch_attested=7770,
+        current_epoch=7771,
+        missed_epochs=0,
+        is_attesting_this_epoch=True,
+    )
+    with (
+        patch(
+            "tasks.attestation_alerts.fetch_strk_balance",
+            new=AsyncMock(return_value=Decimal("1")),
+        ) as balance,
+        patch(
+            "tasks.attestation_alerts.fetch_staker_raw",
+            new=AsyncMock(return_value={"operational_address": int(OP_ADDR, 16)}),
+        ) as staker_raw,
+        patch(
+            "tasks.attestation_alerts.fetch_attestation_status",
+            new=AsyncMock(return_value=status),
+        ) as att,
+        patch("tasks.attestation_alerts.update_operator_balance_was_below", new=AsyncMock()),
+        patch("tasks.attestation_alerts._send", new=AsyncMock()) as mock_send,
+    ):
+        await _run_checks(users, current_epoch=7771, epoch_changed=True)
+
+    assert att.await_count == staker_raw.await_count == balance.await_count == 1
+    assert sorted(c.args[0] for c in mock_send.await_args_list) == list(range(100, 140))
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_share_the_tick_reads() -> None:
+    """A cycle over three chunks of subscribers reads their shared staker
+    once and checks every user with the projected rows."""
+    from db_api.models import UserRow
+    from services.staking_dto import AttestationStatus
+    from tasks.attestation_alerts import _run_cycle
+
+    rows = []
+    for i in range(6):
+        u = _make_user(was_below=False)
+        rows.append(
+            UserRow(100 + i, "en", u.tracking_data, u.notification_config, None)
+        )
+
+    async def _chunks(kinds, user_ids):
+        for start in range(0, len(rows), 2):
+            yield rows[start:start + 2]
+
+    status = AttestationStatus(
+        last_epoch_attested=7770,
+        current_epoch=7771,
+        missed_epochs=0,
+        is_attesting_this_epoch=True,
+    )
+    with (
+        patch("tasks.attestation_alerts.iter_subscribed_users", new=_chunks),
+        patch(
+            "tasks.attestation_alerts.fetch_strk_balance",
+            new=AsyncMock(return_value=Decimal("1")),
+        ) as balance,
+        patch(
+            "tasks.attestation_alerts.fetch_staker_raw",
+            new=AsyncMock(return_value={"operational_address": int(OP_ADDR, 16)}),
+        ),
+        patch(
+            "tasks.attestation_alerts.fetch_attestation_status",
+            new=AsyncMock(return_value=status),
+        ) as att,
+        patch("tasks.attestation_alerts.update_operator_balance_was_below", new=AsyncMock()),
+        patch("tasks.attestation_alerts._send", new=AsyncMock()) as mock_send,
+    ):
+        await _run_cycle(current_epoch=7771, epoch_changed=True)
+
+    assert att.await_count == balance.await_count == 1
+    assert sorted(c.args[0] for c in mock_send.await_args_list) == list(range(100, 106))
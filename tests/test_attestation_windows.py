@@ -0,0 +1,130 @@
+"""Read plan of :class:`services.attestation_windows.AttestationWindows`."""
+from __future__ import annotations
+
+from collections import Counter
+
+from services.attestation_windows import AttestationWindows
+from services.staking_dto import AttestationStatus
+
+_WINDOW = 16
+
+
+class _Chain:
+    """Fake readers over one epoch; counts every node read."""
+
+    def __init__(self, targets: dict[str, int | None], attests_at: dict[str, int]) -> None:
+        self.targets = targets
+        self.attests_at = attests_at
+        self.head = 0
+        self.last_attested = {s: 9 for s in targets}
+        self.reads: Counter[str] = Counter()
+
+    def windows(self, **kwargs) -> AttestationWindows:
+        kwargs.setdefault("open_poll_blocks", 5)
+        kwargs.setdefault("target_retry_blocks", 30)
+        return AttestationWindows(
+            fetch_operational=self._operational,
+            fetch_target=self._target,
+            fetch_window=self._window,
+            fetch_attested=self._attested,
+            fetch_status=self._status,
+            **kwargs,
+        )
+
+    def _attested_now(self, staker: str) -> bool:
+        at = self.attests_at.get(staker)
+        return at is not None and self.head >= at
+
+    async def _operational(self, staker: str) -> str | None:
+        self.reads[staker] += 1
+        return f"op-{staker}"
+
+    async def _target(self, operational: str) -> int | None:
+        staker = operational.removeprefix("op-")
+        self.reads[staker] += 1
+        return self.targets[staker]
+
+    async def _window(self) -> int:
+        return _WINDOW
+
+    async def _attested(self, staker: str) -> bool:
+        self.reads[staker] += 1
+        return self._attested_now(staker)
+
+    async def _status(self, staker: str, epoch: int) -> AttestationStatus:
+        self.reads[staker] += 2
+        attested = self._attested_now(staker)
+        last = epoch if attested else self.last_attested[staker]
+        return AttestationStatus(
+            last_epoch_attested=last,
+            current_epoch=epoch,
+            missed_epochs=max(0, epoch - last - 1),
+            is_attesting_this_epoch=attested,
+        )
+
+
+async def _run_epoch(
+    chain: _Chain, windows: AttestationWindows, *, epoch: int, start: int, length: int
+) -> tuple[dict[str, AttestationStatus], dict[str, tuple[int, AttestationStatus]]]:
+    chain.head = start
+    settled = await windows.start_epoch(epoch, start, chain.targets)
+    decided: dict[str, tuple[int, AttestationStatus]] = {}
+    for head in range(start + 1, start + length):
+        chain.head = head
+        wake = windows.next_wake()
+        if wake is not None and head >= wake:
+            for staker, status in (await windows.on_head(head)).items():
+                decided[staker] = (head, status)
+    return settled, decided
+
+
+async def test_early_attestation_stops_polling() -> None:
+    chain = _Chain({"0xa": 100}, attests_at={"0xa": 103})
+    windows = chain.windows()
+    _, decided = await _run_epoch(chain, windows, epoch=10, start=50, length=200)
+    head, status = decided["0xa"]
+    assert head == 105  # first poll after the target block
+    assert status.is_attesting_this_epoch and status.missed_epochs == 0
+    assert chain.reads["0xa"] == 3  # operational + target + one poll
+    assert windows.next_wake() is None
+
+
+async def test_miss_is_decided_right_after_window_closes() -> None:
+    chain = _Chain({"0xa": 100}, attests_at={})
+    windows = chain.windows()
+    _, decided = await _run_epoch(chain, windows, epoch=10, start=50, length=200)
+    head, status = decided["0xa"]
+    assert head == 100 + _WINDOW + 1
+    assert not status.is_attesting_this_epoch
+    # Last attested epoch 9, epoch 10 lost: it counts as missed already.
+    assert status.missed_epochs == 1
+    # 2 planning + polls at 105, 110, 115 + decisive status (2).
+    assert chain.reads["0xa"] == 7
+
+
+async def test_unreadable_target_is_retried_then_settled_next_epoch() -> None:
+    chain = _Chain({"0xa": None}, attests_at={})
+    windows = chain.windows(target_retry_blocks=40)
+    _, decided = await _run_epoch(chain, windows, epoch=10, start=0, length=100)
+    assert decided == {}
+    # Planned at 0; retried at 40 and 80 with the operator address cached.
+    assert chain.reads["0xa"] == 2 + 1 + 1
+
+    chain.targets["0xa"] = 150
+    settled, _ = await _run_epoch(chain, windows, epoch=11, start=100, length=1)
+    assert settled["0xa"].last_epoch_attested == 9
+    assert windows.plans["0xa"].target_block == 150
+
+
+async def test_reads_per_staker_are_a_fraction_of_the_block_cadence() -> None:
+    epoch_len, stakers = 231, 50
+    targets = {f"0x{i:x}": 10 + (i * 4) % (epoch_len - _WINDOW - 20) for i in range(stakers)}
+    attests = {s: t + 2 for s, t in list(targets.items())[: stakers * 9 // 10]}
+    chain = _Chain(targets, attests_at=attests)
+    windows = chain.windows(open_poll_blocks=10)
+    await _run_epoch(chain, windows, epoch=10, start=0, length=epoch_len)
+
+    per_staker = sum(chain.reads.values()) / stakers
+    # Every-10-blocks cadence: 23 checks of 2 reads per staker and epoch.
+    assert per_staker <= 5
+    assert per_staker * 9 < (epoch_len // 10) * 2
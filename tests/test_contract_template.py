@@ -0,0 +1,131 @@
+"""Tests for :mod:`services.contract_template`: handles, pool template, disk cache."""
+from __future__ import annotations
+
+import asyncio
+
+from starknet_py.contract import Contract
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.full_node_client import FullNodeClient
+
+from data.contracts import load_abi
+from services import contract_template, staking_service
+from services.contract_template import ContractTemplate
+
+
+class _RecordingClient(FullNodeClient):
+    """Offline client: records ``call_contract`` and returns fixed felts."""
+
+    def __init__(self, result: list[int]) -> None:
+        super().__init__(node_url="http://node.invalid")
+        self.result = result
+        self.calls: list = []
+
+    async def call_contract(self, call, block_hash=None, block_number=None):
+        self.calls.append((call, block_hash, block_number))
+        return list(self.result)
+
+
+def _pool_abi() -> list:
+    # The trimmed pool ABI without the ``impl`` entry starknet-py needs to
+    # expose interface functions.
+    abi = list(load_abi("l2_pool_contract_min"))
+    interface = next(e["name"] for e in abi if e["type"] == "interface")
+    return [{"type": "impl", "name": "PoolImpl", "interface_name": interface}, *abi]
+
+
+_MEMBER_FELTS = [0, 0x11, 100, 5, 300, 20, 0, 1800]
+
+
+async def test_handle_calls_match_a_full_contract() -> None:
+    abi = _pool_abi()
+    client = _RecordingClient(_MEMBER_FELTS)
+    template = ContractTemplate(abi, provider=client)
+    reference = Contract(address=0xABC, abi=abi, provider=client)
+
+    via_handle = await template.bind("0xabc").functions["get_pool_member_info_v1"].call(
+        0x77, block_number=123
+    )
+    via_contract = await reference.functions["get_pool_member_info_v1"].call(
+        0x77, block_number=123
+    )
+
+    assert via_handle == via_contract
+    (handle_call, _, block), (contract_call, _, _) = client.calls
+    assert block == 123
+    assert handle_call.to_addr == contract_call.to_addr == 0xABC
+    assert handle_call.selector == get_selector_from_name("get_pool_member_info_v1")
+    assert handle_call.calldata == contract_call.calldata == [0x77]
+
+
+def test_handles_share_one_template() -> None:
+    template = ContractTemplate(_pool_abi(), provider=_RecordingClient([]))
+    handles = [template.bind(i + 1) for i in range(1000)]
+
+    assert {h.template for h in handles} == {template}
+    assert handles[41].address == 42
+    assert "contract_parameters_v1" in handles[0].functions
+    assert not hasattr(handles[0], "__dict__")
+
+
+async def test_pool_template_is_built_once_under_concurrency(monkeypatch) -> None:
+    builds = 0
+    template = ContractTemplate(_pool_abi(), provider=_RecordingClient([]))
+
+    def _build() -> ContractTemplate:
+        nonlocal builds
+        builds += 1
+        return template
+
+    monkeypatch.setattr(staking_service, "_pool_template", None)
+    monkeypatch.setattr(staking_service, "_build_pool_template", _build)
+
+    handles = await asyncio.gather(
+        *(staking_service._pool_contract_async(hex(i + 1)) for i in range(20))
+    )
+
+    assert builds == 1
+    assert [h.address for h in handles] == list(range(1, 21))
+
+
+# ---------------------------------------------------------------------------
+# On-disk serializer cache
+# ---------------------------------------------------------------------------
+
+
+def test_serializer_cache_round_trip(tmp_path, monkeypatch) -> None:
+    abi = _pool_abi()
+    client = _RecordingClient(_MEMBER_FELTS)
+    cold = contract_template.load_serializers(abi, client, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("abi-*.pickle"))) == 1
+
+    def _no_parse(*_a, **_kw):
+        raise AssertionError("warm load must not parse the ABI")
+
+    monkeypatch.setattr(contract_template, "parse_serializers", _no_parse)
+    warm = ContractTemplate.cached(abi, client, cache_dir=tmp_path)
+
+    assert set(warm.function_names) == set(cold)
+    (felts_cold,) = cold["get_pool_member_info_v1"].deserialize(_MEMBER_FELTS)
+    (felts_warm,) = warm._serializers["get_pool_member_info_v1"].deserialize(_MEMBER_FELTS)
+    assert felts_warm == felts_cold
+
+
+def test_serializer_cache_key_follows_abi_content() -> None:
+    abi = _pool_abi()
+    changed = [*abi[:-1], {**abi[-1], "name": abi[-1]["name"] + "X"}]
+
+    assert contract_template.abi_cache_key(abi) == contract_template.abi_cache_key(list(abi))
+    assert contract_template.abi_cache_key(abi) != contract_template.abi_cache_key(changed)
+
+
+def test_corrupt_cache_file_is_rebuilt(tmp_path) -> None:
+    abi = _pool_abi()
+    path = tmp_path / f"abi-{contract_template.abi_cache_key(abi)}.pickle"
+    path.write_bytes(b"not a pickle")
+
+    serializers = contract_template.load_serializers(
+        abi, _RecordingClient([]), cache_dir=tmp_path
+    )
+
+    assert "get_pool_member_info_v1" in serializers
+    assert path.read_bytes() != b"not a pickle"
@@ -0,0 +1,267 @@
+"""EventFollower against a recorded ``starknet_getEvents`` fixture.
+
+``fixtures/starknet_events.json`` holds mainnet-shaped events (real
+selectors and contract addresses, made-up stakers / members) for blocks
+1001..1010. The fake client filters and paginates them the way a node
+does, including continuation tokens.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from services import event_follower as ef
+from services import tracking_service as ts
+from services.event_follower import (
+    ATTESTATION_RULES,
+    POOL_RULES,
+    STAKING_RULES,
+    EventFollower,
+    EventSource,
+    member_key,
+    staker_key,
+)
+
+FIXTURE = json.loads(
+    (Path(__file__).parent / "fixtures" / "starknet_events.json").read_text()
+)
+
+
+class _RecordedNode:
+    def __init__(self, head: int = FIXTURE["head"]) -> None:
+        self.head = head
+        self.epoch = 7
+        self.calls: list[dict] = []
+
+    async def get_block_number(self) -> int:
+        return self.head
+
+    async def get_events(
+        self, address=None, keys=None, *, from_block_number, to_block_number,
+        continuation_token=None, chunk_size=1,
+    ):
+        self.calls.append({"address": address, "from": from_block_number, "to": to_block_number})
+        matching = [
+            e for e in FIXTURE["events"]
+            if from_block_number <= e["block_number"] <= to_block_number
+            and (address is None or int(e["from_address"], 16) == address)
+            and (keys is None or int(e["keys"][0], 16) in keys[0])
+        ]
+        start = int(continuation_token or 0)
+        page = matching[start : start + chunk_size]
+        more = start + chunk_size < len(matching)
+        return SimpleNamespace(
+            events=[SimpleNamespace(**e) for e in page],
+            continuation_token=str(start + chunk_size) if more else None,
+        )
+
+
+def _sources() -> list[EventSource]:
+    return [
+        EventSource("staking", int(FIXTURE["staking_contract"], 16), STAKING_RULES),
+        EventSource("attestation", int(FIXTURE["attestation_contract"], 16), ATTESTATION_RULES),
+        EventSource("pools", None, POOL_RULES),
+    ]
+
+
+def _follower(node: _RecordedNode, path: Path, **kw) -> EventFollower:
+    async def _epoch() -> int:
+        return node.epoch
+
+    return EventFollower(
+        lambda: node, _sources(), path, epoch_source=_epoch, chunk_size=2, **kw
+    )
+
+
+def _write_cursor(path: Path, cursor: int, epoch: int = 7) -> None:
+    path.write_text(json.dumps({"cursor": cursor, "epoch": epoch, "touched": {}}))
+
+
+async def test_first_sync_marks_everything_and_sets_cursor(tmp_path) -> None:
+    node = _RecordedNode()
+    follower = _follower(node, tmp_path / "cursor.json")
+    assert not follower.is_fresh([staker_key("0x1")], 0)
+
+    await follower.sync()
+
+    assert follower.cursor == 1010
+    assert node.calls == []  # nothing to replay without a cursor
+    assert not follower.is_fresh([staker_key("0x1")], 1009)
+    assert follower.is_fresh([staker_key("0x1")], 1010)
+
+
+async def test_replay_marks_only_touched_addresses(tmp_path) -> None:
+    node = _RecordedNode()
+    path = tmp_path / "cursor.json"
+    _write_cursor(path, 1000)
+    follower = _follower(node, path)
+
+    dirty = await follower.sync()
+
+    assert follower.touched == {
+        staker_key("0x1111"): 1007,
+        staker_key("0x2222"): 1005,
+        member_key("0xaaaa"): 1003,
+        member_key("0xbbbb"): 1007,
+    }
+    assert dirty == 4
+    # Staking / attestation are address-filtered, pools run one keyed stream.
+    assert {c["address"] for c in node.calls} == {
+        int(FIXTURE["staking_contract"], 16),
+        int(FIXTURE["attestation_contract"], 16),
+        None,
+    }
+    assert all(c["from"] == 1001 and c["to"] == 1010 for c in node.calls)
+    # Continuation tokens were followed (chunk_size=2, 5 staking events).
+    assert sum(c["address"] == int(FIXTURE["staking_contract"], 16) for c in node.calls) == 2
+
+    # Entry read at block 1004: staker 0x1111 moved again at 1007.
+    assert not follower.is_fresh([staker_key("0x1111")], 1004)
+    assert follower.is_fresh([staker_key("0x2222")], 1005)
+    assert follower.is_fresh([staker_key("0x3333")], 1000)  # other contract
+    assert not follower.is_fresh([member_key("0xaaaa"), staker_key("0x4444")], 1000)
+
+
+async def test_dirty_keys_are_passed_to_hook(tmp_path) -> None:
+    node = _RecordedNode()
+    path = tmp_path / "cursor.json"
+    _write_cursor(path, 1000)
+    seen: list[set[str]] = []
+
+    async def _hook(keys: set[str]) -> None:
+        seen.append(keys)
+
+    follower = _follower(node, path, on_dirty=_hook)
+    await follower.sync()
+    assert seen == [{
+        staker_key("0x1111"), staker_key("0x2222"),
+        member_key("0xaaaa"), member_key("0xbbbb"),
+    }]
+
+    await follower.sync()  # nothing new: hook not called
+    assert len(seen) == 1
+
+
+async def test_state_survives_restart(tmp_path) -> None:
+    node = _RecordedNode()
+    path = tmp_path / "cursor.json"
+    _write_cursor(path, 1000)
+    await _follower(node, path).sync()
+
+    reloaded = _follower(node, path)
+    assert reloaded.cursor == 1010
+    assert reloaded.touched[staker_key("0x1111")] == 1007
+
+    node.calls.clear()
+    node.head = 1012
+    await reloaded.sync()
+    assert {(c["from"], c["to"]) for c in node.calls} == {(1011, 1012)}
+
+
+async def test_epoch_rollover_and_long_gap_mark_everything(tmp_path) -> None:
+    node = _RecordedNode()
+    path = tmp_path / "cursor.json"
+    _write_cursor(path, 1009)
+    follower = _follower(node, path)
+    await follower.sync()
+    assert follower.is_fresh([staker_key("0x5")], 1009)
+
+    node.epoch = 8
+    node.head = 1011
+    await follower.sync()
+    assert not follower.is_fresh([staker_key("0x5")], 1010)
+    # Dominated per-address marks are dropped.
+    assert set(follower.touched) == {ef.GLOBAL}
+
+    node.head = 1011 + 10
+    follower.max_catchup_blocks = 5
+    node.calls.clear()
+    await follower.sync()
+    assert node.calls == []
+    assert follower.touched[ef.GLOBAL] == 1021
+
+
+async def test_rpc_error_leaves_cursor(tmp_path) -> None:
+    node = _RecordedNode()
+    path = tmp_path / "cursor.json"
+    _write_cursor(path, 1000)
+    follower = _follower(node, path)
+
+    async def _boom(*a, **k):
+        raise ConnectionError("node down")
+
+    node.get_events = _boom
+    with pytest.raises(ConnectionError):
+        await follower.sync()
+    assert follower.cursor == 1000
+    assert not follower.synced
+
+
+async def test_tracking_entries_reuse_snapshot_for_untouched(tmp_path, monkeypatch) -> None:
+    node = _RecordedNode()
+    path = tmp_path / "cursor.json"
+    _write_cursor(path, 1000)
+    node.head = 1000
+    follower = _follower(node, path)
+    await follower.sync()
+
+    monkeypatch.setattr(ef, "_follower", follower)
+    reads: list[str] = []
+
+    async def _validator(addr: str):
+        reads.append(addr)
+        return SimpleNamespace(staker_address=addr)
+
+    async def _positions(staker: str, delegator: str):
+        reads.append(f"{delegator}@{staker}")
+        return SimpleNamespace(staker_address=staker)
+
+    monkeypatch.setattr(ts, "get_validator_info", _validator)
+    monkeypatch.setattr(ts, "get_delegator_positions", _positions)
+    doc = json.dumps({
+        "validators": [{"address": "0x1111"}, {"address": "0x5555"}],
+        "delegations": [
+            {"delegator": "0xaaaa", "staker": "0x6666"},
+            {"delegator": "0x7777", "staker": "0x6666"},
+        ],
+    })
+
+    await ts.fetch_tracking_entries(doc)
+    assert len(reads) == 4
+
+    reads.clear()
+    node.head = FIXTURE["head"]
+    await follower.sync()
+    entries = await ts.fetch_tracking_entries(doc)
+
+    # 0x1111 (staker events) and member 0xaaaa (pool event) re-read only.
+    assert reads == ["0x1111", "0xaaaa@0x6666"]
+    assert [e.address for e in entries] == ["0x1111", "0x5555", "0xaaaa", "0x7777"]
+    assert all(e.data is not None for e in entries)
+
+
+async def test_tracking_entries_fall_back_to_budget_without_follower(monkeypatch) -> None:
+    from services.snapshot_store import SnapshotStore
+
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(ts, "snapshots", SnapshotStore(clock=lambda: clock.now))
+    monkeypatch.setattr(ef, "_follower", None)
+    reads: list[str] = []
+
+    async def _validator(addr: str):
+        reads.append(addr)
+        return SimpleNamespace(staker_address=addr)
+
+    monkeypatch.setattr(ts, "get_validator_info", _validator)
+    doc = json.dumps({"validators": [{"address": "0x1111"}], "delegations": []})
+    await ts.fetch_tracking_entries(doc, consumer="digest")
+    clock.now = 30.0
+    await ts.fetch_tracking_entries(doc, consumer="digest")
+    assert reads == ["0x1111"]  # within the digest's budget
+
+    clock.now = 10_000.0  # past budget and stale allowance
+    await ts.fetch_tracking_entries(doc, consumer="digest")
+    assert reads == ["0x1111", "0x1111"]
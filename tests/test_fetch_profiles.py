@@ -0,0 +1,124 @@
+"""Named fetch profiles: which sub-reads ``get_validator_info`` runs."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from services import attestation_service as att
+from services import staking_service as ss
+from services import token_service
+from services import tracking_service as ts
+from services.token_service import TokenInfo
+
+STAKER = "0x" + "1" * 63
+OPERATOR = "0x" + "2" * 63
+POOL = "0x" + "3" * 63
+STRK = "0x" + "4" * 63
+
+
+@pytest.fixture
+def reads(monkeypatch) -> list[str]:
+    """Fake every node read the validator / delegator paths make, logging each."""
+    log: list[str] = []
+
+    def _fake(name, value):
+        async def _read(*args, **kwargs):
+            log.append(name)
+            return value
+
+        return _read
+
+    monkeypatch.setattr(
+        ss,
+        "fetch_staker_raw",
+        _fake("staker", {"operational_address": int(OPERATOR, 16), "amount_own": 0}),
+    )
+    monkeypatch.setattr(
+        ss,
+        "fetch_staker_pools_raw",
+        _fake(
+            "pools",
+            {
+                "commission": 500,
+                "pools": [
+                    {"pool_contract": int(POOL, 16), "token_address": int(STRK, 16), "amount": 0}
+                ],
+            },
+        ),
+    )
+    monkeypatch.setattr(ss, "fetch_current_epoch", _fake("epoch", 10))
+    monkeypatch.setattr(ss, "fetch_epoch_info", _fake("epoch_info", None))
+    monkeypatch.setattr(ss, "fetch_current_block_number", _fake("head", 1000))
+    monkeypatch.setattr(ss, "fetch_pool_member_raw", _fake("member", {"amount": 5}))
+    monkeypatch.setattr(ss, "fetch_pool_parameters_raw", _fake("pool_params", {}))
+    monkeypatch.setattr(att, "fetch_last_epoch_attested", _fake("last_attested", 8))
+    monkeypatch.setattr(att, "fetch_is_attesting_this_epoch", _fake("attesting", False))
+    monkeypatch.setattr(att, "fetch_target_attestation_block", _fake("target", 990))
+    monkeypatch.setattr(att, "fetch_attestation_window", _fake("window", 16))
+    monkeypatch.setattr(att, "fetch_current_block_number", _fake("head", 1000))
+    monkeypatch.setattr(token_service, "fetch_strk_balance", _fake("balance", Decimal(1)))
+
+    async def _tokens(addresses):
+        return [TokenInfo(address=a, symbol="STRK", decimals=18) for a in addresses]
+
+    async def _token(address):
+        return TokenInfo(address=address, symbol="STRK", decimals=18)
+
+    monkeypatch.setattr(ss.token_registry, "get_many", _tokens)
+    monkeypatch.setattr(ss.token_registry, "get", _token)
+    return log
+
+
+@pytest.mark.parametrize(
+    ("profile", "expected"),
+    [
+        ("rewards", ["epoch", "pools", "staker"]),
+        ("attestation", ["attesting", "epoch", "last_attested", "pools", "staker"]),
+    ],
+)
+async def test_narrow_profiles_run_only_their_reads(reads, profile, expected) -> None:
+    info = await ss.get_validator_info(STAKER, profile=profile)
+    assert sorted(reads) == expected
+    assert info.operator_strk_balance is None and info.epoch_timeline is None
+    if profile == "attestation":
+        assert info.attestation.missed_epochs == 1
+        assert info.attestation.current_block is None
+    else:
+        assert info.attestation is None
+
+
+async def test_full_profile_reads_everything(reads) -> None:
+    info = await ss.get_validator_info(STAKER)
+    assert len(reads) == 11
+    assert {"target", "window", "balance", "epoch_info"} <= set(reads)
+    assert info.attestation.target_block == 990
+    assert info.operator_strk_balance == Decimal(1)
+    with pytest.raises(ValueError):
+        await ss.get_validator_info(STAKER, profile="nightly")
+
+
+async def test_delegator_positions_reuse_listed_pool_token(reads) -> None:
+    result = await ss.get_delegator_positions(STAKER, "0x5")
+    assert sorted(reads) == ["member", "pools"]
+    assert result.positions[0].token_address == ss._addr_hex(int(STRK, 16))
+
+    reads.clear()
+    await ss.get_delegator_info(POOL, "0x5")
+    assert sorted(reads) == ["member", "pool_params"]
+
+
+async def test_narrow_profile_snapshot_not_served_to_cards(monkeypatch) -> None:
+    seen: list[dict] = []
+
+    async def _get_validator_info(addr: str, **kwargs):
+        seen.append(kwargs)
+        return None if kwargs else object()
+
+    monkeypatch.setattr(ts, "get_validator_info", _get_validator_info)
+    items = [("validator", "0xa", "")]
+    await ts.resolve_tracked(items, consumer="digest", profile="rewards")
+    await ts.resolve_tracked(items, consumer="digest", profile="card")
+    await ts.resolve_tracked(items, consumer="digest", profile="full")
+    # "card" and "full" read the same fields and share one snapshot.
+    assert seen == [{"profile": "rewards"}, {}]
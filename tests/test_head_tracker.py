@@ -0,0 +1,184 @@
+"""HeadTracker + the head-driven watchers, driven by :class:`FakeHeadSource`."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from services.head_tracker import (
+    EpochBoundary,
+    EpochSchedule,
+    FakeHeadSource,
+    Head,
+    HeadTracker,
+)
+from tasks import attestation_alerts, strk_notification
+
+# 10-block epochs; epoch 5 opened at block 100.
+EPOCH_INFO = {
+    "epoch_duration": 60,
+    "length": 10,
+    "starting_block": 100,
+    "starting_epoch": 5,
+    "previous_length": 20,
+    "previous_epoch_duration": 120,
+}
+
+
+async def _epoch_info() -> dict:
+    return EPOCH_INFO
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def driven():
+    source = FakeHeadSource()
+    tracker = HeadTracker([source], epoch_info_source=_epoch_info, error_backoff_s=0.01)
+    task = asyncio.create_task(tracker.run())
+    yield source, tracker
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def test_epoch_schedule_math() -> None:
+    schedule = EpochSchedule.from_epoch_info(EPOCH_INFO)
+    assert schedule is not None
+    assert schedule.epoch_at(100) == 5
+    assert schedule.epoch_at(109) == 5
+    assert schedule.epoch_at(110) == 6
+    # Before starting_block the previous (20-block) length applies.
+    assert schedule.epoch_at(99) == 4
+    assert schedule.epoch_at(80) == 4
+    assert schedule.epoch_at(79) == 3
+    assert schedule.first_block(7) == 120
+    assert EpochSchedule.from_epoch_info({"length": 0}) is None
+    assert EpochSchedule.from_epoch_info(None) is None
+
+
+async def test_publishes_heads_and_epoch_boundaries(driven) -> None:
+    source, tracker = driven
+    sub = tracker.subscribe()
+
+    await source.push(108)
+    await _settle()
+    assert await sub.next() == EpochBoundary(5, 108, None)
+    assert await sub.next() == Head(108, 108)
+
+    for n in (109, 110, 111):
+        await source.push(n)
+    await _settle()
+    # The boundary is never dropped; heads are coalesced to the latest.
+    assert await sub.next() == EpochBoundary(6, 110, 5)
+    assert await sub.next() == Head(111, 111)
+    assert tracker.epoch == 6
+    assert tracker.stats()["source"] == "fake"
+
+
+async def test_duplicate_and_stale_heads_are_ignored(driven) -> None:
+    source, tracker = driven
+    sub = tracker.subscribe()
+    await source.push(105)
+    await source.push(105)
+    await source.push(104)
+    await _settle()
+    assert tracker.head == Head(105, 105)
+    await sub.next()  # initial boundary
+    assert await sub.next() == Head(105, 105)
+    assert sub._head is None
+
+
+async def test_wait_for_block(driven) -> None:
+    source, tracker = driven
+    waiter = asyncio.create_task(tracker.wait_for_block(112))
+    await source.push(111)
+    await _settle()
+    assert not waiter.done()
+    await source.push(113)
+    assert (await asyncio.wait_for(waiter, 1)).number == 113
+
+
+async def test_falls_back_and_retries_primary() -> None:
+    attempts = 0
+
+    class _BrokenSocket:
+        name = "websocket"
+
+        async def heads(self):
+            nonlocal attempts
+            attempts += 1
+            raise ConnectionError("refused")
+            yield  # pragma: no cover
+
+    fallback = FakeHeadSource()
+    tracker = HeadTracker(
+        [_BrokenSocket(), fallback],
+        epoch_info_source=_epoch_info,
+        primary_retry_s=0.05,
+        error_backoff_s=0.01,
+    )
+    task = asyncio.create_task(tracker.run())
+    try:
+        await fallback.push(120)
+        head = await asyncio.wait_for(tracker.wait_for_block(120), 1)
+        assert head.number == 120
+        assert tracker.source_name == "fake"
+        await asyncio.sleep(0.2)
+        assert attempts >= 2  # primary retried after the fallback's budget
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_attestation_watcher_runs_on_boundaries_and_block_cadence(
+    driven, monkeypatch
+) -> None:
+    source, tracker = driven
+    calls: list[dict] = []
+
+    async def _cycle(**kwargs) -> None:
+        calls.append(kwargs)
+
+    monkeypatch.setattr(attestation_alerts, "_run_cycle", _cycle)
+    monkeypatch.setattr(attestation_alerts, "_INTERVAL_BLOCKS", 3)
+    watcher = asyncio.create_task(attestation_alerts._follow_heads(tracker))
+    await _settle()
+    try:
+        for n in (101, 102, 103, 104, 110):
+            await source.push(n)
+            await _settle()
+    finally:
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+
+    assert calls == [
+        {"block_number": 101, "current_epoch": 5, "epoch_changed": True},
+        {"block_number": 104, "current_epoch": 5, "epoch_changed": False},
+        {"block_number": 110, "current_epoch": 6, "epoch_changed": True},
+    ]
+
+
+async def test_reward_notifier_fires_on_crossed_boundaries_only(driven, monkeypatch) -> None:
+    source, tracker = driven
+    blocks: list[int | None] = []
+
+    async def _cycle(_follower, block_number=None) -> None:
+        blocks.append(block_number)
+
+    monkeypatch.setattr(strk_notification, "_notification_cycle", _cycle)
+    monkeypatch.setattr(strk_notification, "_REWARD_MIN_GAP", 0)
+    watcher = asyncio.create_task(strk_notification._follow_epochs(tracker, None))
+    await _settle()
+    try:
+        for n in (105, 109, 110, 115, 120):
+            await source.push(n)
+            await _settle()
+    finally:
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+
+    # 105: first epoch seen after start-up, not a crossing.
+    assert blocks == [110, 120]
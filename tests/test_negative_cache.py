@@ -0,0 +1,77 @@
+"""Remembered "does not exist" answers (:mod:`services.negative_cache`)."""
+from __future__ import annotations
+
+from starknet_py.net.client_errors import ClientError
+
+from services import staking_service as ss
+from services.negative_cache import NegativeCache, absent
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_absence_expires_and_is_tallied() -> None:
+    clock = _Clock()
+    cache = NegativeCache(ttl=60, clock=clock)
+    cache.record("staker_info", "0x0ABC")
+
+    assert cache.is_absent("staker_info", "0xabc")
+    assert cache.is_absent("staker_info", "0x0abc")
+    assert not cache.is_absent("staker_pools", "0xabc")
+    assert cache.dead_addresses(min_misses=3) == [("0xabc", 3)]
+
+    clock.now = 61
+    assert not cache.is_absent("staker_info", "0xabc")
+    assert cache.stats()["entries"] == 0
+
+
+def test_forget_address_drops_every_kind_and_resets_count() -> None:
+    cache = NegativeCache(ttl=60, clock=_Clock())
+    cache.record("staker_info", "0x1")
+    cache.record("staker_pools", "0x1")
+    cache.record("pool_member", "0x9", "0x1", tally=False)
+    cache.record("staker_info", "0x2")
+
+    assert cache.forget_address("0x01") == 3
+    assert not cache.is_absent("staker_info", "0x1")
+    assert not cache.is_absent("pool_member", "0x9", "0x1")
+    assert cache.is_absent("staker_info", "0x2")
+    assert [a for a, _ in cache.dead_addresses(min_misses=1)] == ["0x2"]
+
+
+async def test_fetch_staker_raw_serves_domain_revert_locally(monkeypatch) -> None:
+    calls: list[str] = []
+
+    async def _revert(address, selector, *args):
+        calls.append(selector)
+        raise ClientError(message="Contract error: Staker does not exist")
+
+    monkeypatch.setattr(ss, "call_view", _revert)
+    for _ in range(3):
+        assert await ss.fetch_staker_raw("0x123") is None
+    assert calls == ["get_staker_info_v1"]
+    assert absent.misses["0x123"] == 3
+
+    # A user re-adding the address asks the chain again.
+    absent.forget_address("0x123")
+    assert await ss.fetch_staker_raw("0x123") is None
+    assert len(calls) == 2
+
+
+async def test_rpc_failure_is_not_remembered(monkeypatch) -> None:
+    calls: list[str] = []
+
+    async def _down(address, selector, *args):
+        calls.append(selector)
+        raise RuntimeError("node unreachable")
+
+    monkeypatch.setattr(ss, "call_view", _down)
+    assert await ss.fetch_staker_pools_raw("0x123") is None
+    assert await ss.fetch_staker_pools_raw("0x123") is None
+    assert len(calls) == 2
+    assert absent.stats()["entries"] == 0
@@ -0,0 +1,112 @@
+"""Hand-written decoders in :mod:`services.raw_calls` vs starknet-py.
+
+Each decoder must produce exactly what ``Contract.functions[...].call``
+returns today, so the reference here is starknet-py's own deserializer
+built from the ABI files we ship.
+"""
+from __future__ import annotations
+
+import pytest
+from starknet_py.abi.v2 import AbiParser
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.serialization.errors import InvalidValueException
+from starknet_py.serialization.factory import serializer_for_function_v1
+
+from data.contracts import load_abi
+from services import raw_calls
+from services.raw_calls import CALL_TABLE
+
+
+def _reference_decoders(abi_name: str, names: set[str]) -> dict:
+    """starknet-py output deserializers for ``names``.
+
+    Only the struct / enum definitions and the wanted functions are
+    parsed — the full staking ABI (events included) takes seconds.
+    """
+    abi = load_abi(abi_name)
+    functions = [
+        item
+        for entry in abi
+        if entry["type"] == "interface"
+        for item in entry["items"]
+        if item.get("name") in names
+    ]
+    types = [e for e in abi if e["type"] in ("struct", "enum")]
+    parsed = AbiParser(types + functions).parse()
+    return {name: serializer_for_function_v1(fn) for name, fn in parsed.functions.items()}
+
+
+CASES = {
+    "l2_staking_contract": {
+        "get_staker_info_v1": [
+            [0, 0x11, 0x22, 0, 1_700_000_000, 500, 7, 0, 0x33, 400, 1000],
+            [0, 0x11, 0x22, 1, 500, 7, 1],
+            [1],
+        ],
+        "staker_pool_info": [
+            [0, 1000, 2, 0xA, 0xB, 5, 0xC, 0xD, 6],
+            [1, 0],
+        ],
+        "get_current_epoch": [[42]],
+        "get_epoch_info": [[3600, 300, 100, 5, 200, 7200]],
+    },
+    "l2_pool_contract": {
+        "get_pool_member_info_v1": [
+            [0, 0x11, 100, 5, 300, 20, 0, 1800],
+            [0, 0x11, 100, 5, 300, 20, 1],
+            [1],
+        ],
+    },
+    "l2_attestation_contract": {
+        "get_last_epoch_attestation_done": [[9]],
+    },
+}
+
+
+@pytest.mark.parametrize("abi_name", sorted(CASES))
+def test_decoders_match_starknet_py(abi_name: str) -> None:
+    cases = CASES[abi_name]
+    reference = _reference_decoders(abi_name, set(cases))
+    assert set(reference) == set(cases)
+
+    for name, samples in cases.items():
+        for felts in samples:
+            (expected,) = reference[name].deserialize(list(felts))
+            assert CALL_TABLE[name].decode(felts) == expected, (name, felts)
+
+
+def test_every_hot_read_is_in_the_table() -> None:
+    covered = {name for cases in CASES.values() for name in cases}
+    assert set(CALL_TABLE) == covered
+    for name, spec in CALL_TABLE.items():
+        assert spec.selector == get_selector_from_name(name)
+
+
+def test_truncated_result_raises_invalid_value() -> None:
+    with pytest.raises(InvalidValueException):
+        CALL_TABLE["get_epoch_info"].decode([3600, 300])
+    with pytest.raises(InvalidValueException):
+        CALL_TABLE["get_staker_info_v1"].decode([7])
+
+
+async def test_call_view_uses_selector_and_snapshot_block(monkeypatch) -> None:
+    seen: dict = {}
+
+    class _Client:
+        async def call_contract(self, call, **block):
+            seen.update(call=call, block=block)
+            return [0, 12, 0]
+
+    async def _pinned() -> dict:
+        return {"block_number": 77}
+
+    monkeypatch.setattr(raw_calls, "get_client", lambda: _Client())
+    monkeypatch.setattr(raw_calls, "snapshot_block_kwargs", _pinned)
+
+    result = await raw_calls.call_view("0x5", "staker_pool_info", 0x99)
+
+    assert result == {"commission": 12, "pools": []}
+    assert seen["call"].to_addr == 5
+    assert seen["call"].selector == get_selector_from_name("staker_pool_info")
+    assert seen["call"].calldata == [0x99]
+    assert seen["block"] == {"block_number": 77}
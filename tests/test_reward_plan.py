@@ -0,0 +1,99 @@
+"""Reward notifier cycle as a deduplicated fetch plan."""
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+
+from services import tracking_service as ts
+from services.staking_dto import DelegatorMultiPositions, ValidatorInfo
+from tasks import strk_notification as sn
+
+
+def _validator(addr: str, unclaimed: int) -> ValidatorInfo:
+    return ValidatorInfo(
+        staker_address=addr,
+        reward_address="0x1",
+        operational_address="0x2",
+        amount_own_raw=0,
+        amount_own_strk=Decimal(0),
+        unclaimed_rewards_own_raw=unclaimed * 10**18,
+        unclaimed_rewards_own_strk=Decimal(unclaimed),
+        current_epoch=7,
+    )
+
+
+def _user(user_id: int, doc: dict, threshold: int) -> SimpleNamespace:
+    cfg = {"token_thresholds": {"STRK": threshold}}
+    return SimpleNamespace(
+        user_id=user_id,
+        user_language="en",
+        tracking_data=json.dumps(doc),
+        get_notification_config=lambda: cfg,
+    )
+
+
+async def test_plan_fetches_each_unique_entry_once(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    async def _get_validator_info(addr: str, **kwargs):
+        calls.append(("v", addr, tuple(sorted(kwargs.items()))))
+        return _validator(addr, unclaimed=int(addr, 16))
+
+    async def _get_positions(staker: str, delegator: str):
+        calls.append(("d", staker, delegator))
+        return DelegatorMultiPositions(
+            delegator_address=delegator, staker_address=staker, positions=[]
+        )
+
+    sent: list[tuple[int, str]] = []
+
+    async def _send(chat_id: int, text: str) -> None:
+        sent.append((chat_id, text))
+
+    monkeypatch.setattr(ts, "get_validator_info", _get_validator_info)
+    monkeypatch.setattr(ts, "get_delegator_positions", _get_positions)
+    monkeypatch.setattr(sn, "send_message", _send)
+
+    shared = {
+        "validators": [{"address": "0x0A"}, {"address": "0x14"}],
+        "delegations": [{"delegator": "0xd1", "staker": "0x0a"}],
+    }
+    users = [
+        _user(1, shared, threshold=15),      # only 0x14 (=20 STRK) crosses
+        _user(2, shared, threshold=100),     # nothing crosses
+        _user(3, {"validators": [{"address": "0xa"}], "delegations": []}, threshold=5),
+    ]
+
+    stats = await sn._run_reward_plan(users, prices={})
+
+    # 0x0A / 0xa and 0x14 once each, the delegation once.
+    assert sorted(c[:2] for c in calls) == [("d", "0x0a"), ("v", "0x0A"), ("v", "0x14")]
+    assert all(c[2] == (("profile", sn._PLAN_PROFILE),) for c in calls if c[0] == "v")
+    assert stats["entries"] == 7 and stats["unique"] == 3
+    assert stats["dedup_ratio"] == 2.33
+    assert sorted(chat for chat, _ in sent) == [1, 3]
+    body_1 = dict(sent)[1]
+    assert "0x14" in body_1 and "0x0A" not in body_1
+
+
+async def test_failed_entry_does_not_sink_the_cycle(monkeypatch) -> None:
+    async def _get_validator_info(addr: str, **kwargs):
+        if addr == "0xbad":
+            raise ConnectionError("node down")
+        return _validator(addr, unclaimed=50)
+
+    sent: list[int] = []
+
+    async def _send(chat_id: int, text: str) -> None:
+        sent.append(chat_id)
+
+    monkeypatch.setattr(ts, "get_validator_info", _get_validator_info)
+    monkeypatch.setattr(sn, "send_message", _send)
+    users = [
+        _user(1, {"validators": [{"address": "0xbad"}], "delegations": []}, 1),
+        _user(2, {"validators": [{"address": "0x5"}], "delegations": []}, 1),
+    ]
+    stats = await sn._run_reward_plan(users, prices={})
+    assert sent == [2]
+    assert stats["messages"] == 1
@@ -0,0 +1,157 @@
+"""Tests for the JSON-RPC batching transport in :mod:`services.rpc_batch`.
+
+The HTTP layer is replaced by a recording fake (``_post``), so these run
+without a node: we only check how calls are grouped, how results are
+routed back by ``id``, and how a batch-hostile provider is handled.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from starknet_py.net.client_errors import ClientError
+
+from services.rpc_batch import BatchingRpcHttpClient
+
+
+class _FakeNode:
+    """Answers ``starknet_call`` with ``[params]`` echo; records payloads."""
+
+    def __init__(self, *, reject_batches: bool = False) -> None:
+        self.payloads: list = []
+        self.reject_batches = reject_batches
+
+    async def __call__(self, payload):
+        self.payloads.append(payload)
+        await asyncio.sleep(0)
+        if isinstance(payload, list):
+            if self.reject_batches:
+                return {"jsonrpc": "2.0", "id": None,
+                        "error": {"code": -32600, "message": "batch not supported"}}
+            # Reply out of order on purpose — routing must go by id.
+            return [self._answer(p) for p in reversed(payload)]
+        return self._answer(payload)
+
+    @staticmethod
+    def _answer(p: dict) -> dict:
+        if p["params"] == {"fail": True}:
+            return {"jsonrpc": "2.0", "id": p["id"],
+                    "error": {"code": 40, "message": "Contract error"}}
+        return {"jsonrpc": "2.0", "id": p["id"], "result": p["params"]}
+
+
+def _client(node: _FakeNode, **kwargs) -> BatchingRpcHttpClient:
+    client = BatchingRpcHttpClient("http://node.invalid", **kwargs)
+    client._is_spec_version_verified = True  # skip the specVersion probe
+    client._post = node  # type: ignore[method-assign]
+    return client
+
+
+async def test_concurrent_calls_share_one_request() -> None:
+    node = _FakeNode()
+    client = _client(node, window_seconds=0.01, max_batch_size=50)
+
+    results = await asyncio.gather(
+        *(client.call("call", {"n": i}) for i in range(10))
+    )
+
+    assert results == [{"n": i} for i in range(10)]
+    assert len(node.payloads) == 1
+    assert isinstance(node.payloads[0], list)
+    assert {p["method"] for p in node.payloads[0]} == {"starknet_call"}
+    assert client.stats.batches == 1
+    assert client.stats.batched_calls == 10
+
+
+async def test_max_batch_size_splits_requests() -> None:
+    node = _FakeNode()
+    client = _client(node, window_seconds=0.01, max_batch_size=4)
+
+    results = await asyncio.gather(
+        *(client.call("call", {"n": i}) for i in range(10))
+    )
+
+    assert results == [{"n": i} for i in range(10)]
+    sizes = sorted(len(p) if isinstance(p, list) else 1 for p in node.payloads)
+    assert sizes == [2, 4, 4]
+
+
+async def test_lone_call_is_sent_unbatched() -> None:
+    node = _FakeNode()
+    client = _client(node, window_seconds=0.0)
+
+    assert await client.call("blockNumber", {"n": 1}) == {"n": 1}
+    assert isinstance(node.payloads[0], dict)
+
+
+async def test_per_call_errors_are_routed_to_their_caller() -> None:
+    node = _FakeNode()
+    client = _client(node, window_seconds=0.01)
+
+    ok, bad = await asyncio.gather(
+        client.call("call", {"n": 1}),
+        client.call("call", {"fail": True}),
+        return_exceptions=True,
+    )
+
+    assert ok == {"n": 1}
+    assert isinstance(bad, ClientError)
+    assert "Contract error" in str(bad)
+
+
+async def test_batch_rejection_falls_back_to_single_requests() -> None:
+    node = _FakeNode(reject_batches=True)
+    client = _client(node, window_seconds=0.01)
+
+    first = await asyncio.gather(*(client.call("call", {"n": i}) for i in range(3)))
+    assert first == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert client.batch_supported is False
+    assert client.stats.fallbacks == 1
+
+    node.payloads.clear()
+    second = await asyncio.gather(*(client.call("call", {"n": i}) for i in range(3)))
+    assert second == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert all(isinstance(p, dict) for p in node.payloads)
+
+
+async def test_http_400_on_batch_triggers_fallback() -> None:
+    calls: list = []
+
+    async def _post(payload):
+        calls.append(payload)
+        if isinstance(payload, list):
+            raise ClientError(code="400", message="arrays not allowed")
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": payload["params"]}
+
+    client = BatchingRpcHttpClient("http://node.invalid", window_seconds=0.01)
+    client._is_spec_version_verified = True
+    client._post = _post  # type: ignore[method-assign]
+
+    results = await asyncio.gather(*(client.call("call", {"n": i}) for i in range(2)))
+    assert results == [{"n": 0}, {"n": 1}]
+    assert client.batch_supported is False
+
+
+async def test_transient_http_error_fails_every_caller_without_downgrade() -> None:
+    async def _post(payload):
+        raise ClientError(code="503", message="upstream busy")
+
+    client = BatchingRpcHttpClient("http://node.invalid", window_seconds=0.01)
+    client._is_spec_version_verified = True
+    client._post = _post  # type: ignore[method-assign]
+
+    results = await asyncio.gather(
+        *(client.call("call", {"n": i}) for i in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, ClientError) for r in results)
+    assert client.batch_supported is True
+
+
+@pytest.mark.parametrize("size", [0, 1])
+async def test_max_batch_size_one_disables_batching(size: int) -> None:
+    node = _FakeNode()
+    client = _client(node, max_batch_size=size)
+
+    await asyncio.gather(*(client.call("call", {"n": i}) for i in range(3)))
+    assert all(isinstance(p, dict) for p in node.payloads)
+    assert client.stats.batches == 0
@@ -0,0 +1,318 @@
+"""Tests for the in-process RPC helpers in :mod:`services.rpc_client`."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from starknet_py.net.client_errors import ClientError
+
+from services import rpc_client
+from services.rpc_batch import BatchingRpcHttpClient
+from services.rpc_client import (
+    AimdLimiter,
+    BlockCallCache,
+    SingleFlight,
+    current_snapshot,
+    read_snapshot,
+    snapshot_block_kwargs,
+)
+
+
+# ---------------------------------------------------------------------------
+# SingleFlight
+# ---------------------------------------------------------------------------
+
+
+async def test_single_flight_shares_one_execution() -> None:
+    sf = SingleFlight()
+    runs = 0
+    gate = asyncio.Event()
+
+    async def _op() -> int:
+        nonlocal runs
+        runs += 1
+        await gate.wait()
+        return 7
+
+    waiters = [asyncio.ensure_future(sf.run("k", _op)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await asyncio.gather(*waiters) == [7] * 5
+    assert runs == 1
+    assert sf.stats() == {"hits": 4, "misses": 1, "in_flight": 0}
+
+
+async def test_single_flight_propagates_exception_to_every_caller() -> None:
+    sf = SingleFlight()
+    gate = asyncio.Event()
+
+    async def _op() -> int:
+        await gate.wait()
+        raise ClientError(message="boom")
+
+    waiters = [asyncio.ensure_future(sf.run("k", _op)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ClientError) for r in results)
+
+
+async def test_single_flight_does_not_cache_after_completion() -> None:
+    sf = SingleFlight()
+    runs = 0
+
+    async def _op() -> int:
+        nonlocal runs
+        runs += 1
+        return runs
+
+    assert await sf.run("k", _op) == 1
+    assert await sf.run("k", _op) == 2
+    assert sf.hits == 0
+
+
+async def test_single_flight_survives_one_cancelled_caller() -> None:
+    sf = SingleFlight()
+    gate = asyncio.Event()
+
+    async def _op() -> str:
+        await gate.wait()
+        return "ok"
+
+    first = asyncio.ensure_future(sf.run("k", _op))
+    second = asyncio.ensure_future(sf.run("k", _op))
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+
+    assert await second == "ok"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_transport_dedupes_identical_calls_only() -> None:
+    payloads: list = []
+
+    async def _post(payload):
+        payloads.append(payload)
+        items = payload if isinstance(payload, list) else [payload]
+        answers = [{"jsonrpc": "2.0", "id": p["id"], "result": p["params"]} for p in items]
+        return answers if isinstance(payload, list) else answers[0]
+
+    sf = SingleFlight()
+    client = BatchingRpcHttpClient(
+        "http://node.invalid", window_seconds=0.01, single_flight=sf
+    )
+    client._is_spec_version_verified = True
+    client._post = _post  # type: ignore[method-assign]
+
+    same = {"request": {"contract_address": "0x1"}, "block_id": "latest"}
+    other = {"request": {"contract_address": "0x2"}, "block_id": "latest"}
+    results = await asyncio.gather(
+        *(client.call("call", dict(same)) for _ in range(4)),
+        client.call("call", other),
+    )
+
+    assert results == [same] * 4 + [other]
+    sent = [p for batch in payloads for p in (batch if isinstance(batch, list) else [batch])]
+    assert len(sent) == 2
+    assert sf.hits == 3
+
+
+# ---------------------------------------------------------------------------
+# BlockCallCache / read_snapshot
+# ---------------------------------------------------------------------------
+
+
+def _pinned(block_id) -> dict:
+    return {
+        "request": {
+            "contract_address": "0x1",
+            "entry_point_selector": "0xabc",
+            "calldata": ["0x5"],
+        },
+        "block_id": block_id,
+    }
+
+
+def test_block_cache_only_keys_pinned_calls() -> None:
+    key = BlockCallCache.key_for("call", _pinned({"block_number": 10}))
+    assert key == (10, "0x1", "0xabc", ("0x5",))
+    assert BlockCallCache.key_for("call", _pinned("latest")) is None
+    assert BlockCallCache.key_for("call", _pinned({"block_hash": "0x9"})) is None
+    assert BlockCallCache.key_for("getEvents", _pinned({"block_number": 10})) is None
+
+
+def test_block_cache_evicts_least_recently_used() -> None:
+    cache = BlockCallCache(max_entries=2)
+    cache.put("a", (1,))
+    cache.put("b", (2,))
+    assert cache.get("a") == (1,)
+    cache.put("c", (3,))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (1,)
+    assert cache.get("c") == (3,)
+
+
+async def test_transport_serves_pinned_calls_from_block_cache() -> None:
+    sent: list = []
+
+    async def _post(payload):
+        sent.append(payload)
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": ["0x7"]}
+
+    cache = BlockCallCache(max_entries=10)
+    client = BatchingRpcHttpClient(
+        "http://node.invalid", window_seconds=0.0, block_cache=cache
+    )
+    client._is_spec_version_verified = True
+    client._post = _post  # type: ignore[method-assign]
+
+    assert await client.call("call", _pinned({"block_number": 10})) == ["0x7"]
+    assert await client.call("call", _pinned({"block_number": 10})) == ["0x7"]
+    assert len(sent) == 1
+
+    await client.call("call", _pinned({"block_number": 11}))
+    await client.call("call", _pinned("latest"))
+    await client.call("call", _pinned("latest"))
+    assert len(sent) == 4
+
+
+async def test_snapshot_kwargs_are_empty_outside_a_snapshot() -> None:
+    assert current_snapshot() is None
+    assert await snapshot_block_kwargs() == {}
+
+
+async def test_snapshot_resolves_head_once_and_nests(monkeypatch) -> None:
+    heads: list[int] = []
+
+    class _Client:
+        async def get_block_number(self) -> int:
+            heads.append(1)
+            await asyncio.sleep(0)
+            return 500 + len(heads)
+
+    monkeypatch.setattr(rpc_client, "get_client", lambda: _Client())
+
+    with read_snapshot() as outer:
+        async def _read() -> dict:
+            with read_snapshot() as inner:
+                assert inner is outer
+                return await snapshot_block_kwargs()
+
+        results = await asyncio.gather(*(_read() for _ in range(5)))
+
+    assert results == [{"block_number": 501}] * 5
+    assert len(heads) == 1
+    assert current_snapshot() is None
+
+
+async def test_snapshot_is_lazy_and_degrades_to_unpinned(monkeypatch) -> None:
+    class _Client:
+        async def get_block_number(self) -> int:
+            raise ClientError(message="node down")
+
+    async def _no_retry(fn, *, description=""):
+        return await fn()
+
+    monkeypatch.setattr(rpc_client, "get_client", lambda: _Client())
+    monkeypatch.setattr(rpc_client, "with_retry", _no_retry)
+
+    with read_snapshot():
+        # No read issued: nothing resolved yet.
+        assert current_snapshot()._task is None
+        assert await snapshot_block_kwargs() == {}
+
+
+# ---------------------------------------------------------------------------
+# AimdLimiter
+# ---------------------------------------------------------------------------
+
+
+async def test_limiter_caps_in_flight_and_reports_queue_depth() -> None:
+    limiter = AimdLimiter(initial=2, max_limit=2)
+    gate = asyncio.Event()
+    peak = 0
+    running = 0
+
+    async def _request() -> None:
+        nonlocal peak, running
+        async with limiter.slot("http://a"):
+            running += 1
+            peak = max(peak, running)
+            await gate.wait()
+            running -= 1
+
+    tasks = [asyncio.ensure_future(_request()) for _ in range(6)]
+    await asyncio.sleep(0)
+    assert limiter.stats()["http://a"] == {
+        "limit": 2, "in_flight": 2, "queued": 4, "decreases": 0,
+    }
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert limiter.stats()["http://a"]["in_flight"] == 0
+
+
+async def test_limiter_grows_additively_while_latency_is_stable() -> None:
+    limiter = AimdLimiter(initial=4, max_limit=64, clock=lambda: 0.0)
+
+    for _ in range(40):
+        async with limiter.slot("http://a"):
+            pass
+
+    # +1/limit per success: limit² grows by ~2 per request, 16 -> ~96.
+    assert limiter.limit("http://a") == 9
+
+
+async def test_limiter_halves_once_per_burst_of_429s() -> None:
+    now = [0.0]
+    limiter = AimdLimiter(initial=16, clock=lambda: now[0])
+    gate = asyncio.Event()
+
+    async def _rate_limited() -> None:
+        async with limiter.slot("http://a"):
+            await gate.wait()
+            raise ClientError(code="429", message="slow down")
+
+    tasks = [asyncio.ensure_future(_rate_limited()) for _ in range(8)]
+    await asyncio.sleep(0)
+    now[0] = 1.0
+    gate.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert limiter.limit("http://a") == 8
+
+    # A request started after the cut can cut again.
+    with pytest.raises(asyncio.TimeoutError):
+        async with limiter.slot("http://a"):
+            now[0] = 2.0
+            raise asyncio.TimeoutError
+    assert limiter.limit("http://a") == 4
+    # Limits are per endpoint.
+    assert limiter.limit("http://b") == 16
+
+
+async def test_limiter_cancelled_waiter_does_not_leak_a_slot() -> None:
+    limiter = AimdLimiter(initial=1, max_limit=1)
+    gate = asyncio.Event()
+
+    async def _hold() -> None:
+        async with limiter.slot("http://a"):
+            await gate.wait()
+
+    holder = asyncio.ensure_future(_hold())
+    waiter = asyncio.ensure_future(_hold())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    gate.set()
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.stats()["http://a"]["in_flight"] == 0
+    async with limiter.slot("http://a"):
+        pass
@@ -0,0 +1,219 @@
+"""Tests for multi-endpoint routing in :mod:`services.rpc_pool`.
+
+Each endpoint is a real local aiohttp server whose latency and HTTP
+status can be changed mid-test, and requests go through the production
+transport (:class:`BatchingRpcHttpClient` with a pool), so routing,
+hedging and the breaker are exercised over actual sockets.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from starknet_py.net.client_errors import ClientError
+
+from services.rpc_batch import BatchingRpcHttpClient
+from services.rpc_pool import CLOSED, OPEN, RpcEndpointPool
+
+
+class _StubNode:
+    """JSON-RPC echo server with tunable latency and HTTP status."""
+
+    def __init__(self, delay: float = 0.0, status: int = 200) -> None:
+        self.delay = delay
+        self.status = status
+        self.hits = 0
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self.server = TestServer(app)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        body = await request.json()
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.Response(status=self.status, text="stub failure")
+        return web.json_response(
+            {"jsonrpc": "2.0", "id": body["id"], "result": body["params"]}
+        )
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/"))
+
+
+@pytest.fixture
+async def nodes():
+    started: list[_StubNode] = []
+
+    async def _make(**kwargs) -> _StubNode:
+        node = _StubNode(**kwargs)
+        await node.server.start_server()
+        started.append(node)
+        return node
+
+    yield _make
+    for node in started:
+        await node.server.close()
+
+
+def _transport(pool: RpcEndpointPool, limiter=None) -> BatchingRpcHttpClient:
+    client = BatchingRpcHttpClient(
+        pool.endpoints[0].url, max_batch_size=1, pool=pool, limiter=limiter
+    )
+    client._is_spec_version_verified = True
+    return client
+
+
+async def test_routes_to_the_faster_endpoint(nodes) -> None:
+    slow = await nodes(delay=0.05)
+    fast = await nodes(delay=0.0)
+    pool = RpcEndpointPool([slow.url, fast.url], hedge=False)
+    client = _transport(pool)
+
+    for i in range(20):
+        assert await client.call("call", {"n": i}) == {"n": i}
+
+    # One exploratory request each, then everything goes to the fast node.
+    assert slow.hits == 1
+    assert fast.hits == 19
+    stats = {e["url"]: e for e in pool.stats()["endpoints"]}
+    assert stats[slow.url]["p50_ms"] > stats[fast.url]["p50_ms"]
+
+
+async def test_hedges_to_runner_up_when_primary_exceeds_p95(nodes) -> None:
+    primary = await nodes(delay=0.0)
+    backup = await nodes(delay=0.02)
+    pool = RpcEndpointPool(
+        [primary.url, backup.url], min_samples=5, hedge_min_delay=0.01
+    )
+    client = _transport(pool)
+    for i in range(10):
+        await client.call("call", {"n": i})
+    assert pool.ranked()[0].url == primary.url
+
+    primary.delay = 2.0
+    started = time.monotonic()
+    assert await client.call("call", {"n": "hedged"}) == {"n": "hedged"}
+
+    assert time.monotonic() - started < 1.0
+    assert pool.hedges == 1
+    assert pool.endpoints[1].hedges_won == 1
+
+
+async def test_limiter_queueing_is_not_endpoint_latency(nodes) -> None:
+    """A backlog on our own limiter neither inflates the primary's
+    latencies nor fires hedges at the runner-up."""
+    from services.rpc_client import AimdLimiter
+
+    primary = await nodes(delay=0.01)
+    backup = await nodes(delay=0.03)
+    pool = RpcEndpointPool(
+        [primary.url, backup.url], min_samples=5, hedge_min_delay=0.03
+    )
+    client = _transport(pool, AimdLimiter(initial=1, max_limit=1))
+    for i in range(10):
+        await client.call("call", {"n": i})
+    assert pool.ranked()[0].url == primary.url
+    backup_hits = backup.hits
+
+    # Eight at once through one slot: the last waits ~70 ms in our queue,
+    # well past the 30 ms hedge trigger.
+    results = await asyncio.gather(*(client.call("call", {"n": i}) for i in range(8)))
+    assert results == [{"n": i} for i in range(8)]
+    assert pool.hedges == 0 and backup.hits == backup_hits
+    assert max(pool.endpoints[0].latencies) < 0.05
+
+async def test_breaker_ejects_failing_node_and_probes_it_back(nodes) -> None:
+    now = [0.0]
+    broken = await nodes(status=503)
+    healthy = await nodes()
+    pool = RpcEndpointPool(
+        [broken.url, healthy.url],
+        hedge=False,
+        failure_threshold=1,
+        cooldown_seconds=30,
+        clock=lambda: now[0],
+    )
+    client = _transport(pool)
+
+    # The failure fails over transparently and opens the circuit.
+    for i in range(4):
+        assert await client.call("call", {"n": i}) == {"n": i}
+    assert pool.endpoints[0].state == OPEN
+    hits_when_opened = broken.hits
+
+    for i in range(5):
+        await client.call("call", {"n": i})
+    assert broken.hits == hits_when_opened
+
+    # Cooldown elapsed and the node is back: one probe closes the circuit.
+    now[0] = 31.0
+    broken.status = 200
+    await client.call("call", {"n": "probe"})
+    assert broken.hits == hits_when_opened + 1
+    assert pool.endpoints[0].state == CLOSED
+
+
+async def test_failed_probe_reopens_circuit(nodes) -> None:
+    now = [0.0]
+    broken = await nodes(status=500)
+    healthy = await nodes()
+    pool = RpcEndpointPool(
+        [broken.url, healthy.url],
+        hedge=False,
+        failure_threshold=1,
+        cooldown_seconds=10,
+        clock=lambda: now[0],
+    )
+    client = _transport(pool)
+
+    await client.call("call", {"n": 1})
+    assert pool.endpoints[0].state == OPEN
+
+    now[0] = 11.0
+    assert await client.call("call", {"n": 2}) == {"n": 2}
+    assert pool.endpoints[0].state == OPEN
+    assert pool.endpoints[0].opened_at == 11.0
+
+
+async def test_client_errors_are_not_failed_over(nodes) -> None:
+    bad_request = await nodes(status=400)
+    other = await nodes()
+    pool = RpcEndpointPool([bad_request.url, other.url], hedge=False)
+    client = _transport(pool)
+
+    with pytest.raises(ClientError):
+        await client.call("call", {"n": 1})
+    assert other.hits == 0
+    assert pool.endpoints[0].state == CLOSED
+
+
+async def test_all_endpoints_down_surfaces_the_error(nodes) -> None:
+    a = await nodes(status=502)
+    b = await nodes(status=503)
+    pool = RpcEndpointPool([a.url, b.url], hedge=False)
+    client = _transport(pool)
+
+    with pytest.raises(ClientError):
+        await client.call("call", {"n": 1})
+    assert a.hits == 1 and b.hits == 1
+
+
+def test_breaker_needs_consecutive_failures() -> None:
+    pool = RpcEndpointPool(["http://a.invalid"], failure_threshold=3)
+    ep = pool.endpoints[0]
+    err = ClientError(code="503", message="busy")
+
+    pool._record_failure(ep, err)
+    pool._record_failure(ep, err)
+    pool._record_success(ep, 0.01)
+    pool._record_failure(ep, err)
+    pool._record_failure(ep, err)
+    assert ep.state == CLOSED
+
+    pool._record_failure(ep, err)
+    assert ep.state == OPEN
@@ -0,0 +1,168 @@
+"""SQLite-backed :class:`utils.cache.SharedCache`: TTL, LRU, CAS, cross-process."""
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from utils.cache import SharedCache
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(tmp_path, **kw) -> SharedCache:
+    return SharedCache(ttl=kw.pop("ttl", 60), path=tmp_path / "c.db", **kw)
+
+
+async def test_round_trip_and_ttl(tmp_path) -> None:
+    clock = _Clock()
+    cache = _cache(tmp_path, clock=clock)
+    await cache.set("1_full", {"body": "hi", "n": [1, 2]})
+    assert await cache.get("1_full") == {"body": "hi", "n": [1, 2]}
+    assert await cache.get("missing") is None
+
+    clock.now += 61
+    assert await cache.get("1_full") is None
+    assert await cache.keys("1_") == []
+
+
+async def test_delete_and_keys(tmp_path) -> None:
+    cache = _cache(tmp_path)
+    for key in ("12_full", "12_reward", "7_full"):
+        await cache.set(key, key)
+    assert sorted(await cache.keys("12_")) == ["12_full", "12_reward"]
+    await cache.delete("12_full")
+    assert await cache.get("12_full") is None
+    assert await cache.get("12_reward") == "12_reward"
+
+
+def test_lru_eviction_keeps_recently_read(tmp_path) -> None:
+    clock = _Clock()
+    cache = _cache(tmp_path, clock=clock, max_entries=3)
+    for key in ("a", "b", "c", "d", "e"):
+        clock.now += 1
+        cache.put(key, key)
+    clock.now += 1
+    assert cache.get_versioned("a") is not None  # a is now most recent
+
+    assert cache.evict() == 2
+    survivors = {k for k in "abcde" if cache.get_versioned(k) is not None}
+    assert survivors == {"a", "d", "e"}
+
+
+def test_compare_and_set(tmp_path) -> None:
+    clock = _Clock()
+    cache = _cache(tmp_path, clock=clock)
+
+    assert cache.compare_and_set("k", None, "first") == 1
+    assert cache.compare_and_set("k", None, "again") is None  # already present
+
+    value, version = cache.get_versioned("k")
+    assert (value, version) == ("first", 1)
+    assert cache.compare_and_set("k", version, "second") == 2
+    # A writer still holding version 1 loses.
+    assert cache.compare_and_set("k", version, "stale") is None
+    assert cache.get_versioned("k") == ("second", 2)
+
+    # An expired entry counts as absent for "insert if absent".
+    clock.now += 61
+    assert cache.compare_and_set("k", 2, "late") is None
+    assert cache.compare_and_set("k", None, "fresh") == 3
+
+
+def test_entries_are_visible_across_processes(tmp_path) -> None:
+    path = tmp_path / "shared.db"
+    mine = SharedCache(ttl=60, path=path)
+    mine.put("from_parent", 41)
+
+    script = textwrap.dedent(
+        f"""
+        from utils.cache import SharedCache
+        c = SharedCache(ttl=60, path={str(path)!r})
+        value, _ = c.get_versioned("from_parent")
+        c.put("from_child", value + 1)
+        """
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True, timeout=60)
+
+    assert mine.get_versioned("from_child")[0] == 42
+
+
+# ---------------------------------------------------------------------------
+# Namespaces, tags, sweeper
+# ---------------------------------------------------------------------------
+
+
+async def test_user_namespace_clear_is_exact(tmp_path) -> None:
+    cache = _cache(tmp_path)
+    await cache.namespace("user", 12).set("full", "twelve")
+    await cache.namespace("user", 123).set("full", "one-two-three")
+    await cache.namespace("user", 1).set("reward", "one")
+
+    assert await cache.namespace("user", 12).clear() == 1
+
+    assert await cache.namespace("user", 12).get("full") is None
+    assert await cache.namespace("user", 123).get("full") == "one-two-three"
+    assert await cache.namespace("user", 1).get("reward") == "one"
+
+
+async def test_tag_invalidation_spans_namespaces(tmp_path) -> None:
+    cache = _cache(tmp_path)
+    staker = "staker:0xabc"
+    await cache.namespace("user", 1).set("card", "a", tags=[staker])
+    await cache.namespace("user", 2).set("card", "b", tags=[staker, "staker:0xdef"])
+    await cache.namespace("user", 3).set("card", "c", tags=["staker:0xdef"])
+
+    assert cache.invalidate_tag(staker) == 2
+    assert await cache.namespace("user", 1).get("card") is None
+    assert await cache.namespace("user", 2).get("card") is None
+    assert await cache.namespace("user", 3).get("card") == "c"
+    # The deleted entries' other tags went with them.
+    assert cache.tagged_keys("staker:0xdef") == ["user:3:card"]
+
+
+async def test_rewrite_replaces_tags(tmp_path) -> None:
+    cache = _cache(tmp_path)
+    ns = cache.namespace("user", 5)
+    await ns.set("card", "v1", tags=["staker:0x1"])
+    await ns.set("card", "v2", tags=["staker:0x2"])
+    assert cache.invalidate_tag("staker:0x1") == 0
+    assert await ns.get("card") == "v2"
+
+
+def test_sweep_removes_expired_rows_and_tags(tmp_path) -> None:
+    clock = _Clock()
+    cache = _cache(tmp_path, clock=clock)
+    cache.put("short", 1, ttl=5, tags=["t"])
+    cache.put("long", 2, ttl=500, tags=["t"])
+
+    clock.now += 10
+    # Reads do not delete: the row stays until the sweeper runs.
+    assert cache.get_versioned("short") is None
+    assert sorted(cache.tagged_keys("t")) == ["long", "short"]
+
+    assert cache.sweep() == 1
+    assert cache.tagged_keys("t") == ["long"]
+
+
+async def test_clear_user_cache_uses_user_namespace(tmp_path, monkeypatch) -> None:
+    from utils import cache as cache_mod
+
+    shared = _cache(tmp_path)
+    monkeypatch.setattr(cache_mod, "cache", shared)
+    await cache_mod.user_cache(12).set("full", "x")
+    await cache_mod.user_cache(123).set("full", "y")
+
+    await cache_mod.clear_user_cache(12)
+
+    assert await cache_mod.user_cache(12).get("full") is None
+    assert await cache_mod.user_cache(123).get("full") == "y"
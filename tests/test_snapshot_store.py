@@ -0,0 +1,125 @@
+"""Stale-while-revalidate semantics of :class:`services.snapshot_store.SnapshotStore`."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from services.rpc_client import current_snapshot, read_snapshot
+from services.snapshot_store import SnapshotStore
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Loader:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.gate: asyncio.Event | None = None
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return f"v{self.calls}"
+
+
+async def test_concurrent_misses_share_one_load() -> None:
+    store = SnapshotStore(clock=_Clock())
+    load = _Loader()
+    load.gate = asyncio.Event()
+
+    waiters = [
+        asyncio.create_task(store.get(("validator", "0x1"), load, consumer="digest"))
+        for _ in range(50)
+    ]
+    await asyncio.sleep(0)
+    load.gate.set()
+    assert set(await asyncio.gather(*waiters)) == {"v1"}
+    assert load.calls == 1
+
+
+async def test_stale_snapshot_served_while_one_refresh_runs() -> None:
+    clock = _Clock()
+    store = SnapshotStore(clock=clock)
+    load = _Loader()
+    key = ("validator", "0x1")
+    assert await store.get(key, load, consumer="digest") == "v1"
+
+    clock.now = 30  # inside the digest budget
+    assert await store.get(key, load, consumer="digest") == "v1"
+    assert load.calls == 1
+
+    clock.now = 120  # past the budget, inside the stale allowance
+    load.gate = asyncio.Event()
+    results = [await store.get(key, load, consumer="digest") for _ in range(5)]
+    assert results == ["v1"] * 5
+    load.gate.set()
+    await store.drain()
+    assert load.calls == 2
+    assert await store.get(key, load, consumer="digest") == "v2"
+
+
+async def test_budget_is_per_consumer() -> None:
+    clock = _Clock()
+    store = SnapshotStore(clock=clock)
+    load = _Loader()
+    key = ("attestation", "0x1", 7)
+    await store.get(key, load, consumer="digest")
+
+    clock.now = 20
+    assert await store.get(key, load, consumer="digest") == "v1"
+    # Alerts never take a stale answer: reloaded in the foreground.
+    assert await store.get(key, load, consumer="attestation") == "v2"
+    assert store.stats()["stale_hits"] == 0
+
+
+async def test_validate_overrides_age() -> None:
+    clock = _Clock()
+    store = SnapshotStore(clock=clock)
+    load = _Loader()
+    key = ("delegation", "0x1", "0x2")
+    await store.get(key, load, consumer="card", stamp=lambda: 100)
+    assert store.peek(key).stamp == 100
+
+    clock.now = 10_000
+    assert await store.get(key, load, consumer="card", validate=lambda s: True) == "v1"
+    clock.now = 1
+    assert await store.get(key, load, consumer="card", validate=lambda s: False) == "v2"
+
+
+async def test_none_is_not_stored_and_unknown_consumer_rejected() -> None:
+    store = SnapshotStore(clock=_Clock())
+    calls = []
+
+    async def _missing():
+        calls.append(1)
+        return None
+
+    assert await store.get("k", _missing, consumer="api") is None
+    assert await store.get("k", _missing, consumer="api") is None
+    assert len(calls) == 2
+    with pytest.raises(ValueError):
+        await store.get("k", _missing, consumer="nightly")
+
+
+async def test_background_refresh_leaves_callers_read_snapshot() -> None:
+    clock = _Clock()
+    store = SnapshotStore(clock=clock)
+    seen = []
+
+    async def _load():
+        seen.append(current_snapshot())
+        return len(seen)
+
+    with read_snapshot(block_number=10):
+        await store.get("k", _load, consumer="card")
+        clock.now = 60
+        await store.get("k", _load, consumer="card")
+        await store.drain()
+    assert seen[0] is not None and seen[1] is None
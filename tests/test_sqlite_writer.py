@@ -0,0 +1,69 @@
+"""Batching and failure isolation of :class:`db_api.writer.SingleWriter`."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from db_api.sqlite_profile import create_writer_engine
+from db_api.writer import SingleWriter
+
+
+@pytest.fixture
+async def writer(tmp_path):
+    writer = SingleWriter(
+        create_writer_engine(f"sqlite+aiosqlite:///{tmp_path / 'w.db'}", "tuned"),
+        batch=16,
+        linger=0.01,
+    )
+    async with writer.engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE kv (k INTEGER PRIMARY KEY, v INTEGER)"))
+    yield writer
+    await writer.close()
+
+
+async def _count(writer: SingleWriter) -> int:
+    async with writer.engine.connect() as conn:
+        return (await conn.execute(text("SELECT COUNT(*) FROM kv"))).scalar()
+
+
+async def test_concurrent_writes_share_transactions(writer) -> None:
+    def insert(k: int):
+        async def _op(session) -> int:
+            await session.execute(text("INSERT INTO kv VALUES (:k, :k)"), {"k": k})
+            return k
+
+        return _op
+
+    results = await asyncio.gather(*(writer.run(insert(k)) for k in range(40)))
+    assert results == list(range(40))
+    assert await _count(writer) == 40
+    stats = writer.stats()
+    assert stats["ops"] == 40 and stats["transactions"] <= 4
+
+    async with writer.engine.connect() as conn:
+        mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+    assert mode == "wal"
+
+
+async def test_failing_op_rolls_back_alone(writer) -> None:
+    async def good(session) -> None:
+        await session.execute(text("INSERT INTO kv VALUES (1, 1)"))
+
+    async def bad(session) -> None:
+        await session.execute(text("INSERT INTO kv VALUES (2, 2)"))
+        raise ValueError("duplicate")
+
+    async def also_good(session) -> None:
+        await session.execute(text("INSERT INTO kv VALUES (3, 3)"))
+
+    outcomes = await asyncio.gather(
+        writer.run(good), writer.run(bad), writer.run(also_good), return_exceptions=True
+    )
+    assert outcomes[0] is None and outcomes[2] is None
+    assert isinstance(outcomes[1], ValueError)
+    async with writer.engine.connect() as conn:
+        keys = (await conn.execute(text("SELECT k FROM kv ORDER BY k"))).scalars().all()
+    assert keys == [1, 3]
+    assert writer.stats()["transactions"] == 1 and writer.stats()["failed_ops"] == 1
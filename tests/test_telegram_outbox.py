@@ -0,0 +1,86 @@
+"""Pacing and retry rules of :mod:`services.telegram_outbox`."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from services.telegram_outbox import Pacer, TelegramOutbox
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _outbox(clock: _Clock, responses: list, **kwargs) -> tuple[TelegramOutbox, list[dict]]:
+    posted: list[dict] = []
+
+    async def _post(method: str, payload: dict):
+        posted.append(payload)
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    kwargs.setdefault("rate", 1000)
+    kwargs.setdefault("chat_interval", 0)
+    box = TelegramOutbox("t", post=_post, clock=clock, sleep=clock.sleep, **kwargs)
+    return box, posted
+
+
+def test_pacer_allows_burst_then_spaces_at_rate() -> None:
+    clock = _Clock()
+    pacer = Pacer(30, burst=30, clock=clock)
+    delays = [pacer.reserve() for _ in range(5000)]
+    assert delays[:30] == [0.0] * 30
+    assert delays[30] == pytest.approx(1 / 30)
+    # A 5k burst drains in ~(5000 - 30) / 30 s — the maximum allowed rate.
+    assert delays[-1] == pytest.approx((5000 - 30) / 30)
+
+
+async def test_429_pauses_for_retry_after_then_delivers() -> None:
+    clock = _Clock()
+    box, posted = _outbox(
+        clock, [(429, {"ok": False, "parameters": {"retry_after": 7}}), (200, {"ok": True})]
+    )
+    assert await box.send(1, "hi") is True
+    assert len(posted) == 2 and posted[0]["parse_mode"] == "HTML"
+    assert 7 in clock.slept
+    stats = box.stats()
+    assert stats["sent"] == 1 and stats["rate_limited"] == 1 and stats["retried"] == 1
+
+
+async def test_rejections_are_final_and_outages_retry_with_backoff() -> None:
+    clock = _Clock()
+    box, posted = _outbox(
+        clock,
+        [(403, {"description": "bot was blocked by the user"})]
+        + [(502, None), asyncio.TimeoutError(), (502, None)],
+        max_attempts=3,
+    )
+    assert await box.send(1, "a") is False
+    assert len(posted) == 1
+
+    assert await box.send(2, "b") is False
+    assert len(posted) == 4
+    assert clock.slept[-2] < clock.slept[-1]  # exponential backoff
+    stats = box.stats()
+    assert stats["rejected"] == 1 and stats["failed"] == 1 and stats["retried"] == 2
+
+
+async def test_same_chat_keeps_order_and_is_paced() -> None:
+    clock = _Clock()
+    box, posted = _outbox(clock, [(200, {})] * 4, chat_interval=1.0)
+    await asyncio.gather(*(box.send(5, f"part {i}") for i in range(3)), box.send(6, "other"))
+    assert [p["text"] for p in posted if p["chat_id"] == 5] == ["part 0", "part 1", "part 2"]
+    assert clock.slept.count(1.0) >= 2
+    assert box.stats()["in_flight"] == 0 and not box._chat_locks
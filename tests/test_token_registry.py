@@ -0,0 +1,85 @@
+"""Persisted :class:`services.token_service.TokenRegistry`."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+from services.token_service import TokenRegistry
+from services.staking_dto import TokenInfo
+
+_TOKEN = "0x" + "ab".rjust(64, "0")
+_OTHER = "0x" + "cd".rjust(64, "0")
+_STRK = "0x04718f5a0fc34cc1af16a1cdee98ffb20c31f5cd61d6ab07201858f4287c938d"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry(path, clock, reads: list[str], *, gate: asyncio.Event | None = None):
+    registry = TokenRegistry(path, ttl=3600, clock=clock)
+
+    async def _fetch(address_hex: str):
+        reads.append(address_hex)
+        if gate is not None:
+            await gate.wait()
+        return TokenInfo(address=address_hex, symbol=f"T{len(reads)}", decimals=8), True
+
+    registry._fetch = _fetch
+    return registry
+
+
+async def test_metadata_survives_restart(tmp_path) -> None:
+    path = tmp_path / "tokens.json"
+    clock = _Clock()
+    reads: list[str] = []
+    first = _registry(path, clock, reads)
+    assert (await first.get("0xab")).symbol == "T1"
+
+    # A new process loads the file at construction: no chain read.
+    second = _registry(path, clock, reads)
+    assert (await second.get(0xAB)).decimals == 8
+    assert reads == [_TOKEN]
+    assert set(json.loads(path.read_text())["tokens"]) == {_TOKEN}
+
+
+async def test_well_known_tokens_are_not_persisted(tmp_path) -> None:
+    path = tmp_path / "tokens.json"
+    registry = TokenRegistry(path)
+    assert (await registry.get(_STRK)).symbol == "STRK"
+    assert not path.exists()
+
+
+async def test_get_many_resolves_concurrently(tmp_path) -> None:
+    gate = asyncio.Event()
+    reads: list[str] = []
+    registry = _registry(tmp_path / "tokens.json", _Clock(), reads, gate=gate)
+
+    task = asyncio.create_task(registry.get_many(["0xab", "0xcd", "0xab"]))
+    for _ in range(3):
+        await asyncio.sleep(0)
+    # Both distinct tokens are in flight before either completes.
+    assert sorted(reads) == [_TOKEN, _OTHER]
+    gate.set()
+    infos = await task
+    assert [i.address for i in infos] == [_TOKEN, _OTHER, _TOKEN]
+
+
+async def test_expired_entry_served_while_refreshing(tmp_path) -> None:
+    path = tmp_path / "tokens.json"
+    clock = _Clock()
+    reads: list[str] = []
+    registry = _registry(path, clock, reads)
+    await registry.get("0xab")
+
+    clock.now += 3601
+    assert (await registry.get("0xab")).symbol == "T1"  # stale, refresh started
+    assert (await registry.get("0xab")).symbol == "T1"  # one refresh only
+    await registry.drain()
+    assert len(reads) == 2
+    assert (await registry.get("0xab")).symbol == "T2"
+    assert json.loads(path.read_text())["tokens"][_TOKEN]["symbol"] == "T2"
@@ -0,0 +1,168 @@
+"""``tracked_entries`` / ``subscriptions`` stay in sync with the JSON columns."""
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from db_api import database
+from db_api.models import Base, Subscription, TrackedEntry, Users
+from db_api.sqlite_profile import create_writer_engine, engine_kwargs, tune_engine
+from db_api.writer import SingleWriter
+
+STAKER = "0x" + "0" * 10 + "ab" * 27
+OTHER = "0x" + "cd" * 32
+DELEGATOR = "0x" + "ef" * 32
+
+
+@pytest.fixture
+async def engine(tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'users.db'}"
+    engine = tune_engine(create_async_engine(url, **engine_kwargs()))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    writer = SingleWriter(create_writer_engine(url))
+    monkeypatch.setattr(database.db, "engine", engine)
+    monkeypatch.setattr(database, "writer", writer)
+    yield engine
+    await writer.close()
+    await engine.dispose()
+
+
+def _user(user_id: int, *, validators=(), delegations=(), cfg=None) -> Users:
+    user = Users(user_id=user_id, user_name="u", user_language="en", registration_data=None)
+    user.tracking_data = json.dumps(
+        {"validators": list(validators), "delegations": list(delegations)}
+    )
+    if cfg is not None:
+        user.set_notification_config(cfg)
+    return user
+
+
+async def _rows(engine, model) -> list[tuple]:
+    async with AsyncSession(engine) as session:
+        rows = (await session.execute(select(model))).scalars().all()
+    if model is TrackedEntry:
+        return sorted(
+            (r.user_id, r.kind, r.staker_address, r.delegator_address, r.label, r.position)
+            for r in rows
+        )
+    return sorted((r.user_id, r.kind, r.staker_address or "") for r in rows)
+
+
+async def test_writers_keep_the_index_in_sync(engine) -> None:
+    canonical = hex(int(STAKER, 16))
+    await database.write_to_db(
+        _user(
+            1,
+            validators=[{"address": STAKER, "label": "main"}],
+            cfg={"attestation_alerts_for": [STAKER], "operator_balance_min_strk": 5},
+        )
+    )
+    await database.add_tracking_entry(
+        1, kind="delegator", payload={"delegator": DELEGATOR, "staker": OTHER, "label": ""}
+    )
+    await database.update_label(1, kind="validator", address=STAKER, label="renamed")
+    assert await _rows(engine, TrackedEntry) == [
+        (1, "delegator", hex(int(OTHER, 16)), hex(int(DELEGATOR, 16)), None, 1),
+        (1, "validator", canonical, None, "renamed", 0),
+    ]
+    assert await _rows(engine, Subscription) == [
+        (1, "attestation", canonical),
+        (1, "operator_balance", ""),
+    ]
+
+    await database.reorder_tracking_entries(
+        1, order=[f"delegation:{DELEGATOR}|{OTHER}", f"validator:{STAKER}"]
+    )
+    positions = {row[1]: row[5] for row in await _rows(engine, TrackedEntry)}
+    assert positions == {"delegator": 0, "validator": 1}
+
+    # Reverse lookups: no JSON involved.
+    assert await database.get_trackers(staker=STAKER.upper().replace("0X", "0x")) == [1]
+    assert await database.get_trackers(delegator=DELEGATOR) == [1]
+    assert await database.get_attestation_watchers() == {canonical: {1}}
+    assert [u.user_id for u in await database.get_subscribed_users(["attestation"])] == [1]
+    assert await database.get_subscriber_ids(["rewards"]) == []
+
+
+async def test_backfill_indexes_rows_written_before_the_tables(engine) -> None:
+    from migrations import migrate_user_index
+
+    legacy = _user(2, validators=[{"address": OTHER}], cfg={"token_thresholds": {"STRK": 10}})
+    empty = _user(3)
+    async with AsyncSession(engine) as session:
+        session.add_all([legacy, empty])
+        await session.commit()
+    assert await _rows(engine, TrackedEntry) == []
+
+    async with AsyncSession(engine) as session:
+        await migrate_user_index(session)
+        await migrate_user_index(session)  # idempotent
+    assert await _rows(engine, Subscription) == [(2, "rewards", "")]
+    assert [r[:3] for r in await _rows(engine, TrackedEntry)] == [
+        (2, "validator", hex(int(OTHER, 16)))
+    ]
+    assert await database.get_subscriber_ids() == [2]
+
+    assert await database.clear_notifications_if_empty(2) is None  # still tracks
+    user = await database.get_account(2)
+    user.tracking_data = json.dumps({"validators": [], "delegations": []})
+    await database.write_to_db(user)
+    assert await _rows(engine, TrackedEntry) == []
+    assert await database.clear_notifications_if_empty(2) == "en"
+    assert await _rows(engine, Subscription) == []
+
+
+async def test_bot_edits_and_inserts_go_through_the_writer(engine) -> None:
+    from sqlalchemy.exc import IntegrityError
+
+    from db_api.user_service import get_or_create_user
+
+    user = await get_or_create_user(4, "u", "en", None)
+    assert user.user_language == "en"  # still loaded after the commit
+    with pytest.raises(IntegrityError):
+        await database.add_user(_user(4))
+    assert (await get_or_create_user(4, "u", "en", None)).user_id == 4
+
+    await database.add_tracking_entry(
+        4, kind="validator", payload={"address": STAKER, "label": "a"}
+    )
+    with pytest.raises(IndexError):  # a stale selection: nothing is written
+        await database.edit_tracking_data(4, lambda doc: doc["validators"].pop(3))
+    assert len(await _rows(engine, TrackedEntry)) == 1
+
+    def _rename(doc: dict) -> None:
+        doc["validators"][0]["label"] = "b"
+
+    await database.edit_tracking_data(4, _rename)
+    assert [r[4] for r in await _rows(engine, TrackedEntry)] == ["b"]
+    await database.edit_tracking_data(4, lambda doc: doc["validators"].pop(0))
+    assert await _rows(engine, TrackedEntry) == []
+    assert database.writer.stats()["failed_ops"] == 2
+
+
+async def test_subscribers_stream_in_projected_chunks(engine) -> None:
+    async with AsyncSession(engine) as session:
+        for user_id in range(1, 12):
+            cfg = {"attestation_alerts_for": [STAKER]} if user_id % 2 else None
+            user = _user(user_id, validators=[{"address": STAKER}], cfg=cfg)
+            session.add(user)
+            await session.flush()
+            await database.sync_user_index(session, user)
+        await session.commit()
+
+    chunks = [c async for c in database.iter_subscribed_users(["attestation"], chunk=4)]
+    assert [len(c) for c in chunks] == [4, 2]
+    rows = [r for c in chunks for r in c]
+    assert [r.user_id for r in rows] == [1, 3, 5, 7, 9, 11]
+    assert rows[0].get_notification_config()["attestation_alerts_for"] == [STAKER]
+    assert rows[0].user_language == "en"
+
+    # A shard: its ids in slices, non-subscribers and unknown ids dropped.
+    chunks = [
+        c async for c in database.iter_subscribed_users(user_ids=[11, 3, 4, 1, 99], chunk=2)
+    ]
+    assert [[r.user_id for r in c] for c in chunks] == [[1, 3], [11]]
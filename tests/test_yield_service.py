@@ -319,7 +319,7 @@ async def test_build_yield_payload_validator_only(monkeypatch) -> None:
         )
     ]
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return entries
 
     async def _fake_prices():
@@ -387,7 +387,7 @@ async def test_build_yield_payload_skips_empty_pools(monkeypatch) -> None:
     # has neither own (own only applies to the first STRK pool by convention)
     # nor delegated, so it should be filtered.
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return entries
 
     async def _fake_prices():
@@ -432,7 +432,7 @@ async def test_build_yield_payload_delegator(monkeypatch) -> None:
         )
     ]
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return entries
 
     async def _fake_prices():
@@ -482,7 +482,7 @@ async def test_build_yield_payload_missing_price(monkeypatch) -> None:
         )
     ]
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return entries
 
     async def _fake_prices():
@@ -523,7 +523,7 @@ async def test_build_yield_payload_missing_commission_warns(monkeypatch, caplog)
     # simulate the RPC returning a missing commission.
     entries[0].data.commission_bps = None
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return entries
 
     async def _fake_prices():
@@ -543,7 +543,7 @@ async def test_build_yield_payload_cached(monkeypatch) -> None:
     without hitting fetch_tracking_entries again."""
     call_count = {"n": 0}
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         call_count["n"] += 1
         return []
 
@@ -569,7 +569,7 @@ async def test_build_yield_payload_cache_expires(monkeypatch) -> None:
     timestamp instead of sleeping)."""
     call_count = {"n": 0}
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         call_count["n"] += 1
         return []
 
@@ -594,7 +594,7 @@ async def test_build_yield_payload_cache_expires(monkeypatch) -> None:
 async def test_build_yield_payload_separate_users_have_separate_caches(monkeypatch) -> None:
     call_count = {"n": 0}
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         call_count["n"] += 1
         return []
 
@@ -630,7 +630,7 @@ async def test_build_payload_attaches_top_level_strk_and_btc_prices(monkeypatch)
     """The assembled YieldPayload carries ``strk_price_usd`` and
     ``btc_price_usd`` lifted straight from the price snapshot."""
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return []
 
     async def _fake_prices():
@@ -651,7 +651,7 @@ async def test_build_payload_prices_none_when_price_service_empty(monkeypatch) -
     null). Frontend uses this signal to render '—' rather than fake a
     zero."""
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return []
 
     async def _fake_prices():
@@ -672,7 +672,7 @@ async def test_build_payload_btc_price_falls_back_to_any_wrapper(monkeypatch) ->
     payload picks any of them — exercising LBTC-only here guards against
     a future refactor that hardcodes WBTC."""
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return []
 
     async def _fake_prices():
@@ -728,7 +728,7 @@ async def test_build_payload_strk_pool_amounts_independent_of_price(monkeypatch)
         data=info,
     )
 
-    async def _fake_fetch_entries(_tracking_data):
+    async def _fake_fetch_entries(_tracking_data, **_kwargs):
         return [entry]
 
     # First render: price at $0.05.
@@ -1,95 +1,378 @@
-"""Cross-process cache with lazy initialization.
-
-On Python 3.14 the default multiprocessing start method on Linux flipped
-from ``fork`` to ``forkserver``. Creating a ``multiprocessing.Manager()``
-at *import time* (as the previous version did) fails with EOFError because
-the importing process has not finished its bootstrap phase yet.
-
-We defer Manager creation until the first cache operation, and — more
-importantly — fall back to an in-process ``dict`` when we're inside a
-multiprocessing worker (the ``strk_bot_parsing`` / ``strk_bot_notification``
-workers spawned by ``main.py``). Each worker does its own Starknet
-fetches, so intra-process TTL is fine; cross-process cache coherence was
-never enforced strictly anyway.
-"""
-from __future__ import annotations
+"""Cross-process cache on SQLite in WAL mode.
 
-import multiprocessing
-from datetime import datetime, timedelta
-from typing import Any, Optional
+The previous backend was a ``multiprocessing.Manager().dict()`` owned by
+the main process: every ``get`` / ``set`` / ``keys`` was a pickling IPC
+round-trip, and the ``strk_bot_parsing`` / ``strk_bot_notification``
+workers (spawned with ``forkserver`` on Python 3.14) could not reach the
+proxy and silently fell back to a private dict — so invalidations issued
+by the bot never reached them, and the API container had its own cache
+altogether.
 
-from data.all_paths import FILES_DIR
+:class:`SharedCache` keeps one table in ``FILES_DIR/cache/shared_cache.db``
+(on the ``stakemate-data`` volume both containers mount). WAL mode lets
+readers run alongside the single writer, so the bot process, its two
+workers and the API all see each other's entries; a ``get`` is one
+indexed read (plus an LRU-clock bump at most once a second per key).
 
-CACHE_DIR = FILES_DIR / "cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+  - TTL: each row carries an absolute ``expires_at`` (wall clock, the only
+    clock processes share); expired rows read as missing.
+    Expired rows are deleted by :func:`run_cache_sweeper`, not on read.
+  - Size bound: past ``max_entries`` the least recently used rows are
+    evicted (checked every ``_EVICT_EVERY`` writes, not on each one).
+  - Tags: an entry can be written with tags (``user:123``);
+    ``cache_tags`` indexes tag → keys, so
+    :meth:`SharedCache.invalidate_tag` drops everything carrying a tag in
+    one indexed delete, proportional to that tag's keys rather than to
+    the whole store. :class:`CacheNamespace` builds per-user keys on top
+    and tags them with the user automatically.
+  - Compare-and-set: every write bumps ``version``;
+    :meth:`SharedCache.compare_and_set` only writes if the version the
+    caller read is still current.
 
+Values are pickled; the file lives in our own ``FILES_DIR``, like the ABI
+serializer cache. Calls are synchronous sqlite3 under the hood — tens of
+microseconds, cheaper than a thread hop — behind the same ``async``
+interface the handlers already await.
+"""
+from __future__ import annotations
 
-_manager: Any = None
-_cache: dict[str, tuple[Any, datetime]] | Any = None
+import asyncio
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
 
+from data.all_paths import CACHE_DIR
+from utils.logger import logger
 
-def _ensure_backing_store() -> None:
-    """Lazily create the backing store.
+_CACHE_DB = Path(os.getenv("SHARED_CACHE_PATH") or CACHE_DIR / "shared_cache.db")
+_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "10000"))
+_EVICT_EVERY = 64
+_TOUCH_GRANULARITY_S = 1.0
+_SWEEP_INTERVAL_S = float(os.getenv("SHARED_CACHE_SWEEP_S", "60"))
 
-    - In the main process (``MainProcess``) we start a Manager so spawned
-      workers see the same cache (as before the refactor).
-    - In an already-spawned worker we use a plain dict; the fork/forkserver
-      parent proxy is unavailable here and re-creating a Manager inside a
-      worker would just be per-worker local state anyway.
-    """
-    global _manager, _cache
-    if _cache is not None:
-        return
-    proc = multiprocessing.current_process()
-    if proc.name == "MainProcess":
-        try:
-            _manager = multiprocessing.Manager()
-            _cache = _manager.dict()
-            return
-        except Exception:
-            # Any Manager failure (e.g. docker seccomp, readonly rootfs)
-            # degrades to an in-process dict — better than crashing import.
-            _manager = None
-    _cache = {}
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key         TEXT PRIMARY KEY,
+    value       BLOB NOT NULL,
+    expires_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    version     INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (accessed_at);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_expires ON cache_entries (expires_at);
+CREATE TABLE IF NOT EXISTS cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_cache_tags_key ON cache_tags (key);
+-- Every way an entry disappears (delete, sweep, LRU, tag invalidation)
+-- drops its index rows with it.
+CREATE TRIGGER IF NOT EXISTS cache_entries_untag AFTER DELETE ON cache_entries
+BEGIN
+    DELETE FROM cache_tags WHERE key = OLD.key;
+END;
+"""
 
 
 class SharedCache:
-    def __init__(self, ttl: int = 300) -> None:
+    """TTL + LRU key/value cache shared by every process using ``path``."""
+
+    def __init__(
+        self,
+        ttl: int = 300,
+        *,
+        path: Path | str = _CACHE_DB,
+        max_entries: int = _MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.ttl = ttl
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._writes = 0
+
+    # -- connection -------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        # A connection must not cross a fork; reopen in the child.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    # -- sync core --------------------------------------------------------
+
+    def get_versioned(self, key: str) -> Optional[tuple[Any, int]]:
+        """``(value, version)`` for a live entry, else ``None``."""
+        now = self._clock()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT value, version, accessed_at FROM cache_entries "
+                "WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] >= _TOUCH_GRANULARITY_S:
+                # LRU clock with 1 s resolution: hot keys don't turn every
+                # read into a write transaction.
+                db.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return pickle.loads(row[0]), row[1]
+
+    @staticmethod
+    def _retag(db: sqlite3.Connection, key: str, tags: Iterable[str]) -> None:
+        db.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+        db.executemany(
+            "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+            [(tag, key) for tag in tags],
+        )
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        *,
+        tags: Iterable[str] = (),
+    ) -> int:
+        """Unconditional write (replacing the key's tags); returns the new version."""
+        now = self._clock()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                (version,) = db.execute(
+                    "INSERT INTO cache_entries (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                    "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at, "
+                    "version = cache_entries.version + 1 "
+                    "RETURNING version",
+                    (key, blob, now + (self.ttl if ttl is None else ttl), now),
+                ).fetchone()
+                self._retag(db, key, tags)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self._after_write()
+        return version
+
+    def compare_and_set(
+        self,
+        key: str,
+        expected_version: int | None,
+        value: Any,
+        ttl: float | None = None,
+        *,
+        tags: Iterable[str] = (),
+    ) -> Optional[int]:
+        """Write only if the entry is still at ``expected_version``.
+
+        ``expected_version=None`` means "only if absent (or expired)".
+        Returns the new version, or ``None`` when another writer won.
+        """
+        now = self._clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            db = self._db()
+            if expected_version is None:
+                row = db.execute(
+                    "INSERT INTO cache_entries (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                    "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at, "
+                    "version = cache_entries.version + 1 "
+                    "WHERE cache_entries.expires_at <= ? "
+                    "RETURNING version",
+                    (key, blob, expires_at, now, now),
+                ).fetchone()
+            else:
+                row = db.execute(
+                    "UPDATE cache_entries SET value = ?, expires_at = ?, accessed_at = ?, "
+                    "version = version + 1 "
+                    "WHERE key = ? AND version = ? AND expires_at > ? "
+                    "RETURNING version",
+                    (blob, expires_at, now, key, expected_version, now),
+                ).fetchone()
+            if row is not None:
+                self._retag(db, key, tags)
+                self._after_write()
+        return None if row is None else row[0]
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Delete every entry carrying ``tag``; returns how many."""
+        with self._lock:
+            cur = self._db().execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_tags WHERE tag = ?)",
+                (tag,),
+            )
+            return cur.rowcount
+
+    def tagged_keys(self, tag: str) -> list[str]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT key FROM cache_tags WHERE tag = ?", (tag,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def matching_keys(self, pattern: str) -> list[str]:
+        now = self._clock()
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT key FROM cache_entries WHERE instr(key, ?) > 0 AND expires_at > ?",
+                (pattern, now),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def _after_write(self) -> None:
+        # Caller holds the lock.
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self._evict()
+
+    def _evict(self) -> int:
+        db = self._db()
+        (count,) = db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        db.execute(
+            "DELETE FROM cache_entries WHERE key IN ("
+            "SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        return excess
+
+    def evict(self) -> int:
+        """Trim to ``max_entries``; returns LRU evictions."""
+        with self._lock:
+            return self._evict()
+
+    def sweep(self) -> int:
+        """Delete expired rows (and their tags); returns how many."""
+        with self._lock:
+            cur = self._db().execute(
+                "DELETE FROM cache_entries WHERE expires_at <= ?", (self._clock(),)
+            )
+            return cur.rowcount
+
+    # -- async interface (unchanged for callers) --------------------------
 
     async def get(self, key: str) -> Optional[Any]:
-        _ensure_backing_store()
-        if key not in _cache:
-            return None
-        value, expiry = _cache[key]
-        if datetime.now() > expiry:
-            await self.delete(key)
-            return None
-        return value
+        hit = self.get_versioned(key)
+        return None if hit is None else hit[0]
 
     async def set(self, key: str, value: Any) -> None:
-        _ensure_backing_store()
-        expiry = datetime.now() + timedelta(seconds=self.ttl)
-        _cache[key] = (value, expiry)
+        self.put(key, value)
 
     async def delete(self, key: str) -> None:
-        _ensure_backing_store()
-        if key in _cache:
-            del _cache[key]
+        self.remove(key)
 
     async def keys(self, pattern: str) -> list[str]:
-        _ensure_backing_store()
-        return [key for key in _cache.keys() if pattern in key]
+        return self.matching_keys(pattern)
+
+    def namespace(self, *parts: Any) -> "CacheNamespace":
+        return CacheNamespace(self, *parts)
+
+
+class CacheNamespace:
+    """Keys under ``a:b:…:`` that all carry the namespace itself as a tag.
+
+    ``cache.namespace("user", 12)`` and ``cache.namespace("user", 123)``
+    share no keys and no tag, so clearing one never touches the other.
+    """
+
+    __slots__ = ("_cache", "prefix")
+
+    def __init__(self, cache: SharedCache, *parts: Any) -> None:
+        if not parts:
+            raise ValueError("namespace needs at least one part")
+        self._cache = cache
+        self.prefix = ":".join(str(p) for p in parts)
+
+    @property
+    def tag(self) -> str:
+        return self.prefix
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    async def get(self, name: str) -> Optional[Any]:
+        return await self._cache.get(self.key(name))
+
+    async def set(
+        self, name: str, value: Any, *, ttl: float | None = None, tags: Iterable[str] = ()
+    ) -> None:
+        self._cache.put(self.key(name), value, ttl, tags=(self.tag, *tags))
+
+    async def delete(self, name: str) -> None:
+        self._cache.remove(self.key(name))
+
+    async def clear(self) -> int:
+        return self._cache.invalidate_tag(self.tag)
 
 
 cache = SharedCache(ttl=300)
 
 
-def get_cache_key(user_id: int, command: str) -> str:
-    return f"{user_id}_{command}"
+def user_cache(user_id: int) -> CacheNamespace:
+    return cache.namespace("user", user_id)
 
 
 async def clear_user_cache(user_id: int) -> None:
-    all_keys = await cache.keys(f"{user_id}_")
-    for key in all_keys:
-        await cache.delete(key)
+    await user_cache(user_id).clear()
+
+
+async def run_cache_sweeper(interval: float = _SWEEP_INTERVAL_S) -> None:
+    """Delete expired entries every ``interval`` seconds, forever."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            swept = cache.sweep()
+        except sqlite3.Error as exc:
+            logger.warning(f"cache sweep failed: {exc}")
+            continue
+        if swept:
+            logger.debug(f"cache sweep: {swept} expired entries removed")
+
+
+def start_cache_sweeper() -> asyncio.Task:
+    """Start this process's sweeper task once (idempotent)."""
+    global _sweeper
+    if _sweeper is None or _sweeper.done():
+        _sweeper = asyncio.create_task(run_cache_sweeper())
+    return _sweeper
+
+
+_sweeper: asyncio.Task | None = None